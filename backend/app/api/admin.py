@@ -0,0 +1,37 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+
+from app.data.factor_dataset import current_dataset
+from app.services.factor_reload import reload_factors_async
+
+router = APIRouter()
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """X-Admin-Token 이 ADMIN_TOKEN 과 같아야 한다 (ADMIN_TOKEN 이 없으면 관리 API 자체가 없음)"""
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="관리자 토큰이 올바르지 않습니다.")
+
+@router.get("/factors", dependencies=[Depends(require_admin)])
+async def get_active_factors():
+    """이 워커의 활성 배출계수 데이터셋 정보"""
+    return current_dataset().summary()
+
+@router.post("/factors/reload", dependencies=[Depends(require_admin)])
+async def reload_emission_factors():
+    """배출계수 파일을 다시 읽어 이 워커의 데이터셋을 교체
+
+    파일이 잘못되었으면 422 이고 기존 데이터셋이 유지된다.
+    """
+    try:
+        return await reload_factors_async()
+    except (ValueError, OSError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"배출계수 데이터셋을 읽지 못했습니다: {exc}"
+        )
@@ -1,17 +1,30 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from pydantic import BaseModel, ConfigDict
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_core import ValidationError
 from email_validator import validate_email, EmailNotValidError
 from datetime import timedelta
+from typing import Optional
 
+from app.core.auth_cache import auth_cache
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token, verify_token
+from app.core.security import (
+    create_access_token,
+    decode_token,
+    get_password_hash_async,
+    needs_rehash,
+    verify_dummy_password,
+    verify_password_async,
+)
 from app.models.user import User, DietaryPreference
+from app.services.data_version import touch_user_data
 
 router = APIRouter()
 security = HTTPBearer()
+logger = logging.getLogger(__name__)
 
 class UserRegister(BaseModel):
     email: str
@@ -36,18 +49,37 @@ class UserResponse(BaseModel):
     dietary_preference: DietaryPreference
     target_carbon_reduction: float
 
+class UserProfileUpdate(BaseModel):
+    name: Optional[str] = Field(default=None, min_length=1)
+    dietary_preference: Optional[DietaryPreference] = None
+    target_carbon_reduction: Optional[float] = Field(default=None, ge=0, le=100)
+
+def issue_token(user: User) -> str:
+    """사용자 id 를 담은 액세스 토큰 (검증 후 이메일 조회 없이 id 로 바로 찾는다)"""
+    return create_access_token(data={"sub": str(user.id)})
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
 @router.post("/register", response_model=Token)
-async def register(user_data: UserRegister, db: Session = Depends(get_db)):
+async def register(user_data: UserRegister, db: AsyncSession = Depends(get_db)):
     # Check if user exists
-    db_user = db.query(User).filter(User.email == user_data.email).first()
+    db_user = await db.scalar(select(User).where(User.email == user_data.email))
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="이미 등록된 이메일입니다."
         )
 
+    # 해시를 계산하는 동안 DB 연결을 잡고 있지 않도록 읽기 트랜잭션을 끝낸다
+    await db.commit()
+
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     db_user = User(
         email=user_data.email,
         password_hash=hashed_password,
@@ -56,11 +88,11 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     )
 
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
 
     # Create access token
-    access_token = create_access_token(data={"sub": db_user.email})
+    access_token = issue_token(db_user)
 
     return {
         "access_token": access_token,
@@ -68,62 +100,101 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_db)):
     # Authenticate user
-    user = db.query(User).filter(User.email == user_data.email).first()
-    if not user or not verify_password(user_data.password, user.password_hash):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="이메일 또는 비밀번호가 올바르지 않습니다.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    user = await db.scalar(select(User).where(User.email == user_data.email))
+    # 로그인이 몰려 해시 풀에서 기다리는 동안에도 DB 연결은 다른 요청이 쓰도록 돌려준다
+    # (expire_on_commit=False 라 user 는 그대로 읽을 수 있다)
+    await db.commit()
+    if user is None:
+        await verify_dummy_password(user_data.password)
+        raise _unauthorized("이메일 또는 비밀번호가 올바르지 않습니다.")
+    if not await verify_password_async(user_data.password, user.password_hash):
+        raise _unauthorized("이메일 또는 비밀번호가 올바르지 않습니다.")
+
+    # 기존 SHA256 해시(또는 예전 scrypt 인자) 는 맞는 비밀번호를 받은 김에 새 해시로 바꾼다
+    if needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(user_data.password)
+        await db.commit()
+        auth_cache.invalidate(user.id)
+        logger.info("password rehashed", extra={"event": "auth.password_rehashed", "user_id": user.id})
 
     # Create access token
-    access_token = create_access_token(data={"sub": user.email})
+    access_token = issue_token(user)
 
     return {
         "access_token": access_token,
         "token_type": "bearer"
     }
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)) -> User:
-    """현재 로그인한 사용자 정보 반환"""
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_db)) -> User:
+    """현재 로그인한 사용자 정보 반환
 
+    검증한 토큰과 사용자 행은 auth_cache 에 보관되어, 캐시가 데워진 뒤에는
+    JWT 검증도 DB 조회도 하지 않는다. 반환하는 User 는 세션에서 떼어 낸 공유 객체이므로
+    읽기 전용으로 다루고, 프로필을 바꾸려면 다시 조회해서 고친 뒤 auth_cache.invalidate 한다.
+    """
+
+    token = credentials.credentials
     try:
-        # Verify token
-        email = verify_token(credentials.credentials)
-        if email is None:
-            print(f"Token verification failed for token: {credentials.credentials[:20]}...")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="유효하지 않은 토큰입니다.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-
-        # Get user from database
-        user = db.query(User).filter(User.email == email).first()
+        user_id = auth_cache.user_id_for(token)
+        user = None
+        if user_id is None:
+            payload = decode_token(token)
+            if payload is None:
+                logger.info("rejected invalid bearer token", extra={"event": "auth.invalid_token"})
+                raise _unauthorized("유효하지 않은 토큰입니다.")
+
+            subject = payload["sub"]
+            if subject.isdigit():
+                user_id = int(subject)
+            else:
+                # 사용자 id 를 담기 전에 발급된 토큰 (sub 가 이메일)
+                user = await db.scalar(select(User).where(User.email == subject))
+                if user is None:
+                    logger.info("token subject has no user", extra={"event": "auth.user_not_found", "legacy_token": True})
+                    raise _unauthorized("사용자를 찾을 수 없습니다.")
+                user_id = user.id
+            auth_cache.remember_token(token, user_id, payload["exp"])
+
+        cached = auth_cache.get_user(user_id)
+        if cached is not None:
+            return cached
+
+        generation = auth_cache.generation(user_id)
+        if user is None:
+            user = await db.get(User, user_id)
         if user is None:
-            print(f"User not found for email: {email}")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="사용자를 찾을 수 없습니다.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+            logger.info("token subject has no user", extra={"event": "auth.user_not_found", "user_id": user_id})
+            raise _unauthorized("사용자를 찾을 수 없습니다.")
 
+        db.expunge(user)
+        auth_cache.set_user(user, generation)
         return user
-    
+
     except HTTPException:
         # Re-raise HTTP exceptions as-is
         raise
-    except Exception as e:
-        print(f"Unexpected error in get_current_user: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="인증 처리 중 오류가 발생했습니다.",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    except Exception:
+        logger.exception("unexpected error while authenticating", extra={"event": "auth.unexpected_error"})
+        raise _unauthorized("인증 처리 중 오류가 발생했습니다.")
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """현재 로그인한 사용자 정보 조회"""
-    return current_user 
\ No newline at end of file
+    return current_user
+
+@router.patch("/me", response_model=UserResponse)
+async def update_profile(
+    profile: UserProfileUpdate,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """이름, 식단 선호, 목표 감축률 수정 (보낸 필드만)"""
+    user = await db.get(User, current_user.id)
+    for field, value in profile.model_dump(exclude_unset=True, exclude_none=True).items():
+        setattr(user, field, value)
+    await touch_user_data(db, user.id)
+    await db.commit()
+    auth_cache.invalidate(user.id)
+    return user
@@ -1,14 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select, and_
 from typing import List, Optional
 from datetime import datetime, timedelta
 
+from app.core.cache import dashboard_cache
 from app.core.database import get_db
 from app.api.auth import get_current_user
 from app.models.user import User
-from app.models.challenge import Challenge, UserChallenge, ChallengeStatus
+from app.models.challenge import Challenge, UserChallenge, ChallengeStatus, ChallengeType
+from app.services.achievements import CHALLENGE_COMPLETED, publish
+from app.services.challenge_progress import add_progress
+from app.services.data_version import touch_user_data
+from app.services.points_ledger import add_to_totals
 
 router = APIRouter()
 
@@ -44,32 +50,38 @@ class UpdateProgressRequest(BaseModel):
 @router.get("/available", response_model=List[ChallengeResponse])
 async def get_available_challenges(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """참여 가능한 챌린지 목록 조회"""
     
     # Get challenges that user hasn't joined yet
-    joined_challenge_ids = db.query(UserChallenge.challenge_id).filter(
+    joined_challenge_ids = select(UserChallenge.challenge_id).where(
         UserChallenge.user_id == current_user.id
-    ).subquery()
+    )
     
-    available_challenges = db.query(Challenge).filter(
-        Challenge.is_active == True,
-        ~Challenge.id.in_(joined_challenge_ids)
-    ).all()
+    result = await db.execute(
+        select(Challenge).where(
+            Challenge.is_active == True,
+            ~Challenge.id.in_(joined_challenge_ids)
+        )
+    )
+    available_challenges = result.scalars().all()
     
     return available_challenges
 
 @router.get("/my-challenges", response_model=List[UserChallengeResponse])
 async def get_my_challenges(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """내 챌린지 목록 조회"""
     
-    user_challenges = db.query(UserChallenge).filter(
-        UserChallenge.user_id == current_user.id
-    ).join(Challenge).all()
+    result = await db.execute(
+        select(UserChallenge).where(
+            UserChallenge.user_id == current_user.id
+        ).options(joinedload(UserChallenge.challenge))
+    )
+    user_challenges = result.scalars().all()
     
     result = []
     for uc in user_challenges:
@@ -96,15 +108,17 @@ async def get_my_challenges(
 async def join_challenge(
     request: JoinChallengeRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """챌린지 참여"""
     
     # Check if challenge exists and is active
-    challenge = db.query(Challenge).filter(
-        Challenge.id == request.challenge_id,
-        Challenge.is_active == True
-    ).first()
+    challenge = await db.scalar(
+        select(Challenge).where(
+            Challenge.id == request.challenge_id,
+            Challenge.is_active == True
+        )
+    )
     
     if not challenge:
         raise HTTPException(
@@ -113,10 +127,12 @@ async def join_challenge(
         )
     
     # Check if user already joined this challenge
-    existing = db.query(UserChallenge).filter(
-        UserChallenge.user_id == current_user.id,
-        UserChallenge.challenge_id == request.challenge_id
-    ).first()
+    existing = await db.scalar(
+        select(UserChallenge).where(
+            UserChallenge.user_id == current_user.id,
+            UserChallenge.challenge_id == request.challenge_id
+        )
+    )
     
     if existing:
         raise HTTPException(
@@ -133,7 +149,10 @@ async def join_challenge(
     )
     
     db.add(user_challenge)
-    db.commit()
+    await add_to_totals(db, current_user.id, {"challenges_joined": 1})
+    await touch_user_data(db, current_user.id)
+    await db.commit()
+    dashboard_cache.invalidate(current_user.id)
     
     return {"message": "챌린지에 성공적으로 참여했습니다!", "challenge_name": challenge.name}
 
@@ -141,52 +160,44 @@ async def join_challenge(
 async def update_challenge_progress(
     request: UpdateProgressRequest,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """챌린지 진행 상황 업데이트"""
     
-    user_challenge = db.query(UserChallenge).filter(
-        UserChallenge.user_id == current_user.id,
-        UserChallenge.challenge_id == request.challenge_id,
-        UserChallenge.completed == False
-    ).first()
+    # 읽고 더해서 쓰지 않고 한 문장으로 더한다 (동시 요청의 증가분이 사라지지 않음)
+    row = await add_progress(db, current_user.id, request.challenge_id, request.progress_value)
     
-    if not user_challenge:
+    if row is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="진행 중인 챌린지를 찾을 수 없습니다."
         )
     
-    # Update progress
-    user_challenge.current_progress = min(
-        user_challenge.challenge.target_value,
-        user_challenge.current_progress + request.progress_value
-    )
-    
     # Check if challenge is completed
-    if user_challenge.current_progress >= user_challenge.challenge.target_value:
-        user_challenge.completed = True
-        user_challenge.completed_at = datetime.utcnow()
-        
-        # TODO: Award badge if associated with challenge
+    achievements = []
+    if row.completed:
+        achievements = await publish(db, current_user.id, CHALLENGE_COMPLETED)
         
-        message = f"축하합니다! '{user_challenge.challenge.name}' 챌린지를 완료했습니다! 🎉"
+        message = f"축하합니다! '{row.name}' 챌린지를 완료했습니다! 🎉"
     else:
-        progress_percentage = (user_challenge.current_progress / user_challenge.challenge.target_value) * 100
-        message = f"진행률: {progress_percentage:.1f}% ({user_challenge.current_progress}/{user_challenge.challenge.target_value})"
+        progress_percentage = (row.current_progress / row.target_value) * 100
+        message = f"진행률: {progress_percentage:.1f}% ({row.current_progress}/{row.target_value})"
     
-    db.commit()
+    await touch_user_data(db, current_user.id)
+    await db.commit()
+    dashboard_cache.invalidate(current_user.id)
     
     return {
         "message": message,
-        "completed": user_challenge.completed,
-        "current_progress": user_challenge.current_progress,
-        "target_value": user_challenge.challenge.target_value
+        "completed": row.completed,
+        "current_progress": row.current_progress,
+        "target_value": row.target_value,
+        "achievements": achievements
     }
 
 # Initialize default challenges
 @router.post("/initialize-default")
-async def initialize_default_challenges(db: Session = Depends(get_db)):
+async def initialize_default_challenges(db: AsyncSession = Depends(get_db)):
     """기본 챌린지 초기화 (관리자용)"""
     
     default_challenges = [
@@ -225,14 +236,16 @@ async def initialize_default_challenges(db: Session = Depends(get_db)):
     ]
     
     for challenge_data in default_challenges:
-        existing = db.query(Challenge).filter(
-            Challenge.name == challenge_data["name"]
-        ).first()
+        existing = await db.scalar(
+            select(Challenge).where(
+                Challenge.name == challenge_data["name"]
+            )
+        )
         
         if not existing:
             challenge = Challenge(**challenge_data)
             db.add(challenge)
     
-    db.commit()
+    await db.commit()
     
     return {"message": "기본 챌린지가 초기화되었습니다."} 
\ No newline at end of file
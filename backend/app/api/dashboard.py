@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from fastapi import APIRouter, Depends, Header, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc, case, true
 from pydantic import BaseModel
-from typing import List, Dict
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+from datetime import date, datetime, timedelta
 
+from app.core.cache import dashboard_cache
 from app.core.database import get_db
+from app.core.etag import etag_matches, not_modified, set_etag
+from app.api.admin import require_admin
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.meal_log import MealLog
+from app.models.food import Food
 from app.models.recommended_swap import RecommendedSwap
 from app.models.challenge import UserChallenge, Challenge
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.services.carbon_rollup import kst_today
+from app.services.data_version import user_etag
 
 router = APIRouter()
 
@@ -48,24 +55,63 @@ class DashboardResponse(BaseModel):
 
 @router.get("/", response_model=DashboardResponse)
 async def get_dashboard_data(
+    x_cache_bypass: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """대시보드 통계 데이터 조회"""
+    """대시보드 통계 데이터 조회 (ETag/304, 사용자별 캐시, X-Cache-Bypass 헤더로 우회)"""
+    
+    # 주간 범위가 KST 자정에 바뀌므로 날짜도 ETag 에 포함
+    today = kst_today()
+    etag = await user_etag(db, current_user.id, "dashboard", today)
+    if etag_matches(if_none_match, etag) and not x_cache_bypass:
+        return not_modified(etag)
+    
+    if x_cache_bypass:
+        dashboard = await build_dashboard(db, current_user)
+        return dashboard_response(dashboard.model_dump_json(), etag, "BYPASS")
+    
+    # 캐시 키는 ETag (데이터 버전 + 날짜) - 다른 워커나 배치 작업이 버전을 올리면 이 워커의 본문도 버린다
+    body = dashboard_cache.get(current_user.id, etag)
+    if body is not None:
+        return dashboard_response(body, etag, "HIT")
+    
+    generation = dashboard_cache.generation(current_user.id)
+    dashboard = await build_dashboard(db, current_user)
+    body = dashboard.model_dump_json()
+    dashboard_cache.set(current_user.id, body, generation, etag)
+    return dashboard_response(body, etag, "MISS")
+
+def dashboard_response(body, etag: str, cache_status: str) -> Response:
+    response = Response(body, media_type="application/json", headers={"X-Cache": cache_status})
+    set_etag(response, etag)
+    return response
+
+@router.get("/cache-stats", dependencies=[Depends(require_admin)])
+async def get_dashboard_cache_stats():
+    """이 워커의 대시보드 캐시 적중/미스 카운터 (관리자 전용)"""
+    return dashboard_cache.stats()
+
+async def build_dashboard(db: AsyncSession, current_user: User) -> DashboardResponse:
+    """대시보드 응답 계산 (롤업 조회 + 활동 요약 조회, 총 2문장)"""
     
     # Calculate date ranges
     now = datetime.now()
-    week_start = now - timedelta(days=7)
+    week_start_day = kst_today() - timedelta(days=6)  # 오늘 포함 최근 7일 (KST)
     month_start = now - timedelta(days=30)
     
+    # This week's daily rollup rows (trends + weekly totals)
+    week_days = await get_week_rollup(db, current_user.id, week_start_day)
+    
+    # Swap/challenge counters and top carbon contributors
+    activity, top_contributors = await get_activity_summary(db, current_user.id, month_start)
+    
     # Basic stats
-    stats = calculate_dashboard_stats(db, current_user.id, week_start, month_start)
+    stats = calculate_dashboard_stats(week_days, activity)
     
     # Carbon trends (last 7 days)
-    carbon_trends = get_carbon_trends(db, current_user.id, week_start)
-    
-    # Top carbon contributors
-    top_contributors = get_top_contributors(db, current_user.id, month_start)
+    carbon_trends = get_carbon_trends(week_days)
     
     # Generate insights
     insights = generate_insights(db, current_user, stats, carbon_trends)
@@ -77,49 +123,96 @@ async def get_dashboard_data(
         insights=insights
     )
 
-def calculate_dashboard_stats(db: Session, user_id: int, week_start: datetime, month_start: datetime) -> DashboardStats:
-    """대시보드 기본 통계 계산"""
-    
-    # This week's carbon footprint
-    week_carbon = db.query(func.sum(MealLog.carbon_footprint)).filter(
-        MealLog.user_id == user_id,
-        MealLog.logged_at >= week_start
-    ).scalar() or 0.0
-    
-    # Carbon reduction from accepted swaps
-    carbon_reduction = db.query(func.sum(RecommendedSwap.carbon_reduction)).join(
-        MealLog
-    ).filter(
+async def get_week_rollup(db: AsyncSession, user_id: int, week_start_day: date) -> List[UserDailyCarbon]:
+    """최근 7일 롤업 행 (날짜순)"""
+    
+    return (await db.execute(
+        select(UserDailyCarbon).where(
+            UserDailyCarbon.user_id == user_id,
+            UserDailyCarbon.day >= week_start_day
+        ).order_by(UserDailyCarbon.day)
+    )).scalars().all()
+
+async def get_activity_summary(db: AsyncSession, user_id: int, month_start: datetime):
+    """스왑/챌린지 집계와 상위 기여 음식을 한 문장으로 조회
+    
+    집계 CTE 두 개는 항상 한 행이므로 상위 음식 CTE 를 ON TRUE 로 외부 조인하면
+    음식이 없어도 집계 행 하나는 돌아온다.
+    """
+    
+    # Carbon reduction and count of accepted swaps (this month)
+    swaps = select(
+        func.coalesce(func.sum(RecommendedSwap.carbon_reduction), 0.0).label("carbon_reduction"),
+        func.count(RecommendedSwap.id).label("swaps_accepted")
+    ).join(MealLog).where(
         MealLog.user_id == user_id,
         RecommendedSwap.accepted == True,
         RecommendedSwap.created_at >= month_start
-    ).scalar() or 0.0
-    
-    # Meals logged this week
-    meals_count = db.query(func.count(MealLog.id)).filter(
+    ).cte("swaps")
+    
+    # Active / completed challenges
+    challenges = select(
+        func.coalesce(func.sum(case((UserChallenge.completed == False, 1), else_=0)), 0).label("active_challenges"),
+        func.coalesce(func.sum(case((UserChallenge.completed == True, 1), else_=0)), 0).label("completed_challenges")
+    ).where(UserChallenge.user_id == user_id).cte("challenges")
+    
+    # Top carbon contributors - 정수 food_id 로 묶고 이름은 foods 에서 가져온다.
+    # 해석되지 않은 자유 입력 음식(food_id NULL)만 입력한 이름으로 묶는다
+    unresolved_name = case((MealLog.food_id.is_(None), MealLog.food_name))
+    per_food = select(
+        MealLog.food_id,
+        unresolved_name.label("unresolved_name"),
+        func.sum(MealLog.carbon_footprint).label("total_carbon"),
+        func.count(MealLog.id).label("frequency")
+    ).where(
         MealLog.user_id == user_id,
-        MealLog.logged_at >= week_start
-    ).scalar() or 0
+        MealLog.logged_at >= month_start
+    ).group_by(
+        MealLog.food_id,
+        unresolved_name
+    ).order_by(
+        desc("total_carbon")
+    ).limit(5).subquery()
+    
+    top_foods = select(
+        func.coalesce(Food.name, per_food.c.unresolved_name).label("food_name"),
+        per_food.c.total_carbon,
+        per_food.c.frequency
+    ).select_from(per_food).outerjoin(Food, Food.id == per_food.c.food_id).cte("top_foods")
+    
+    rows = (await db.execute(
+        select(
+            swaps.c.carbon_reduction,
+            swaps.c.swaps_accepted,
+            challenges.c.active_challenges,
+            challenges.c.completed_challenges,
+            top_foods.c.food_name,
+            top_foods.c.total_carbon,
+            top_foods.c.frequency
+        ).select_from(
+            swaps.join(challenges, true()).outerjoin(top_foods, true())
+        ).order_by(top_foods.c.total_carbon.desc())
+    )).all()
     
-    # Swaps accepted
-    swaps_accepted = db.query(func.count(RecommendedSwap.id)).join(
-        MealLog
-    ).filter(
-        MealLog.user_id == user_id,
-        RecommendedSwap.accepted == True,
-        RecommendedSwap.created_at >= month_start
-    ).scalar() or 0
+    contributors = []
+    for food_data in rows:
+        if food_data.food_name is None:
+            continue
+        contributors.append(TopContributor(
+            food_name=food_data.food_name,
+            total_carbon=round(food_data.total_carbon, 2),
+            frequency=food_data.frequency
+        ))
     
-    # Challenges
-    active_challenges = db.query(func.count(UserChallenge.id)).filter(
-        UserChallenge.user_id == user_id,
-        UserChallenge.completed == False
-    ).scalar() or 0
+    return rows[0], contributors
+
+def calculate_dashboard_stats(week_days: List[UserDailyCarbon], activity) -> DashboardStats:
+    """대시보드 기본 통계 계산"""
     
-    completed_challenges = db.query(func.count(UserChallenge.id)).filter(
-        UserChallenge.user_id == user_id,
-        UserChallenge.completed == True
-    ).scalar() or 0
+    # This week's carbon footprint and meal count (from the daily rollup)
+    week_carbon = sum(day.total_carbon for day in week_days)
+    meals_count = sum(day.meal_count for day in week_days)
+    carbon_reduction = activity.carbon_reduction
     
     # Calculate target progress (assuming 20% reduction target)
     target_carbon = week_carbon * 1.25  # If they reduced by 20%, original would be 25% higher
@@ -130,62 +223,25 @@ def calculate_dashboard_stats(db: Session, user_id: int, week_start: datetime, m
         carbon_reduction_achieved=round(carbon_reduction, 2),
         target_progress_percentage=round(target_progress, 1),
         meals_logged_this_week=meals_count,
-        swaps_accepted=swaps_accepted,
-        active_challenges=active_challenges,
-        completed_challenges=completed_challenges
+        swaps_accepted=activity.swaps_accepted,
+        active_challenges=activity.active_challenges,
+        completed_challenges=activity.completed_challenges
     )
 
-def get_carbon_trends(db: Session, user_id: int, week_start: datetime) -> List[CarbonTrend]:
+def get_carbon_trends(week_days: List[UserDailyCarbon]) -> List[CarbonTrend]:
     """주간 탄소 발자국 트렌드"""
     
-    daily_data = db.query(
-        func.date(MealLog.logged_at).label('date'),
-        func.sum(MealLog.carbon_footprint).label('total_carbon'),
-        func.count(MealLog.id).label('meal_count')
-    ).filter(
-        MealLog.user_id == user_id,
-        MealLog.logged_at >= week_start
-    ).group_by(
-        func.date(MealLog.logged_at)
-    ).order_by('date').all()
-    
     trends = []
-    for data in daily_data:
+    for data in week_days:
         trends.append(CarbonTrend(
-            date=data.date.strftime("%Y-%m-%d"),
+            date=data.day.strftime("%Y-%m-%d"),
             carbon_amount=round(data.total_carbon, 2),
             meal_count=data.meal_count
         ))
     
     return trends
 
-def get_top_contributors(db: Session, user_id: int, month_start: datetime) -> List[TopContributor]:
-    """탄소 배출량 상위 기여 음식"""
-    
-    top_foods = db.query(
-        MealLog.food_name,
-        func.sum(MealLog.carbon_footprint).label('total_carbon'),
-        func.count(MealLog.id).label('frequency')
-    ).filter(
-        MealLog.user_id == user_id,
-        MealLog.logged_at >= month_start
-    ).group_by(
-        MealLog.food_name
-    ).order_by(
-        desc('total_carbon')
-    ).limit(5).all()
-    
-    contributors = []
-    for food_data in top_foods:
-        contributors.append(TopContributor(
-            food_name=food_data.food_name,
-            total_carbon=round(food_data.total_carbon, 2),
-            frequency=food_data.frequency
-        ))
-    
-    return contributors
-
-def generate_insights(db: Session, user: User, stats: DashboardStats, trends: List[CarbonTrend]) -> List[InsightCard]:
+def generate_insights(db: AsyncSession, user: User, stats: DashboardStats, trends: List[CarbonTrend]) -> List[InsightCard]:
     """개인화된 인사이트 카드 생성"""
     
     insights = []
@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional
 
@@ -7,6 +7,8 @@ from app.core.database import get_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.activity_log import ActivityLog, ActivityType
+from app.services.idempotency import IdempotentRequest
+from app.data.factor_dataset import current_dataset
 from app.data.korean_emission_factors import (
     get_electricity_co2, 
     get_gas_co2, 
@@ -28,6 +30,7 @@ class EnergyCalculationResponse(BaseModel):
     total_energy_footprint: float
     electricity_kwh_used: Optional[float]
     gas_m3_used: Optional[float]
+    factor_version: str  # 계산에 쓴 배출계수 데이터셋 버전
 
 class TransportCalculationRequest(BaseModel):
     transport_type: str  # car_gasoline, bus_city, subway, etc.
@@ -40,15 +43,26 @@ class TransportCalculationResponse(BaseModel):
     transport_type: str
     distance_km: Optional[float]
     fuel_efficiency_info: Optional[str]
+    factor_version: str  # 계산에 쓴 배출계수 데이터셋 버전
 
 @router.post("/energy/calculate", response_model=EnergyCalculationResponse)
 async def calculate_energy_footprint(
     request: EnergyCalculationRequest,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """가정 에너지 사용량 기반 탄소 발자국 계산"""
+    """가정 에너지 사용량 기반 탄소 발자국 계산
     
+    Idempotency-Key 헤더가 있으면 같은 키의 재시도에 처음 응답을 그대로 돌려준다.
+    """
+    
+    idempotent = IdempotentRequest(current_user.id, idempotency_key, "energy.calculate", request)
+    replay = await idempotent.find_replay(db)
+    if replay is not None:
+        return replay
+    
+    dataset = current_dataset()
     electricity_footprint = 0.0
     gas_footprint = 0.0
     electricity_kwh_used = None
@@ -57,22 +71,22 @@ async def calculate_energy_footprint(
     # 전기 사용량 계산
     if request.electricity_kwh:
         electricity_kwh_used = request.electricity_kwh
-        electricity_footprint = get_electricity_co2(request.electricity_kwh)
+        electricity_footprint = get_electricity_co2(request.electricity_kwh, dataset)
     elif request.electricity_bill_amount:
         # 전기요금으로부터 사용량 추정 (평균 전기요금 120원/kWh 가정)
         estimated_kwh = request.electricity_bill_amount / 120.0
         electricity_kwh_used = estimated_kwh
-        electricity_footprint = get_electricity_co2(estimated_kwh)
+        electricity_footprint = get_electricity_co2(estimated_kwh, dataset)
     
     # 가스 사용량 계산
     if request.gas_m3:
         gas_m3_used = request.gas_m3
-        gas_footprint = get_gas_co2(request.gas_m3)
+        gas_footprint = get_gas_co2(request.gas_m3, dataset)
     elif request.gas_bill_amount:
         # 가스요금으로부터 사용량 추정 (평균 가스요금 800원/m³ 가정)
         estimated_m3 = request.gas_bill_amount / 800.0
         gas_m3_used = estimated_m3
-        gas_footprint = get_gas_co2(estimated_m3)
+        gas_footprint = get_gas_co2(estimated_m3, dataset)
     
     total_footprint = electricity_footprint + gas_footprint
     
@@ -82,39 +96,51 @@ async def calculate_energy_footprint(
             user_id=current_user.id,
             activity_type=ActivityType.ENERGY,
             energy_usage=electricity_kwh_used or 0,
-            carbon_footprint=total_footprint
+            carbon_footprint=total_footprint,
+            factor_version=dataset.version
         )
         db.add(activity_log)
-        db.commit()
     
-    return EnergyCalculationResponse(
+    response = EnergyCalculationResponse(
         electricity_footprint=round(electricity_footprint, 3),
         gas_footprint=round(gas_footprint, 3),
         total_energy_footprint=round(total_footprint, 3),
         electricity_kwh_used=electricity_kwh_used,
-        gas_m3_used=gas_m3_used
+        gas_m3_used=gas_m3_used,
+        factor_version=dataset.version
     )
+    return await idempotent.commit(db, response) or response
 
 @router.post("/transport/calculate", response_model=TransportCalculationResponse)
 async def calculate_transport_footprint(
     request: TransportCalculationRequest,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """교통수단 이용 기반 탄소 발자국 계산"""
+    """교통수단 이용 기반 탄소 발자국 계산
+    
+    Idempotency-Key 헤더가 있으면 같은 키의 재시도에 처음 응답을 그대로 돌려준다.
+    """
     
+    idempotent = IdempotentRequest(current_user.id, idempotency_key, "transport.calculate", request)
+    replay = await idempotent.find_replay(db)
+    if replay is not None:
+        return replay
+    
+    dataset = current_dataset()
     transport_footprint = 0.0
     distance_km = request.distance_km
     fuel_efficiency_info = None
     
     if request.distance_km:
         # 거리 기반 계산
-        transport_footprint = get_transport_co2(request.transport_type, request.distance_km)
+        transport_footprint = get_transport_co2(request.transport_type, request.distance_km, dataset)
     elif request.fuel_liters:
         # 연료 사용량 기반 계산 (자가용의 경우)
         if "car" in request.transport_type:
             fuel_type = "gasoline" if "gasoline" in request.transport_type else "diesel"
-            transport_footprint = get_fuel_co2(fuel_type, request.fuel_liters)
+            transport_footprint = get_fuel_co2(fuel_type, request.fuel_liters, dataset)
             
             # 연비 정보 제공
             if request.transport_type == "car_gasoline":
@@ -133,17 +159,19 @@ async def calculate_transport_footprint(
             activity_type=ActivityType.TRANSPORT,
             transport_mode=getattr(ActivityType, request.transport_type.upper(), None),
             distance_km=distance_km,
-            carbon_footprint=transport_footprint
+            carbon_footprint=transport_footprint,
+            factor_version=dataset.version
         )
         db.add(activity_log)
-        db.commit()
     
-    return TransportCalculationResponse(
+    response = TransportCalculationResponse(
         transport_footprint=round(transport_footprint, 3),
         transport_type=request.transport_type,
         distance_km=distance_km,
-        fuel_efficiency_info=fuel_efficiency_info
+        fuel_efficiency_info=fuel_efficiency_info,
+        factor_version=dataset.version
     )
+    return await idempotent.commit(db, response) or response
 
 @router.get("/transport/types")
 async def get_transport_types():
@@ -179,29 +207,31 @@ async def get_transport_types():
 @router.get("/energy/monthly-average")
 async def get_monthly_energy_average(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """사용자의 월평균 에너지 사용량 및 탄소 발자국"""
     
-    from sqlalchemy import func, extract
+    from sqlalchemy import select, func, extract
     from datetime import datetime, timedelta
     
     # 최근 6개월 데이터 조회
     six_months_ago = datetime.now() - timedelta(days=180)
     
-    monthly_data = db.query(
-        extract('year', ActivityLog.logged_at).label('year'),
-        extract('month', ActivityLog.logged_at).label('month'),
-        func.sum(ActivityLog.carbon_footprint).label('total_carbon'),
-        func.sum(ActivityLog.energy_usage).label('total_energy')
-    ).filter(
-        ActivityLog.user_id == current_user.id,
-        ActivityLog.activity_type == ActivityType.ENERGY,
-        ActivityLog.logged_at >= six_months_ago
-    ).group_by(
-        extract('year', ActivityLog.logged_at),
-        extract('month', ActivityLog.logged_at)
-    ).all()
+    monthly_data = (await db.execute(
+        select(
+            extract('year', ActivityLog.logged_at).label('year'),
+            extract('month', ActivityLog.logged_at).label('month'),
+            func.sum(ActivityLog.carbon_footprint).label('total_carbon'),
+            func.sum(ActivityLog.energy_usage).label('total_energy')
+        ).where(
+            ActivityLog.user_id == current_user.id,
+            ActivityLog.activity_type == ActivityType.ENERGY,
+            ActivityLog.logged_at >= six_months_ago
+        ).group_by(
+            extract('year', ActivityLog.logged_at),
+            extract('month', ActivityLog.logged_at)
+        )
+    )).all()
     
     if not monthly_data:
         return {
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.api.auth import get_current_user
+from app.models.user import User
+from app.services.carbon_rollup import kst_today
+from app.services.data_export import export_user_data
+
+router = APIRouter()
+
+@router.get("")
+async def export_account_data(
+    current_user: User = Depends(get_current_user)
+):
+    """계정 전체 데이터 내보내기 - NDJSON 스트리밍 다운로드
+    
+    식사 기록, 추천 대체, 활동 기록, 챌린지, 배지를 한 줄에 한 행씩 내보낸다.
+    마지막 줄의 summary 에 테이블별 행 수가 들어 있다.
+    """
+    
+    filename = f"greenflow-export-{current_user.id}-{kst_today().isoformat()}.ndjson"
+    return StreamingResponse(
+        export_user_data(current_user.id),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "Cache-Control": "no-store",
+        }
+    )
@@ -1,15 +1,24 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
-from typing import List
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import BaseModel, Field
+from typing import List, Optional, Tuple
+from datetime import timedelta
+import numpy as np
 
 from app.core.database import get_db
+from app.core.etag import etag_matches, not_modified, set_etag
 from app.api.auth import get_current_user
 from app.models.user import User
-from app.models.meal_log import MealLog
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.services.carbon_rollup import kst_today
+from app.services.data_version import user_etag
+from app.data.factor_dataset import FactorDataset, current_dataset
 
 router = APIRouter()
 
+MAX_SUMMARY_DAYS = 366
+
 class CarbonCalculationRequest(BaseModel):
     food_name: str
     portion_size: float  # in grams
@@ -21,6 +30,18 @@ class CarbonCalculationResponse(BaseModel):
     category: str
     sustainability_rating: str  # LOW, MEDIUM, HIGH
 
+class CarbonBatchRequest(BaseModel):
+    items: List[CarbonCalculationRequest] = Field(..., min_length=1, max_length=1000)
+
+class CarbonBatchItem(CarbonCalculationResponse):
+    resolution: str  # exact, similar, keyword, default
+    matched_food: Optional[str]
+
+class CarbonBatchResponse(BaseModel):
+    items: List[CarbonBatchItem]
+    total_carbon_footprint: float
+    factor_version: str  # 계산에 쓴 배출계수 데이터셋 버전
+
 class DailySummary(BaseModel):
     date: str
     total_carbon: float
@@ -34,8 +55,9 @@ async def calculate_carbon_footprint(
 ):
     """탄소 발자국 계산"""
     
-    carbon_footprint = calculate_food_carbon(request.food_name, request.portion_size)
-    category = get_food_category(request.food_name)
+    dataset = current_dataset()
+    carbon_footprint = calculate_food_carbon(request.food_name, request.portion_size, dataset)
+    category = get_food_category(request.food_name, dataset)
     rating = get_sustainability_rating(carbon_footprint)
     
     return CarbonCalculationResponse(
@@ -46,109 +68,124 @@ async def calculate_carbon_footprint(
         sustainability_rating=rating
     )
 
+@router.post("/calculate-batch", response_model=CarbonBatchResponse)
+async def calculate_carbon_footprint_batch(
+    request: CarbonBatchRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """여러 음식의 탄소 발자국 일괄 계산 (입력 순서 유지)"""
+    
+    food_names = [item.food_name for item in request.items]
+    portions = np.array([item.portion_size for item in request.items], dtype=np.float64)
+    
+    # 음식명은 중복 제거 후 한 번씩만 해석 (모든 항목을 같은 데이터셋으로)
+    dataset = current_dataset()
+    unique_names, inverse = np.unique(np.array(food_names, dtype=object), return_inverse=True)
+    resolved = [resolve_food_factor(name, dataset) for name in unique_names]
+    categories = np.array([get_food_category(name, dataset) for name in unique_names], dtype=object)
+    
+    factors = np.array([r[0] for r in resolved], dtype=np.float64)[inverse]
+    divisors = np.array([r[1] for r in resolved], dtype=np.float64)[inverse]
+    methods = np.array([r[2] for r in resolved], dtype=object)[inverse]
+    matched = np.array([r[3] for r in resolved], dtype=object)[inverse]
+    
+    carbon = np.round((portions / divisors) * factors, 3)
+    ratings = np.select([carbon < 0.5, carbon < 1.5], ["HIGH", "MEDIUM"], default="LOW")
+    
+    items = [
+        CarbonBatchItem(
+            food_name=name,
+            portion_size=portion,
+            carbon_footprint=footprint,
+            category=category,
+            sustainability_rating=rating,
+            resolution=method,
+            matched_food=matched_food
+        )
+        for name, portion, footprint, category, rating, method, matched_food in zip(
+            food_names, portions.tolist(), carbon.tolist(), categories[inverse].tolist(),
+            ratings.tolist(), methods.tolist(), matched.tolist()
+        )
+    ]
+    
+    return CarbonBatchResponse(
+        items=items,
+        total_carbon_footprint=round(float(carbon.sum()), 3),
+        factor_version=dataset.version
+    )
+
 @router.get("/daily-summary", response_model=List[DailySummary])
 async def get_daily_carbon_summary(
-    days: int = 7,
+    response: Response,
+    days: int = Query(7, ge=1, le=MAX_SUMMARY_DAYS),
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """일별 탄소 발자국 요약"""
-    
-    from sqlalchemy import func, desc
-    from datetime import datetime, timedelta
-    
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    
-    # Get daily aggregated data
-    daily_data = db.query(
-        func.date(MealLog.logged_at).label('date'),
-        func.sum(MealLog.carbon_footprint).label('total_carbon'),
-        func.count(MealLog.id).label('meal_count'),
-        func.max(MealLog.carbon_footprint).label('max_carbon')
-    ).filter(
-        MealLog.user_id == current_user.id,
-        MealLog.logged_at >= start_date,
-        MealLog.logged_at <= end_date
-    ).group_by(
-        func.date(MealLog.logged_at)
-    ).order_by(desc('date')).all()
-    
-    result = []
-    for data in daily_data:
-        # Get the food with highest carbon footprint for that day
-        top_meal = db.query(MealLog).filter(
-            MealLog.user_id == current_user.id,
-            func.date(MealLog.logged_at) == data.date,
-            MealLog.carbon_footprint == data.max_carbon
-        ).first()
-        
-        result.append(DailySummary(
-            date=data.date.strftime("%Y-%m-%d"),
+    """일별 탄소 발자국 요약 (롤업 테이블 단일 조회, If-None-Match 가 같으면 304)"""
+    
+    today = kst_today()
+    etag = await user_etag(db, current_user.id, "daily-summary", days, today)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    start_day = today - timedelta(days=days - 1)
+    
+    daily_data = (await db.execute(
+        select(UserDailyCarbon).where(
+            UserDailyCarbon.user_id == current_user.id,
+            UserDailyCarbon.day >= start_day
+        ).order_by(UserDailyCarbon.day.desc())
+    )).scalars().all()
+    
+    return [
+        DailySummary(
+            date=data.day.strftime("%Y-%m-%d"),
             total_carbon=round(data.total_carbon, 2),
             meal_count=data.meal_count,
-            top_contributor=top_meal.food_name if top_meal else "알 수 없음"
-        ))
-    
-    return result
+            top_contributor=data.top_food or "알 수 없음"
+        )
+        for data in daily_data
+    ]
 
-def calculate_food_carbon(food_name: str, portion_size: float) -> float:
-    """음식의 탄소 발자국 계산 - 한국 특화 데이터 사용"""
-    from app.data.korean_food_carbon import get_food_carbon_footprint, search_similar_foods
+def resolve_food_factor(food_name: str, dataset: Optional[FactorDataset] = None) -> Tuple[float, float, str, Optional[str]]:
+    """
+    음식명을 탄소 계수로 해석
     
-    # 1. 정확한 매칭 시도
-    exact_footprint = get_food_carbon_footprint(food_name, portion_size / 200.0)  # 200g을 1인분으로 가정
-    if exact_footprint != 1.0 * (portion_size / 200.0):  # 기본값이 아닌 경우
-        return round(exact_footprint, 3)
+    Returns:
+        (계수, 기준 중량(g), 해석 방법, 매칭된 음식/키워드)
+        탄소 발자국 = (portion_size / 기준 중량) * 계수
+    """
+    dataset = dataset or current_dataset()
     
-    # 2. 유사한 음식 검색
-    similar_foods = search_similar_foods(food_name)
+    # 1. 정확한 매칭 시도 (200g을 1인분으로 가정)
+    exact_footprint = dataset.resolver.lookup(food_name)
+    if exact_footprint is not None:
+        return exact_footprint, 200.0, "exact", food_name
+    
+    # 2. 유사한 음식 검색 (탄소 발자국이 가장 낮은 음식 사용)
+    similar_foods = dataset.resolver.search_similar(food_name)
     if similar_foods:
-        # 가장 유사한 음식의 탄소 발자국 사용
-        base_footprint = similar_foods[0]["carbon_footprint"]
-        return round(base_footprint * (portion_size / 200.0), 3)
-    
-    # 3. 기존 로직 fallback (간단한 카테고리 매칭)
-    carbon_factors_per_100g = {
-        # 육류 키워드
-        "소": 2.5, "돼지": 1.2, "닭": 0.6, "양": 2.4,
-        "고기": 2.0, "갈비": 2.8, "등심": 2.6,
-        
-        # 해산물 키워드
-        "생선": 0.5, "새우": 1.8, "게": 1.5, "조개": 0.3,
-        "회": 1.0, "초밥": 0.9,
-        
-        # 기타
-        "밥": 0.3, "면": 0.2, "국": 0.5, "찌개": 0.4,
-        "채소": 0.1, "과일": 0.1, "두부": 0.2
-    }
-    
-    best_match_factor = 0.5  # 기본값
-    for keyword, factor in carbon_factors_per_100g.items():
-        if keyword in food_name:
-            best_match_factor = factor
-            break
-    
-    return round((portion_size / 100) * best_match_factor, 3)
-
-def get_food_category(food_name: str) -> str:
+        return dataset.foods[similar_foods[0]], 200.0, "similar", similar_foods[0]
+    
+    # 3. 키워드별 기본 계수 fallback (데이터베이스에 없는 음식, 100g 기준)
+    keyword = dataset.footprint_keyword_matcher.first(food_name)
+    if keyword is not None:
+        return dataset.footprint_keyword_factors[keyword], 100.0, "keyword", keyword
+    
+    return dataset.footprint_default_factor, 100.0, "default", None  # 기본값
+
+def calculate_food_carbon(food_name: str, portion_size: float, dataset: Optional[FactorDataset] = None) -> float:
+    """음식의 탄소 발자국 계산 - 한국 특화 데이터 사용"""
+    factor, base_grams, _, _ = resolve_food_factor(food_name, dataset)
+    return round((portion_size / base_grams) * factor, 3)
+
+def get_food_category(food_name: str, dataset: Optional[FactorDataset] = None) -> str:
     """음식 카테고리 분류"""
-    categories = {
-        "육류": ["소고기", "돼지고기", "닭고기", "양고기", "한우", "삼겹살", "치킨"],
-        "해산물": ["생선", "새우", "게", "조개", "굴", "연어", "참치"],
-        "유제품": ["우유", "치즈", "버터", "요거트", "달걀"],
-        "곡물": ["쌀", "밥", "빵", "면", "파스타"],
-        "채소": ["채소", "상추", "양배추", "브로콜리", "당근", "감자"],
-        "과일": ["과일", "사과", "바나나", "오렌지", "포도", "딸기"],
-        "기타": ["두부", "콩", "커피", "차", "견과류"]
-    }
-    
-    for category, foods in categories.items():
-        for food in foods:
-            if food in food_name:
-                return category
-    
-    return "기타"
+    dataset = dataset or current_dataset()
+    keyword = dataset.footprint_category_matcher.first(food_name)
+    return dataset.footprint_category_by_keyword[keyword] if keyword else "기타"
 
 def get_sustainability_rating(carbon_footprint: float) -> str:
     """지속가능성 등급 평가"""
@@ -1,14 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy.orm import Session
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 
+from app.core.cache import dashboard_cache
 from app.core.database import get_db
+from app.core.etag import etag_matches, not_modified, set_etag
+from app.core.pagination import decode_cursor, encode_cursor
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.meal_log import MealLog, MealType
-from app.data.korean_food_carbon import get_food_carbon_footprint, KOREAN_FOOD_CARBON_DB
+from app.data.factor_dataset import FactorDataset, current_dataset
+from app.services.achievements import MEAL_LOGGED, publish
+from app.services.carbon_rollup import record_meal
+from app.services.streaks import record_meal_streak
+from app.services.data_version import touch_user_data, user_etag
+from app.services.meal_import import aiter_lines, import_meals
+from app.services.meal_writer import meal_write_queue
+from app.services.idempotency import IdempotentRequest
+from app.services.foods import food_id_for
 
 router = APIRouter()
 
@@ -28,61 +40,184 @@ class MealResponse(BaseModel):
     carbon_footprint: float
     image_url: Optional[str]
     logged_at: datetime
+    factor_version: Optional[str] = None  # 계산에 쓴 배출계수 데이터셋 버전
+
+class MealImportError(BaseModel):
+    line: int
+    error: str
+
+class MealImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[MealImportError]  # 앞쪽 최대 100건
+    errors_truncated: bool
+
+class MealPage(BaseModel):
+    items: List[MealResponse]
+    next_cursor: Optional[str]  # 마지막 페이지면 null
+
+MAX_PAGE_SIZE = 200
 
 @router.post("/", response_model=MealResponse)
 async def create_meal_log(
     meal_data: MealCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """식사 기록 추가"""
+    """식사 기록 추가
     
-    # Calculate carbon footprint (simplified calculation)
-    # In real implementation, this would use a comprehensive food database
-    carbon_footprint = calculate_carbon_footprint(meal_data.food_name, meal_data.portion_size)
+    Idempotency-Key 헤더가 있으면 같은 키의 재시도에 처음 응답을 그대로 돌려준다.
+    MEAL_WRITE_BATCHING=1 이면 다른 요청들과 한 트랜잭션으로 묶어서 커밋한다 (app/services/meal_writer.py).
+    키가 있는 요청은 키와 기록을 함께 커밋해야 하므로 묶지 않는다.
+    """
+    
+    idempotent = IdempotentRequest(current_user.id, idempotency_key, "meals.create", meal_data)
+    replay = await idempotent.find_replay(db)
+    if replay is not None:
+        return replay
+    
+    # 계산과 기록의 factor_version 이 같은 데이터셋에서 나오도록 한 번만 잡는다
+    dataset = current_dataset()
+    carbon_footprint = calculate_carbon_footprint(meal_data.food_name, meal_data.portion_size, dataset)
+    food_id = await food_id_for(db, meal_data.food_name, dataset)
+    
+    if meal_write_queue.enabled and idempotency_key is None:
+        # 그룹 커밋: 기다리는 동안 연결을 쥐고 있지 않도록 요청 세션을 먼저 닫는다
+        await db.close()
+        return await meal_write_queue.submit(
+            current_user.id,
+            meal_data.food_name,
+            meal_data.portion_size,
+            meal_data.meal_type,
+            carbon_footprint,
+            meal_data.image_url,
+            food_id,
+            dataset.version
+        )
     
     meal_log = MealLog(
         user_id=current_user.id,
         food_name=meal_data.food_name,
+        food_id=food_id,
         portion_size=meal_data.portion_size,
         meal_type=meal_data.meal_type,
         carbon_footprint=carbon_footprint,
+        factor_version=dataset.version,
         image_url=meal_data.image_url
     )
     
     db.add(meal_log)
-    db.commit()
-    db.refresh(meal_log)
+    await db.flush()
     
-    return meal_log
+    # 일일 롤업과 연속 기록도 같은 트랜잭션에서 갱신
+    await record_meal(db, meal_log)
+    await record_meal_streak(db, meal_log)
+    await publish(db, current_user.id, MEAL_LOGGED)
+    await touch_user_data(db, current_user.id)
+    
+    response = MealResponse.model_validate(meal_log)
+    replay = await idempotent.commit(db, response)
+    if replay is not None:
+        # 같은 키의 동시 요청이 먼저 커밋함 (이 요청의 기록은 롤백됨)
+        return replay
+    dashboard_cache.invalidate(current_user.id)
+    
+    return response
+
+@router.post("/import", response_model=MealImportResponse)
+async def import_meal_logs(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """식사 기록 대량 가져오기 - 요청 본문(CSV 또는 NDJSON)을 스트리밍으로 처리
+    
+    format 을 생략하면 Content-Type 이 text/csv 일 때 CSV, 그 외에는 NDJSON 으로 읽는다.
+    청크 단위로 커밋하므로 중간에 실패해도 앞선 청크는 남는다.
+    """
+    
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    try:
+        report = await import_meals(db, current_user.id, aiter_lines(request.stream()), fmt)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    finally:
+        dashboard_cache.invalidate(current_user.id)
+    
+    return report.to_dict()
 
-@router.get("/", response_model=List[MealResponse])
+@router.get("/", response_model=MealPage)
 async def get_meal_logs(
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    from_: Optional[datetime] = Query(None, alias="from"),
+    to: Optional[datetime] = None,
+    meal_type: Optional[MealType] = None,
+    if_none_match: Optional[str] = Header(None),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """식사 기록 조회"""
+    """식사 기록 조회 - 최신순 키셋 페이지네이션 (If-None-Match 가 현재 ETag 와 같으면 304)
     
-    meal_logs = db.query(MealLog).filter(
-        MealLog.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    (user_id, logged_at, id) 인덱스를 역순으로 읽으므로 몇 번째 페이지든 비용이 같다.
+    from 은 포함, to 는 제외 (UTC).
+    """
+    
+    filters = [MealLog.user_id == current_user.id]
+    if cursor:
+        try:
+            cursor_at, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="잘못된 커서입니다."
+            )
+        filters.append(tuple_(MealLog.logged_at, MealLog.id) < tuple_(cursor_at, cursor_id))
+    if from_:
+        filters.append(MealLog.logged_at >= from_)
+    if to:
+        filters.append(MealLog.logged_at < to)
+    if meal_type:
+        filters.append(MealLog.meal_type == meal_type)
     
-    return meal_logs
+    etag = await user_etag(db, current_user.id, "meals", cursor, limit, from_, to, meal_type)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    # 한 건 더 읽어서 다음 페이지 유무 판단
+    result = await db.execute(
+        select(MealLog).where(*filters).order_by(
+            MealLog.logged_at.desc(), MealLog.id.desc()
+        ).limit(limit + 1)
+    )
+    meal_logs = result.scalars().all()
+    
+    next_cursor = None
+    if len(meal_logs) > limit:
+        meal_logs = meal_logs[:limit]
+        last = meal_logs[-1]
+        next_cursor = encode_cursor(last.logged_at, last.id)
+    
+    return MealPage(items=meal_logs, next_cursor=next_cursor)
 
 @router.get("/{meal_id}", response_model=MealResponse)
 async def get_meal_log(
     meal_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """특정 식사 기록 조회"""
     
-    meal_log = db.query(MealLog).filter(
-        MealLog.id == meal_id,
-        MealLog.user_id == current_user.id
-    ).first()
+    meal_log = await db.scalar(
+        select(MealLog).where(
+            MealLog.id == meal_id,
+            MealLog.user_id == current_user.id
+        )
+    )
     
     if not meal_log:
         raise HTTPException(
@@ -92,36 +227,28 @@ async def get_meal_log(
     
     return meal_log
 
-def calculate_carbon_footprint(food_name: str, portion_size: float) -> float:
+def calculate_carbon_footprint(food_name: str, portion_size: float, dataset: Optional[FactorDataset] = None) -> float:
     """
     음식의 탄소 발자국 계산 - 한국 음식 데이터베이스 사용
+    
+    dataset 을 주면 그 배출계수 데이터셋으로 계산한다 (기록에 남기는 factor_version 과 맞추기 위해).
     """
+    dataset = dataset or current_dataset()
+    
     # 먼저 한국 음식 데이터베이스에서 정확한 이름으로 검색
-    if food_name in KOREAN_FOOD_CARBON_DB:
-        return get_food_carbon_footprint(food_name, portion_size)
+    base_footprint = dataset.resolver.lookup(food_name)
+    if base_footprint is not None:
+        return base_footprint * portion_size
     
     # 부분 일치 검색
-    for food_key in KOREAN_FOOD_CARBON_DB.keys():
-        if food_name in food_key or food_key in food_name:
-            return get_food_carbon_footprint(food_key, portion_size)
-    
-    # 일반적인 카테고리별 기본값 (kg CO2e per 100g 기준으로 변환)
-    carbon_factors = {
-        "소고기": 2.5,
-        "돼지고기": 1.2,
-        "닭고기": 0.6,
-        "생선": 0.5,
-        "달걀": 0.4,
-        "쌀": 0.3,
-        "면": 0.2,
-        "채소": 0.1,
-        "과일": 0.1,
-    }
-    
-    # Find matching food category
-    for food, factor in carbon_factors.items():
-        if food in food_name:
-            return (portion_size / 100) * factor
+    food_key = dataset.resolver.find_partial(food_name)
+    if food_key is not None:
+        return dataset.foods[food_key] * portion_size
+    
+    # Find matching food category (kg CO2e per 100g)
+    category = dataset.meal_keyword_matcher.first(food_name)
+    if category is not None:
+        return (portion_size / 100) * dataset.meal_keyword_factors[category]
     
     # Default factor for unknown foods
-    return (portion_size / 100) * 0.5 
\ No newline at end of file
+    return (portion_size / 100) * dataset.meal_default_factor
@@ -0,0 +1,104 @@
+"""
+인증 캐시
+
+get_current_user 가 요청마다 JWT 를 검증하고 users 테이블을 조회하지 않도록,
+프로세스 안에 두 가지를 보관한다.
+
+- 토큰 -> 사용자 id: 서명 검증을 통과한 토큰만, 토큰의 exp 와 TTL 중 이른 시각까지
+- 사용자 id -> User: 세션에서 떼어 낸(detached) 읽기 전용 행, TTL 동안
+
+프로필을 바꾸는 경로는 커밋한 뒤 invalidate(user_id) 를 호출한다. 무효화는
+이 프로세스에만 적용되므로 다른 워커는 TTL(AUTH_CACHE_TTL) 이 지나면 갱신된다.
+조회 도중 무효화가 일어나면 오래된 행이 다시 들어가지 않도록 cache.py 의
+세대 번호(Generations, 최근에 무효화된 max_entries 명만 보관) 를 같이 쓴다.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.cache import Generations
+from app.models.user import User
+
+
+class AuthCache:
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._tokens = OrderedDict()  # token -> (expires_at(monotonic), token_exp(epoch), user_id)
+        self._users = OrderedDict()  # user_id -> (expires_at, User)
+        self._generations = Generations(max_entries)
+        self.token_hits = 0
+        self.user_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def generation(self, user_id: int) -> int:
+        return self._generations.get(user_id)
+
+    def user_id_for(self, token: str) -> Optional[int]:
+        """검증해 둔 토큰의 사용자 id (없거나, 만료됐으면 None)"""
+        entry = self._tokens.get(token)
+        if entry is None or entry[0] < time.monotonic() or entry[1] <= time.time():
+            return None
+        self._tokens.move_to_end(token)
+        self.token_hits += 1
+        return entry[2]
+
+    def remember_token(self, token: str, user_id: int, token_exp: float):
+        if not self.enabled:
+            return
+        self._tokens[token] = (time.monotonic() + self.ttl_seconds, token_exp, user_id)
+        self._trim(self._tokens)
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        entry = self._users.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self._users.move_to_end(user_id)
+        self.user_hits += 1
+        return entry[1]
+
+    def set_user(self, user: User, generation: int):
+        """generation 이 그대로일 때만 저장 (user 는 세션에서 떼어 낸 행이어야 한다)"""
+        if not self.enabled or generation != self.generation(user.id):
+            return
+        self._users[user.id] = (time.monotonic() + self.ttl_seconds, user)
+        self._trim(self._users)
+
+    def invalidate(self, user_id: int):
+        self._generations.bump(user_id)
+        self._users.pop(user_id, None)
+        self.invalidations += 1
+
+    def clear(self):
+        self._tokens.clear()
+        self._users.clear()
+
+    def _trim(self, entries: OrderedDict):
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "tokens": len(self._tokens),
+            "users": len(self._users),
+            "ttl_seconds": self.ttl_seconds,
+            "token_hits": self.token_hits,
+            "user_hits": self.user_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+# AUTH_CACHE_TTL=0 이면 비활성 (매 요청 검증 + 조회)
+auth_cache = AuthCache(
+    ttl_seconds=float(os.getenv("AUTH_CACHE_TTL", "60")),
+    max_entries=int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000")),
+)
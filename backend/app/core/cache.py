@@ -0,0 +1,117 @@
+"""
+사용자별 응답 캐시
+
+프로세스 안에 직렬화된 응답을 사용자 단위로 보관한다. 쓰기 경로가 커밋한 뒤
+invalidate(user_id) 를 호출하면 다음 조회가 다시 계산하고, 호출이 빠진 경로가
+있어도 TTL 이 지나면 자연히 갱신된다.
+
+계산 도중 무효화가 일어나면 오래된 결과가 다시 들어가지 않도록, 사용자마다
+세대 번호를 두고 계산을 시작할 때의 세대와 같을 때만 저장한다. 세대 번호도
+최근에 무효화된 사용자만 보관하므로 (Generations) 워커가 오래 떠 있어도 늘어나지 않는다.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class Generations:
+    """사용자별 세대 번호 - 최근에 무효화된 max_entries 명만 보관한다
+
+    세대 값은 전역으로 늘어나는 번호에서 받고, 밀려난 사용자의 세대는 지금까지 밀려난 값 중
+    가장 큰 값으로 본다. 계산을 시작한 뒤 무효화된 사용자는 밀려나더라도 시작할 때의 값보다
+    큰 세대를 가지므로 오래된 결과를 저장하지 않는다 (밀려난 다른 사용자 때문에 저장을 한 번
+    건너뛸 수는 있다).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._values = OrderedDict()  # user_id -> 세대
+        self._clock = 0
+        self._floor = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(self, user_id: int) -> int:
+        return self._values.get(user_id, self._floor)
+
+    def bump(self, user_id: int):
+        self._clock += 1
+        self._values[user_id] = self._clock
+        self._values.move_to_end(user_id)
+        while len(self._values) > self.max_entries:
+            _user_id, generation = self._values.popitem(last=False)
+            self._floor = max(self._floor, generation)
+
+
+class UserResponseCache:
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int = 10000):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # user_id -> (expires_at, key, body)
+        self._generations = Generations(max_entries)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def generation(self, user_id: int) -> int:
+        return self._generations.get(user_id)
+
+    def get(self, user_id: int, key: Hashable = None) -> Optional[bytes]:
+        """저장된 응답 반환 (없거나, 만료됐거나, key 가 다르면 None)
+
+        key 는 응답이 의존하는 외부 값(예: 오늘 날짜)으로, 바뀌면 미스로 처리한다.
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic() or entry[1] != key:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry[2]
+
+    def set(self, user_id: int, body: bytes, generation: int, key: Hashable = None):
+        """generation 이 그대로일 때만 저장 (계산 중 무효화된 결과는 버림)"""
+        if not self.enabled or generation != self.generation(user_id):
+            return
+
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, key, body)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self._generations.bump(user_id)
+        self._entries.pop(user_id, None)
+        self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# 대시보드 응답 캐시 (DASHBOARD_CACHE_TTL=0 이면 비활성)
+dashboard_cache = UserResponseCache(
+    "dashboard",
+    ttl_seconds=float(os.getenv("DASHBOARD_CACHE_TTL", "300")),
+    max_entries=int(os.getenv("DASHBOARD_CACHE_MAX_ENTRIES", "10000")),
+)
@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
@@ -15,6 +16,13 @@ if DATABASE_URL.startswith("postgresql://"):
 elif DATABASE_URL.startswith("postgres://"):
     DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+psycopg://", 1)
 
+# Async driver URL: psycopg3 is async-capable under the same dialect name,
+# SQLite goes through aiosqlite
+if DATABASE_URL.startswith("sqlite:"):
+    ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite:", "sqlite+aiosqlite:", 1)
+else:
+    ASYNC_DATABASE_URL = DATABASE_URL
+
 # Create engine with appropriate settings based on database type
 if DATABASE_URL.startswith("sqlite"):
     # SQLite specific settings
@@ -22,6 +30,7 @@ if DATABASE_URL.startswith("sqlite"):
         DATABASE_URL,
         connect_args={"check_same_thread": False}
     )
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
 else:
     # PostgreSQL specific settings for production
     engine = create_engine(
@@ -31,25 +40,40 @@ else:
         pool_size=10,
         max_overflow=20
     )
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=10,
+        max_overflow=20
+    )
 
+# Sync sessions are kept for table creation and offline scripts;
+# request handlers use AsyncSessionLocal through get_db()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: attribute access after commit must not trigger
+# implicit IO, which AsyncSession cannot do
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Health check function for database
-def check_database_health():
+async def check_database_health():
     """Check if database connection is healthy"""
     try:
         from sqlalchemy import text
-        with engine.connect() as conn:
-            conn.execute(text("SELECT 1"))
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         return True
     except Exception:
-        return False 
\ No newline at end of file
+        return False
@@ -0,0 +1,75 @@
+"""
+구조화 로그 설정
+
+로그 레코드를 한 줄짜리 JSON 으로 쓰고, 실제 출력은 QueueListener 스레드가 맡는다.
+요청 처리 중에는 logger 호출이 큐에 넣는 것으로 끝나서 stdout 이 막혀도
+이벤트 루프가 기다리지 않는다. extra={...} 로 넘긴 필드는 JSON 의 최상위 키가 된다.
+
+LOG_LEVEL (기본 info), LOG_FORMAT=text 면 사람이 읽는 형식.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+from typing import Optional
+
+# LogRecord 기본 속성 (extra 로 넘긴 필드만 골라내기 위해)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging():
+    """루트 로거에 큐 핸들러를 한 번만 붙인다 (여러 번 불러도 안전)"""
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "json") == "text":
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    _handler = logging.handlers.QueueHandler(records)
+    root.addHandler(_handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "info").upper())
+    # 요청마다 한 줄씩 남기는 HTTP 클라이언트 로그는 경고부터
+    for name in ("httpx", "httpcore"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """큐에 남은 로그를 모두 쓰고 출력 스레드를 멈춘다"""
+    global _listener, _handler
+    if _listener is not None:
+        logging.getLogger().removeHandler(_handler)
+        _listener.stop()
+        _listener = _handler = None
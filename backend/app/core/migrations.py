@@ -0,0 +1,108 @@
+"""
+버전 기반 스키마 마이그레이션
+
+Base.metadata.create_all 은 없는 테이블만 만들고 기존 테이블에 인덱스나 컬럼을
+추가하지 못한다. 운영 DB 에 필요한 변경은 app/migrations/v<번호>_<이름>.py 에
+upgrade(ctx) 로 작성하고, 적용된 번호는 schema_migrations 테이블에 기록한다.
+
+마이그레이션은 autocommit 연결에서 실행된다. Postgres 에서 인덱스는
+CREATE INDEX CONCURRENTLY 로 만들어 쓰기를 막지 않고, 모든 연산은 IF NOT EXISTS 로
+다시 실행해도 안전해야 한다 (중간에 실패하면 해당 버전 전체를 다시 실행한다).
+"""
+
+import importlib
+import pkgutil
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class MigrationContext:
+    """upgrade(ctx) 에 전달되는 실행 도구"""
+
+    def __init__(self, connection: Connection):
+        self.connection = connection
+        self.dialect = connection.dialect.name
+
+    def execute(self, sql: str, **params):
+        return self.connection.execute(text(sql), params)
+
+    def has_column(self, table: str, column: str) -> bool:
+        return any(c["name"] == column for c in inspect(self.connection).get_columns(table))
+
+    def create_index(self, name: str, table: str, columns: List[str], unique: bool = False):
+        """인덱스 생성 (Postgres 는 CONCURRENTLY, 이미 있으면 건너뜀)"""
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        column_list = ", ".join(columns)
+        if self.dialect == "postgresql":
+            # 이전에 CONCURRENTLY 가 실패하면 INVALID 인덱스가 남아 IF NOT EXISTS 에 걸리므로 먼저 정리
+            invalid = self.execute(
+                "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                "WHERE c.relname = :name AND NOT i.indisvalid",
+                name=name
+            ).first()
+            if invalid:
+                self.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+            self.execute(f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column_list})")
+        else:
+            self.execute(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({column_list})")
+
+    def drop_index(self, name: str):
+        if self.dialect == "postgresql":
+            self.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+        else:
+            self.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def discover_migrations() -> list:
+    """app.migrations 안의 v<번호>_<이름> 모듈을 번호순으로 반환"""
+    import app.migrations as package
+
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        prefix, _, _ = module_info.name.partition("_")
+        if not (prefix.startswith("v") and prefix[1:].isdigit()):
+            continue
+        module = importlib.import_module(f"{package.__name__}.{module_info.name}")
+        migrations.append((int(prefix[1:]), module_info.name, module))
+    return sorted(migrations, key=lambda migration: migration[0])
+
+
+def applied_versions(engine: Engine) -> set:
+    _metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        return set(conn.scalars(select(schema_migrations.c.version)))
+
+
+def pending_migrations(engine: Engine) -> list:
+    applied = applied_versions(engine)
+    return [migration for migration in discover_migrations() if migration[0] not in applied]
+
+
+def apply_migrations(engine: Engine, target: Optional[int] = None, log=print) -> list:
+    """아직 적용되지 않은 마이그레이션을 순서대로 적용하고 적용한 이름 목록을 반환"""
+    applied = []
+    for version, name, module in pending_migrations(engine):
+        if target is not None and version > target:
+            break
+
+        log(f"applying {name}")
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            module.upgrade(MigrationContext(conn))
+            conn.execute(insert(schema_migrations).values(
+                version=version, name=name, applied_at=datetime.utcnow()
+            ))
+        applied.append(name)
+    return applied
@@ -0,0 +1,26 @@
+"""
+키셋(커서) 페이지네이션 헬퍼
+
+커서는 마지막으로 돌려준 행의 정렬 키 (logged_at, id) 를 base64url 로 감싼
+불투명 문자열이다. 클라이언트는 값을 해석하지 않고 그대로 다시 보내기만 한다.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(logged_at: datetime, row_id: int) -> str:
+    payload = json.dumps([logged_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서를 (logged_at, id) 로 복원 (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        logged_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(logged_at), int(row_id)
+    except (TypeError, ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
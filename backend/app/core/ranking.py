@@ -0,0 +1,178 @@
+"""
+순위 집합 (Redis ZSET 과 같은 색인 스킵 리스트)
+
+member -> score 를 점수 내림차순(동점은 member 오름차순) 으로 유지한다.
+각 링크에 건너뛰는 노드 수(span) 를 같이 두어서 추가/삭제/점수 변경뿐 아니라
+순위 조회와 k 번째 원소 찾기도 기대 O(log n) 이다. 백만 명에서도 내 순위 조회는
+수십 번의 비교로 끝난다.
+
+스레드 안전하지 않다. 이벤트 루프 안에서만 쓴다.
+"""
+
+import random
+from typing import Hashable, Iterable, Iterator, List, Optional, Tuple
+
+MAX_LEVEL = 32
+P = 0.25
+
+
+class _Node:
+    __slots__ = ("key", "forward", "span")
+
+    def __init__(self, key, level: int):
+        self.key = key  # (-score, member)
+        self.forward = [None] * level
+        self.span = [0] * level
+
+
+class RankedSet:
+    def __init__(self, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self._head = _Node(None, MAX_LEVEL)
+        self._level = 1
+        self._length = 0
+        self._scores = {}
+
+    @classmethod
+    def from_scores(cls, scores: Iterable[Tuple[Hashable, float]], seed: Optional[int] = None) -> "RankedSet":
+        """(member, score) 들로 한 번에 만든다 (정렬 후 뒤에 이어 붙이므로 O(n log n) 정렬 + O(n))"""
+        ranking = cls(seed)
+        for member, score in scores:
+            ranking._scores[member] = score
+        last = [ranking._head] * MAX_LEVEL
+        last_rank = [0] * MAX_LEVEL
+        position = 0
+        for key in sorted((-score, member) for member, score in ranking._scores.items()):
+            position += 1
+            level = ranking._random_level()
+            node = _Node(key, level)
+            for i in range(level):
+                last[i].forward[i] = node
+                last[i].span[i] = position - last_rank[i]
+                last[i] = node
+                last_rank[i] = position
+            ranking._level = max(ranking._level, level)
+        # 마지막 노드의 span 은 끝까지의 거리 (_insert 와 같은 규칙)
+        for i in range(ranking._level):
+            last[i].span[i] = position - last_rank[i]
+        ranking._length = position
+        return ranking
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, member: Hashable) -> bool:
+        return member in self._scores
+
+    def score(self, member: Hashable) -> Optional[float]:
+        return self._scores.get(member)
+
+    def set(self, member: Hashable, score: float):
+        """member 의 점수를 score 로 (없으면 추가)"""
+        old = self._scores.get(member)
+        if old == score:
+            return
+        if old is not None:
+            self._delete((-old, member))
+        self._insert((-score, member))
+        self._scores[member] = score
+
+    def discard(self, member: Hashable):
+        old = self._scores.pop(member, None)
+        if old is not None:
+            self._delete((-old, member))
+
+    def rank(self, member: Hashable) -> Optional[int]:
+        """1 부터 시작하는 순위 (없으면 None)"""
+        score = self._scores.get(member)
+        if score is None:
+            return None
+        key = (-score, member)
+        rank = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key <= key:
+                rank += node.span[i]
+                node = node.forward[i]
+        return rank
+
+    def range(self, start: int, count: int) -> List[Tuple[int, Hashable, float]]:
+        """start 번째(1 부터) 부터 count 개의 (순위, member, score)"""
+        if start < 1 or count <= 0 or start > self._length:
+            return []
+        traversed = 0
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and traversed + node.span[i] <= start:
+                traversed += node.span[i]
+                node = node.forward[i]
+        entries = []
+        rank = start
+        while node is not None and len(entries) < count:
+            entries.append((rank, node.key[1], -node.key[0]))
+            node = node.forward[0]
+            rank += 1
+        return entries
+
+    def top(self, k: int) -> List[Tuple[int, Hashable, float]]:
+        return self.range(1, k)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        node = self._head.forward[0]
+        while node is not None:
+            yield node.key[1]
+            node = node.forward[0]
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < MAX_LEVEL and self._random.random() < P:
+            level += 1
+        return level
+
+    def _insert(self, key):
+        update = [self._head] * MAX_LEVEL
+        rank = [0] * MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            rank[i] = 0 if i == self._level - 1 else rank[i + 1]
+            while node.forward[i] is not None and node.forward[i].key < key:
+                rank[i] += node.span[i]
+                node = node.forward[i]
+            update[i] = node
+
+        level = self._random_level()
+        if level > self._level:
+            for i in range(self._level, level):
+                rank[i] = 0
+                update[i] = self._head
+                self._head.span[i] = self._length
+            self._level = level
+
+        new = _Node(key, level)
+        for i in range(level):
+            new.forward[i] = update[i].forward[i]
+            update[i].forward[i] = new
+            new.span[i] = update[i].span[i] - (rank[0] - rank[i])
+            update[i].span[i] = rank[0] - rank[i] + 1
+        for i in range(level, self._level):
+            update[i].span[i] += 1
+        self._length += 1
+
+    def _delete(self, key):
+        update = [self._head] * MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                node = node.forward[i]
+            update[i] = node
+
+        target = node.forward[0]
+        for i in range(self._level):
+            if update[i].forward[i] is target:
+                update[i].span[i] += target.span[i] - 1
+                update[i].forward[i] = target.forward[i]
+            else:
+                update[i].span[i] -= 1
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._length -= 1
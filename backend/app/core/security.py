@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
+import base64
+import hmac
 import jwt
 import hashlib
 import secrets
@@ -12,20 +16,70 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 1440  # 24 hours (24 * 60 minutes)
 
+# scrypt 비용 (n=2^14, r=8 이면 16MiB, 수십 ms). 저장된 해시에 인자가 함께 기록되므로
+# 값을 올려도 기존 해시는 그대로 검증되고, 로그인할 때 새 인자로 다시 해시된다
+SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_MAXMEM = 64 * 1024 * 1024
+
+# 해시 계산 전용 스레드 풀 (hashlib.scrypt 는 계산 중 GIL 을 놓는다).
+# 워커 수가 동시에 계산하는 해시 수의 상한이라, 로그인이 몰려도 나머지는 이 풀의 큐에서 기다리고
+# 이벤트 루프와 asyncio 기본 executor 는 다른 요청을 계속 처리한다
+_hash_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    thread_name_prefix="password-hash",
+)
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, maxmem=SCRYPT_MAXMEM, dklen=32)
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password using SHA256 + salt"""
+    """Verify password against a scrypt hash or a legacy SHA256 + salt hash"""
     try:
+        if hashed_password.startswith("scrypt$"):
+            _, n, r, p, salt, expected = hashed_password.split("$")
+            actual = _scrypt(plain_password, base64.b64decode(salt), int(n), int(r), int(p))
+            return hmac.compare_digest(actual, base64.b64decode(expected))
         stored_hash, salt = hashed_password.split(':')
         password_hash = hashlib.sha256((plain_password + salt).encode()).hexdigest()
-        return password_hash == stored_hash
+        return hmac.compare_digest(password_hash, stored_hash)
     except ValueError:
         return False
 
 def get_password_hash(password: str) -> str:
-    """Hash password using SHA256 + random salt"""
-    salt = secrets.token_hex(16)
-    password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-    return f"{password_hash}:{salt}"
+    """Hash password using scrypt + random salt (scrypt$n$r$p$salt$hash)"""
+    salt = secrets.token_bytes(16)
+    derived = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(salt)}${_b64(derived)}"
+
+def needs_rehash(hashed_password: str) -> bool:
+    """기존 SHA256 해시이거나 scrypt 인자가 현재 설정과 다르면 True"""
+    try:
+        scheme, n, r, p, _salt, _hash = hashed_password.split("$")
+        return scheme != "scrypt" or (int(n), int(r), int(p)) != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    except ValueError:
+        return True
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password 를 해시 전용 풀에서 실행"""
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash 를 해시 전용 풀에서 실행"""
+    return await asyncio.get_running_loop().run_in_executor(_hash_pool, get_password_hash, password)
+
+_dummy_hash: Optional[str] = None
+
+async def verify_dummy_password(plain_password: str) -> None:
+    """없는 계정의 로그인도 실제 검증과 같은 시간이 걸리도록 임의 해시를 검증"""
+    global _dummy_hash
+    if _dummy_hash is None:
+        _dummy_hash = await get_password_hash_async(secrets.token_hex(16))
+    await verify_password_async(plain_password, _dummy_hash)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -37,12 +91,16 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def verify_token(token: str):
+def decode_token(token: str) -> Optional[dict]:
+    """서명과 만료를 검증한 토큰 페이로드 (유효하지 않으면 None)"""
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        return email
     except jwt.InvalidTokenError:
-        return None 
\ No newline at end of file
+        return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+def verify_token(token: str):
+    payload = decode_token(token)
+    return None if payload is None else payload["sub"]
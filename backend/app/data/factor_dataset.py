@@ -0,0 +1,195 @@
+"""
+버전이 있는 배출계수 데이터셋
+
+음식/전력/가스/교통/연료 계수와 스왑 표는 코드가 아니라 app/data/emission_factors.json
+(EMISSION_FACTORS_PATH 로 바꿀 수 있음) 에 있고, 읽을 때 불변 구조(FactorDataset) 로
+한 번 컴파일한다. 음식명 인덱스와 키워드 매처도 이때 함께 만든다.
+
+- 요청은 시작할 때 current_dataset() 으로 스냅샷을 한 번 잡고 끝까지 그것만 쓴다.
+  그래서 계산한 값과 기록에 남기는 factor_version 은 항상 같은 데이터셋에서 나온다
+- 재적재는 파일을 읽고 컴파일을 모두 끝낸 뒤 활성 참조 하나만 바꾼다.
+  읽는 쪽에는 잠금이 없고, 진행 중인 요청은 이미 잡은 이전 스냅샷으로 끝난다
+- 파일이 잘못되었으면 ValueError 이고 기존 데이터셋이 그대로 유지된다
+- 데이터셋은 워커 프로세스마다 따로 있으므로 재적재도 워커마다 한다
+  (SIGHUP 또는 POST /api/admin/factors/reload, app/services/factor_reload.py)
+"""
+
+import json
+import math
+import os
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+from app.data.food_index import FoodResolver, KeywordMatcher
+
+DEFAULT_PATH = Path(__file__).with_name("emission_factors.json")
+MAX_VERSION_LENGTH = 32  # meal_logs/activity_logs.factor_version 길이
+
+_set = object.__setattr__
+
+
+def dataset_path() -> Path:
+    return Path(os.getenv("EMISSION_FACTORS_PATH") or DEFAULT_PATH)
+
+
+def _factor(value, field: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value < 0:
+        raise ValueError(f"{field} 는 0 이상의 숫자여야 합니다: {value!r}")
+    return float(value)
+
+
+def _factors(raw: dict, field: str) -> Mapping[str, float]:
+    values = raw.get(field)
+    if not isinstance(values, dict) or not values:
+        raise ValueError(f"{field} 가 비어 있거나 객체가 아닙니다.")
+    return MappingProxyType({
+        str(name): _factor(value, f"{field}.{name}") for name, value in values.items()
+    })
+
+
+def _names(raw: dict, field: str) -> Mapping[str, Tuple[str, ...]]:
+    values = raw.get(field)
+    if not isinstance(values, dict):
+        raise ValueError(f"{field} 가 객체가 아닙니다.")
+    return MappingProxyType({str(key): tuple(str(name) for name in names) for key, names in values.items()})
+
+
+def _swap(entry, field: str) -> Mapping[str, object]:
+    if not isinstance(entry, dict) or not entry.get("swap") or not entry.get("message"):
+        raise ValueError(f"{field} 항목에는 swap, reduction, message 가 있어야 합니다.")
+    return MappingProxyType({
+        "swap": str(entry["swap"]),
+        "reduction": _factor(entry.get("reduction"), f"{field}.reduction"),
+        "message": str(entry["message"]),
+    })
+
+
+class FactorDataset:
+    """한 버전의 배출계수를 컴파일한 읽기 전용 스냅샷"""
+
+    __slots__ = (
+        "version", "description", "source", "loaded_at",
+        "electricity_kg_per_kwh", "city_gas_kg_per_m3", "transport", "fuel", "other_energy",
+        "foods", "food_categories", "category_by_food", "resolver",
+        "meal_keyword_factors", "meal_default_factor", "meal_keyword_matcher",
+        "footprint_keyword_factors", "footprint_default_factor", "footprint_keyword_matcher",
+        "footprint_category_by_keyword", "footprint_category_matcher",
+        "swaps", "swap_matcher", "general_swaps", "general_swap_category", "non_vegetarian_swaps",
+    )
+
+    def __init__(self, raw: dict, source: str = "<memory>"):
+        if not isinstance(raw, dict):
+            raise ValueError("데이터셋 최상위는 객체여야 합니다.")
+        version = str(raw.get("version") or "").strip()
+        if not version or len(version) > MAX_VERSION_LENGTH:
+            raise ValueError(f"version 은 1~{MAX_VERSION_LENGTH}자여야 합니다: {version!r}")
+
+        _set(self, "version", version)
+        _set(self, "description", str(raw.get("description") or ""))
+        _set(self, "source", source)
+        _set(self, "loaded_at", datetime.utcnow())
+
+        _set(self, "electricity_kg_per_kwh", _factor(raw.get("electricity_kg_per_kwh"), "electricity_kg_per_kwh"))
+        _set(self, "city_gas_kg_per_m3", _factor(raw.get("city_gas_kg_per_m3"), "city_gas_kg_per_m3"))
+        _set(self, "transport", _factors(raw, "transport_kg_per_km"))
+        _set(self, "fuel", _factors(raw, "fuel_kg_per_l"))
+        _set(self, "other_energy", _factors(raw, "other_energy"))
+
+        foods = _factors(raw, "foods_kg_per_serving")
+        food_categories = _names(raw, "food_categories")
+        # 음식명 -> 카테고리 역색인 (먼저 선언된 카테고리 우선)
+        category_by_food = {}
+        for category, names in food_categories.items():
+            for name in names:
+                category_by_food.setdefault(name, category)
+        _set(self, "foods", foods)
+        _set(self, "food_categories", food_categories)
+        _set(self, "category_by_food", MappingProxyType(category_by_food))
+        _set(self, "resolver", FoodResolver(foods))
+
+        meal_keywords = _factors(raw, "meal_keyword_kg_per_100g")
+        _set(self, "meal_keyword_factors", meal_keywords)
+        _set(self, "meal_default_factor", _factor(raw.get("meal_default_kg_per_100g"), "meal_default_kg_per_100g"))
+        _set(self, "meal_keyword_matcher", KeywordMatcher(meal_keywords))
+
+        footprint_keywords = _factors(raw, "footprint_keyword_kg_per_100g")
+        _set(self, "footprint_keyword_factors", footprint_keywords)
+        _set(self, "footprint_default_factor", _factor(raw.get("footprint_default_kg_per_100g"), "footprint_default_kg_per_100g"))
+        _set(self, "footprint_keyword_matcher", KeywordMatcher(footprint_keywords))
+        category_by_keyword = {}
+        for category, keywords in _names(raw, "footprint_category_keywords").items():
+            for keyword in keywords:
+                category_by_keyword.setdefault(keyword, category)
+        _set(self, "footprint_category_by_keyword", MappingProxyType(category_by_keyword))
+        _set(self, "footprint_category_matcher", KeywordMatcher(category_by_keyword))
+
+        swaps = raw.get("swaps")
+        if not isinstance(swaps, dict):
+            raise ValueError("swaps 가 객체가 아닙니다.")
+        swaps = MappingProxyType({
+            str(food): tuple(_swap(entry, f"swaps.{food}") for entry in entries)
+            for food, entries in swaps.items()
+        })
+        _set(self, "swaps", swaps)
+        _set(self, "swap_matcher", KeywordMatcher(swaps))
+        _set(self, "general_swaps", tuple(_swap(entry, "general_swaps") for entry in raw.get("general_swaps") or ()))
+        _set(self, "general_swap_category", str(raw.get("general_swap_category") or "기타"))
+        _set(self, "non_vegetarian_swaps", frozenset(raw.get("non_vegetarian_swaps") or ()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FactorDataset 은 바꿀 수 없습니다. 새 데이터셋을 읽어서 교체하세요.")
+
+    def __repr__(self) -> str:
+        return f"<FactorDataset {self.version} foods={len(self.foods)}>"
+
+    def category_of(self, food_name: str) -> str:
+        """데이터셋 음식의 카테고리 (분류되지 않은 음식은 기타)"""
+        return self.category_by_food.get(food_name, "기타")
+
+    def summary(self) -> dict:
+        return {
+            "version": self.version,
+            "description": self.description,
+            "source": self.source,
+            "loaded_at": self.loaded_at.isoformat(),
+            "foods": len(self.foods),
+            "transport_types": len(self.transport),
+            "swap_foods": len(self.swaps),
+        }
+
+
+def load_dataset(path: Optional[Path] = None) -> FactorDataset:
+    """파일을 읽어 컴파일 (활성 데이터셋은 바꾸지 않음)"""
+    path = Path(path) if path is not None else dataset_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"{path} 는 올바른 JSON 이 아닙니다: {exc}") from exc
+    return FactorDataset(raw, source=str(path))
+
+
+_active: FactorDataset = load_dataset()
+
+
+def current_dataset() -> FactorDataset:
+    """현재 활성 데이터셋 (요청마다 한 번 잡아서 쓴다)"""
+    return _active
+
+
+def activate_dataset(dataset: FactorDataset) -> FactorDataset:
+    """활성 데이터셋을 교체하고 이전 데이터셋을 반환
+
+    참조 대입 한 번이므로 읽는 쪽은 잠금 없이 이전 것이나 새 것 중 하나를 온전히 본다.
+    """
+    global _active
+    previous, _active = _active, dataset
+    return previous
+
+
+def reload_dataset(path: Optional[Path] = None) -> Tuple[FactorDataset, FactorDataset]:
+    """파일을 다시 읽어 바로 활성화하고 (이전, 새 데이터셋) 을 반환"""
+    dataset = load_dataset(path)
+    return activate_dataset(dataset), dataset
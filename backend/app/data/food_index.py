@@ -0,0 +1,155 @@
+"""
+음식명 검색 인덱스
+배출계수 데이터셋(app/data/factor_dataset.py) 을 읽을 때 음식 표를 한 번 컴파일해서,
+요청마다 전체 테이블을 선형 탐색하지 않고 음식명을 해석한다.
+
+- 정확 일치: 해시 조회
+- "입력 안에 포함된 음식명": Aho-Corasick 오토마톤 (입력 길이에 비례)
+- "음식명 안에 포함된 입력": 부분 문자열 -> 음식 목록 해시 (조회 O(1))
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+class KeywordMatcher:
+    """Aho-Corasick 다중 패턴 매처
+
+    패턴 선언 순서를 우선순위로 기억하므로, 기존의
+    `for key in patterns: if key in text` 루프와 같은 결과를 돌려준다.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = []
+        self._rank: Dict[str, int] = {}
+        for pattern in patterns:
+            if pattern and pattern not in self._rank:
+                self._rank[pattern] = len(self.patterns)
+                self.patterns.append(pattern)
+
+        # goto / fail / output 테이블 (노드 0 = 루트)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for rank, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                node = next_node
+            self._output[node].append(rank)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def iter_ranks(self, text: str):
+        """text 안에 등장하는 패턴의 순위를 (중복 포함) 순서대로 반환"""
+        node = 0
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if output[node]:
+                yield from output[node]
+
+    def find_all(self, text: str) -> List[str]:
+        """text 안에 등장하는 모든 패턴 (선언 순서)"""
+        ranks = sorted(set(self.iter_ranks(text)))
+        return [self.patterns[rank] for rank in ranks]
+
+    def first(self, text: str) -> Optional[str]:
+        """text 안에 등장하는 패턴 중 선언 순서가 가장 빠른 것"""
+        best = None
+        for rank in self.iter_ranks(text):
+            if best is None or rank < best:
+                best = rank
+                if best == 0:
+                    break
+        return self.patterns[best] if best is not None else None
+
+
+class FoodResolver:
+    """음식 탄소 데이터베이스용 사전 컴파일 인덱스"""
+
+    def __init__(self, food_db: Dict[str, float]):
+        self.food_db = food_db
+        self._rank = {name: i for i, name in enumerate(food_db)}
+        self._contained_matcher = KeywordMatcher(food_db.keys())
+
+        # 소문자 부분 문자열 -> 음식명 목록 (테이블 순서)
+        # 빈 문자열은 모든 음식에 포함된다
+        self._substrings: Dict[str, List[str]] = {"": list(food_db)}
+        for name in food_db:
+            lowered = name.lower()
+            seen = set()
+            for start in range(len(lowered)):
+                for end in range(start + 1, len(lowered) + 1):
+                    fragment = lowered[start:end]
+                    if fragment not in seen:
+                        seen.add(fragment)
+                        self._substrings.setdefault(fragment, []).append(name)
+
+        # search_similar 결과는 탄소 발자국 오름차순으로 미리 정렬
+        self._similar_sorted = {
+            fragment: sorted(names, key=lambda n: food_db[n])
+            for fragment, names in self._substrings.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.food_db)
+
+    def lookup(self, food_name: str) -> Optional[float]:
+        """정확히 일치하는 음식의 1인분 탄소 발자국"""
+        return self.food_db.get(food_name)
+
+    def names_within(self, text: str) -> List[str]:
+        """text 안에 포함된 음식명들 (테이블 순서)"""
+        return self._contained_matcher.find_all(text)
+
+    def names_containing(self, query: str) -> List[str]:
+        """query 를 포함하는 음식명들 (테이블 순서, 대소문자 구분)"""
+        candidates = self._substrings.get(query.lower(), [])
+        return [name for name in candidates if query in name]
+
+    def find_partial(self, food_name: str) -> Optional[str]:
+        """입력과 양방향 부분 일치하는 음식 중 테이블 순서가 가장 빠른 것"""
+        best = None
+        contained = self._contained_matcher.first(food_name)
+        if contained is not None:
+            best = self._rank[contained]
+        for name in self._substrings.get(food_name.lower(), ()):
+            if food_name in name:
+                rank = self._rank[name]
+                if best is None or rank < best:
+                    best = rank
+                break
+        return self._contained_matcher.patterns[best] if best is not None else None
+
+    def search_similar(self, query: str) -> List[str]:
+        """query 를 포함하는 음식명들 (대소문자 무시, 탄소 발자국 낮은 순)"""
+        return self._similar_sorted.get(query.lower(), [])
+
+
+def __getattr__(name):
+    # food_resolver 는 활성 배출계수 데이터셋의 인덱스 (재적재되면 바뀐다)
+    if name == "food_resolver":
+        from app.data.factor_dataset import current_dataset
+        return current_dataset().resolver
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,68 +1,48 @@
 """
 한국 온실가스 배출계수 데이터
 출처: 2024년 승인 국가 온실가스 배출 계수 (환경부)
-"""
 
-# 전력 배출계수 (tCO2eq/MWh -> kgCO2eq/kWh로 변환)
-ELECTRICITY_FACTOR_KG_PER_KWH = 0.4541  # 2024년 기준
+값은 app/data/emission_factors.json 에 있고, 여기서는 활성 배출계수 데이터셋
+(app/data/factor_dataset.py) 을 조회한다. 해마다 계수가 바뀌면 파일만 고쳐서 재적재한다.
 
-# 도시가스 배출계수 (kgCO2eq/m³)
-CITY_GAS_FACTOR_KG_PER_M3 = 2.176
+- electricity_kg_per_kwh: 전력 (tCO2eq/MWh -> kgCO2eq/kWh)
+- city_gas_kg_per_m3: 도시가스 (kgCO2eq/m³)
+- transport_kg_per_km: 교통수단별 (kgCO2eq/km)
+- fuel_kg_per_l: 연료별 (kgCO2eq/L)
+"""
 
-# 교통수단별 배출계수 (kgCO2eq/km)
-TRANSPORT_FACTORS = {
-    # 개인 교통수단
-    "car_gasoline": 0.2157,      # 휘발유 승용차
-    "car_diesel": 0.1943,        # 경유 승용차
-    "car_lpg": 0.1847,          # LPG 승용차
-    "motorcycle": 0.0988,        # 오토바이
-    
-    # 대중교통
-    "bus_city": 0.0648,         # 시내버스
-    "bus_express": 0.0432,      # 고속버스
-    "subway": 0.0288,           # 지하철
-    "train_ktx": 0.0156,        # KTX
-    "train_regular": 0.0324,    # 일반열차
-    
-    # 항공
-    "airplane_domestic": 0.1576,  # 국내선
-    "airplane_international": 0.1899,  # 국제선
-    
-    # 친환경 교통수단
-    "bicycle": 0.0,             # 자전거
-    "walking": 0.0,             # 도보
-    "electric_car": 0.0541,     # 전기차 (전력 배출계수 적용)
-}
+from typing import Optional
 
-# 연료별 배출계수 (kgCO2eq/L)
-FUEL_FACTORS = {
-    "gasoline": 2.27,           # 휘발유
-    "diesel": 2.64,             # 경유
-    "lpg": 1.68,               # LPG
-    "kerosene": 2.46,          # 등유
-}
+from app.data.factor_dataset import FactorDataset, current_dataset
 
-# 기타 에너지원 배출계수
-OTHER_ENERGY_FACTORS = {
-    "heating_oil_kg_per_l": 2.68,      # 난방유
-    "propane_kg_per_kg": 2.93,         # 프로판
-    "butane_kg_per_kg": 2.93,          # 부탄
+_CONSTANTS = {
+    "ELECTRICITY_FACTOR_KG_PER_KWH": "electricity_kg_per_kwh",
+    "CITY_GAS_FACTOR_KG_PER_M3": "city_gas_kg_per_m3",
+    "TRANSPORT_FACTORS": "transport",
+    "FUEL_FACTORS": "fuel",
+    "OTHER_ENERGY_FACTORS": "other_energy",
 }
 
-def get_electricity_co2(kwh: float) -> float:
+def __getattr__(name):
+    # 예전 상수 이름은 활성 데이터셋의 값 (재적재되면 새 값)
+    if name in _CONSTANTS:
+        return getattr(current_dataset(), _CONSTANTS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def get_electricity_co2(kwh: float, dataset: Optional[FactorDataset] = None) -> float:
     """전력 사용량(kWh)을 CO2 배출량(kg)으로 변환"""
-    return kwh * ELECTRICITY_FACTOR_KG_PER_KWH
+    return kwh * (dataset or current_dataset()).electricity_kg_per_kwh
 
-def get_gas_co2(m3: float) -> float:
+def get_gas_co2(m3: float, dataset: Optional[FactorDataset] = None) -> float:
     """도시가스 사용량(m³)을 CO2 배출량(kg)으로 변환"""
-    return m3 * CITY_GAS_FACTOR_KG_PER_M3
+    return m3 * (dataset or current_dataset()).city_gas_kg_per_m3
 
-def get_transport_co2(transport_type: str, distance_km: float) -> float:
+def get_transport_co2(transport_type: str, distance_km: float, dataset: Optional[FactorDataset] = None) -> float:
     """교통수단별 이동거리(km)를 CO2 배출량(kg)으로 변환"""
-    factor = TRANSPORT_FACTORS.get(transport_type, 0.0)
+    factor = (dataset or current_dataset()).transport.get(transport_type, 0.0)
     return distance_km * factor
 
-def get_fuel_co2(fuel_type: str, liters: float) -> float:
+def get_fuel_co2(fuel_type: str, liters: float, dataset: Optional[FactorDataset] = None) -> float:
     """연료 사용량(L)을 CO2 배출량(kg)으로 변환"""
-    factor = FUEL_FACTORS.get(fuel_type, 0.0)
-    return liters * factor 
\ No newline at end of file
+    factor = (dataset or current_dataset()).fuel.get(fuel_type, 0.0)
+    return liters * factor
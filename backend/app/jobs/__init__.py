@@ -0,0 +1 @@
+# Offline jobs package
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+포인트 원장 감사
+
+points_ledger 를 사용자별로 다시 합산해서 user_activity_counters 의 포인트/탄소 절약/배지 수와
+비교하고, 다른 사용자를 출력한다. --fix 면 합계(와 레벨) 를 원장 값으로 고친다.
+원장이 비어 있는 오래된 데이터는 rebuild_activity_counters 로 먼저 채워야 한다.
+
+    python -m app.jobs.audit_points_ledger --chunk-size 1000 [--fix]
+"""
+
+import argparse
+import time
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.jobs.rebuild_activity_counters import apply_ledger_totals
+from app.models.user import User
+from app.models.user_activity_counter import UserActivityCounter
+from app.services.points_ledger import ledger_totals_select, totals_mismatches
+
+
+def audit_chunk(db: Session, user_ids: list, fix: bool = False) -> list:
+    stored = {
+        row.user_id: (row.total_points, row.carbon_saved, row.badge_count)
+        for row in db.execute(
+            select(
+                UserActivityCounter.user_id,
+                UserActivityCounter.total_points,
+                UserActivityCounter.carbon_saved,
+                UserActivityCounter.badge_count,
+            ).where(UserActivityCounter.user_id.in_(user_ids))
+        )
+    }
+    recomputed = {
+        row.user_id: (row.total_points, float(row.carbon_saved), row.badge_count)
+        for row in db.execute(ledger_totals_select(user_ids))
+    }
+    mismatches = totals_mismatches(stored, recomputed)
+    if fix and mismatches:
+        # 합계 행이 없는 사용자는 다음 이벤트에서 만들어지므로 있는 행만 고친다
+        apply_ledger_totals(db, [m["user_id"] for m in mismatches if m["user_id"] in stored])
+        db.commit()
+    return mismatches
+
+
+def audit_points_ledger(db: Session, chunk_size: int = 1000, fix: bool = False, user_id: Optional[int] = None) -> list:
+    """원장 합계와 다른 사용자 목록 (fix 면 고친 뒤의 목록이 아니라 찾은 목록)"""
+    if user_id is not None:
+        return audit_chunk(db, [user_id], fix=fix)
+
+    mismatches = []
+    last_id = 0
+    while True:
+        user_ids = db.scalars(
+            select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+        ).all()
+        if not user_ids:
+            break
+
+        mismatches.extend(audit_chunk(db, user_ids, fix=fix))
+        last_id = user_ids[-1]
+        print(f"  users <= {last_id}: {len(mismatches)} mismatches")
+
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="포인트 원장과 누적 합계 비교")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="한 번에 비교할 사용자 수")
+    parser.add_argument("--user-id", type=int, default=None, help="특정 사용자만 비교")
+    parser.add_argument("--fix", action="store_true", help="다른 합계를 원장 값으로 고친다")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        mismatches = audit_points_ledger(db, chunk_size=args.chunk_size, fix=args.fix, user_id=args.user_id)
+    elapsed = time.perf_counter() - started
+    for mismatch in mismatches:
+        print(f"  user {mismatch['user_id']}: stored {mismatch['stored']} != ledger {mismatch['ledger']}")
+    action = "fixed" if args.fix else "found"
+    print(f"{action} {len(mismatches)} mismatched totals in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
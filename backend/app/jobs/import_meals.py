@@ -0,0 +1,48 @@
+"""
+식사 기록 대량 가져오기 CLI
+
+다른 앱에서 내보낸 기록이나 데이터 복구용 파일을 한 사용자 계정으로 넣는다.
+POST /api/meals/import 와 같은 경로(청크 트랜잭션, COPY/executemany)를 사용한다.
+
+    python -m app.jobs.import_meals --user-id 3 meals.csv
+    python -m app.jobs.import_meals --user-id 3 --format ndjson meals.ndjson
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core.cache import dashboard_cache
+from app.core.database import AsyncSessionLocal
+from app.services.meal_import import CHUNK_SIZE, aiter_file_lines, import_meals
+
+
+async def run(path: str, user_id: int, fmt: str, chunk_size: int):
+    with open(path, encoding="utf-8-sig", newline="") as source:
+        async with AsyncSessionLocal() as db:
+            report = await import_meals(db, user_id, aiter_file_lines(source), fmt, chunk_size)
+    dashboard_cache.invalidate(user_id)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="식사 기록 대량 가져오기")
+    parser.add_argument("path", help="CSV(헤더 포함) 또는 NDJSON 파일")
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--format", choices=["csv", "ndjson"], default=None, help="생략하면 확장자로 판단")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="트랜잭션당 행 수")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    started = time.perf_counter()
+    report = asyncio.run(run(args.path, args.user_id, fmt, args.chunk_size))
+    elapsed = time.perf_counter() - started
+
+    print(f"imported {report.imported} rows, {report.failed} failed in {elapsed:.1f}s")
+    for error in report.errors:
+        print(f"  line {error['line']}: {error['error']}")
+
+
+if __name__ == "__main__":
+    main()
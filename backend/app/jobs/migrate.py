@@ -0,0 +1,40 @@
+"""
+스키마 마이그레이션 적용
+
+없는 테이블을 만든 뒤 (create_all) 아직 적용되지 않은 app/migrations 버전을
+순서대로 적용한다. 배포 시 서버 시작 전에 한 번 실행한다.
+
+    python -m app.jobs.migrate            # 모두 적용
+    python -m app.jobs.migrate --status   # 적용/대기 목록만 출력
+"""
+
+import argparse
+import time
+
+from app.core.database import engine
+from app.core.migrations import apply_migrations, applied_versions, discover_migrations
+from app.models import Base
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스키마 마이그레이션 적용")
+    parser.add_argument("--status", action="store_true", help="적용 여부만 출력")
+    parser.add_argument("--target", type=int, default=None, help="이 버전까지만 적용")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+
+    if args.status:
+        applied = applied_versions(engine)
+        for version, name, _ in discover_migrations():
+            print(f"  [{'x' if version in applied else ' '}] {name}")
+        return
+
+    started = time.perf_counter()
+    applied = apply_migrations(engine, target=args.target)
+    elapsed = time.perf_counter() - started
+    print(f"applied {len(applied)} migration(s) in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+만료된 Idempotency-Key 삭제
+
+expires_at 이 지난 idempotency_keys 행을 --chunk-size 개씩 나눠 지운다.
+청크마다 커밋하므로 오래 걸려도 쓰기 요청을 오래 막지 않는다. 주기적으로(예: 매일) 실행한다.
+
+    python -m app.jobs.purge_idempotency_keys --chunk-size 5000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+
+
+def purge_expired(db: Session, chunk_size: int = 5000, now: datetime = None) -> int:
+    """만료된 키를 지우고 지운 행 수를 반환"""
+    now = now or datetime.utcnow()
+    deleted = 0
+    while True:
+        ids = db.scalars(
+            select(IdempotencyKey.id).where(IdempotencyKey.expires_at < now).limit(chunk_size)
+        ).all()
+        if not ids:
+            return deleted
+
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)))
+        db.commit()
+        deleted += len(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="만료된 Idempotency-Key 삭제")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="트랜잭션당 삭제 행 수")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        deleted = purge_expired(db, chunk_size=args.chunk_size)
+    print(f"deleted {deleted} expired keys in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+user_activity_counters 백필 / 재계산
+
+식사, 수락한 스왑, 참여/완료한 챌린지 이력으로 사용자별 성취 카운터를 다시 계산하고,
+이미 기준을 넘었는데 배지가 없는 사용자에게 규칙별 INSERT ... SELECT 한 문장으로 배지를 준다
+(연속 기록 규칙은 user_streaks 의 최고 연속 기준). 연속 기록이 원본과 맞지 않는다면
+rebuild_streaks 를 먼저 실행해야 한다.
+
+원장(points_ledger) 에 행이 없는 배지와 수락한 스왑은 원장 행을 채운 뒤, 포인트/탄소 절약/배지 수와
+레벨은 원장 합계로 맞춘다.
+
+    python -m app.jobs.rebuild_activity_counters --chunk-size 500
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import bindparam, case, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.badge import Badge, UserBadge
+from app.models.challenge import UserChallenge
+from app.models.meal_log import MealLog
+from app.models.points_ledger import PointsLedgerEntry
+from app.models.recommended_swap import RecommendedSwap
+from app.models.user import User
+from app.models.user_activity_counter import UserActivityCounter
+from app.models.user_streak import UserStreak
+from app.services.achievements import CURRENT_STREAK, all_rules, sync_badges
+from app.services.points_ledger import BADGE_AWARDED, SWAP_ACCEPTED, SWAP_UNACCEPTED, ledger_totals_select, level_for
+
+
+def _insert(model, dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def counter_rows(db: Session, user_ids: list) -> list:
+    """주어진 사용자들의 카운터를 이력에서 계산"""
+    rows = {
+        user_id: {
+            "user_id": user_id, "meals_logged": 0, "swaps_accepted": 0, "carbon_saved": 0.0,
+            "challenges_joined": 0, "challenges_completed": 0, "total_points": 0, "badge_count": 0, "level": 1,
+        }
+        for user_id in user_ids
+    }
+    for user_id, meals in db.execute(
+        select(MealLog.user_id, func.count()).where(MealLog.user_id.in_(user_ids)).group_by(MealLog.user_id)
+    ):
+        rows[user_id]["meals_logged"] = meals
+    for user_id, swaps, saved in db.execute(
+        select(MealLog.user_id, func.count(), func.coalesce(func.sum(RecommendedSwap.carbon_reduction), 0.0))
+        .join(MealLog, RecommendedSwap.meal_log_id == MealLog.id)
+        .where(MealLog.user_id.in_(user_ids), RecommendedSwap.accepted == True)
+        .group_by(MealLog.user_id)
+    ):
+        rows[user_id]["swaps_accepted"] = swaps
+        rows[user_id]["carbon_saved"] = float(saved)
+    for user_id, joined, completed in db.execute(
+        select(
+            UserChallenge.user_id,
+            func.count(),
+            func.coalesce(func.sum(case((UserChallenge.completed == True, 1), else_=0)), 0),
+        )
+        .where(UserChallenge.user_id.in_(user_ids))
+        .group_by(UserChallenge.user_id)
+    ):
+        rows[user_id]["challenges_joined"] = joined
+        rows[user_id]["challenges_completed"] = completed
+
+    now = datetime.utcnow()
+    return [{**row, "updated_at": now} for row in rows.values()]
+
+
+def award_missing_badges(db: Session, user_ids: list) -> int:
+    """기준을 넘은 사용자에게 없는 배지를 규칙마다 한 문장으로 지급하고 지급 건수를 반환"""
+    dialect_name = db.bind.dialect.name
+    badge_ids = dict(db.execute(select(Badge.badge_type, Badge.id)).all())
+    now = datetime.utcnow()
+    awarded = 0
+    for rule in all_rules():
+        if rule.badge_type not in badge_ids:
+            continue
+        if rule.metric == CURRENT_STREAK:
+            source, user_column, value = UserStreak, UserStreak.user_id, UserStreak.best_streak
+        else:
+            source, user_column = UserActivityCounter, UserActivityCounter.user_id
+            value = getattr(UserActivityCounter, rule.metric)
+        qualified = select(user_column, literal(badge_ids[rule.badge_type]), literal(now)).where(
+            user_column.in_(user_ids), value >= rule.threshold
+        )
+        result = db.execute(
+            _insert(UserBadge, dialect_name)
+            .from_select(["user_id", "badge_id", "earned_at"], qualified)
+            .on_conflict_do_nothing(index_elements=[UserBadge.user_id, UserBadge.badge_id])
+        )
+        awarded += result.rowcount or 0
+    return awarded
+
+
+def backfill_ledger(db: Session, user_ids: list) -> int:
+    """원장 행이 없는 배지와 수락한 스왑의 원장 행을 INSERT ... SELECT 로 채우고 추가한 행 수를 반환"""
+    now = datetime.utcnow()
+    badge_entries = select(
+        UserBadge.user_id, literal(BADGE_AWARDED), Badge.points, literal(0.0), UserBadge.badge_id,
+        func.coalesce(UserBadge.earned_at, now),
+    ).join(Badge, UserBadge.badge_id == Badge.id).where(
+        UserBadge.user_id.in_(user_ids),
+        ~select(PointsLedgerEntry.id).where(
+            PointsLedgerEntry.user_id == UserBadge.user_id,
+            PointsLedgerEntry.kind == BADGE_AWARDED,
+            PointsLedgerEntry.ref_id == UserBadge.badge_id,
+        ).exists(),
+    )
+    # 수락/취소 원장 행이 하나라도 있는 스왑은 이미 원장에 반영된 것
+    swap_entries = select(
+        MealLog.user_id, literal(SWAP_ACCEPTED), literal(0), RecommendedSwap.carbon_reduction, RecommendedSwap.id,
+        func.coalesce(RecommendedSwap.created_at, now),
+    ).join(MealLog, RecommendedSwap.meal_log_id == MealLog.id).where(
+        MealLog.user_id.in_(user_ids),
+        RecommendedSwap.accepted == True,
+        ~select(PointsLedgerEntry.id).where(
+            PointsLedgerEntry.user_id == MealLog.user_id,
+            PointsLedgerEntry.kind.in_([SWAP_ACCEPTED, SWAP_UNACCEPTED]),
+            PointsLedgerEntry.ref_id == RecommendedSwap.id,
+        ).exists(),
+    )
+    columns = ["user_id", "kind", "points", "carbon_saved", "ref_id", "created_at"]
+    added = 0
+    for entries in (badge_entries, swap_entries):
+        added += db.execute(insert(PointsLedgerEntry).from_select(columns, entries)).rowcount or 0
+    return added
+
+
+def apply_ledger_totals(db: Session, user_ids: list):
+    """포인트/탄소 절약/배지 수와 레벨을 원장 합계로 맞춘다"""
+    totals = db.execute(ledger_totals_select(user_ids)).all()
+    if not totals:
+        return
+    table = UserActivityCounter.__table__
+    db.execute(
+        update(table).where(table.c.user_id == bindparam("row_user_id")).values(
+            total_points=bindparam("points"),
+            carbon_saved=bindparam("carbon"),
+            badge_count=bindparam("badges"),
+            level=bindparam("row_level"),
+        ),
+        [
+            {
+                "row_user_id": row.user_id,
+                "points": row.total_points,
+                "carbon": float(row.carbon_saved),
+                "badges": row.badge_count,
+                "row_level": level_for(row.total_points),
+            }
+            for row in totals
+        ],
+    )
+
+
+def rebuild_chunk(db: Session, user_ids: list) -> tuple:
+    rows = counter_rows(db, user_ids)
+    db.execute(delete(UserActivityCounter).where(UserActivityCounter.user_id.in_(user_ids)))
+    db.execute(insert(UserActivityCounter), rows)
+    awarded = award_missing_badges(db, user_ids)
+    backfill_ledger(db, user_ids)
+    apply_ledger_totals(db, user_ids)
+    db.commit()
+    return len(rows), awarded
+
+
+def rebuild_activity_counters(db: Session, chunk_size: int = 500, user_id: Optional[int] = None) -> dict:
+    """전체(또는 한 사용자) 카운터 재계산과 누락 배지 지급"""
+    sync_badges(db.connection())
+    db.commit()
+    if user_id is not None:
+        rows, awarded = rebuild_chunk(db, [user_id])
+        return {"users": rows, "badges": awarded}
+
+    users = badges = 0
+    last_id = 0
+    while True:
+        user_ids = db.scalars(
+            select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+        ).all()
+        if not user_ids:
+            break
+
+        rows, awarded = rebuild_chunk(db, user_ids)
+        users += rows
+        badges += awarded
+        last_id = user_ids[-1]
+        print(f"  users <= {last_id}: {users} users, {badges} badges awarded")
+
+    return {"users": users, "badges": badges}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="user_activity_counters 백필")
+    parser.add_argument("--chunk-size", type=int, default=500, help="트랜잭션당 사용자 수")
+    parser.add_argument("--user-id", type=int, default=None, help="특정 사용자만 재계산")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = rebuild_activity_counters(db, chunk_size=args.chunk_size, user_id=args.user_id)
+    elapsed = time.perf_counter() - started
+    print(f"rebuilt counters for {result['users']} users, awarded {result['badges']} badges in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
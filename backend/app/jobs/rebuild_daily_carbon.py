@@ -0,0 +1,86 @@
+"""
+user_daily_carbon 롤업 재구축
+
+meal_logs 전체 이력에서 롤업을 다시 계산한다. 사용자 id 구간 단위로 잘라서
+구간마다 (삭제 + 재집계 + 삽입) 을 한 트랜잭션으로 처리하므로, 긴 락 없이
+운영 중에도 실행할 수 있다.
+
+    python -m app.jobs.rebuild_daily_carbon --chunk-size 500
+"""
+
+import argparse
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.meal_log import MealLog
+from app.models.user import User
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.services.carbon_rollup import daily_carbon_select
+
+
+def rebuild_chunk(db: Session, user_ids: list) -> int:
+    """주어진 사용자들의 롤업 행을 원본 기록으로 교체"""
+    now = datetime.utcnow()
+    query = daily_carbon_select(db.bind.dialect.name, MealLog.user_id.in_(user_ids))
+    rows = [
+        {
+            "user_id": row.user_id,
+            "day": row.day,
+            "total_carbon": row.total_carbon,
+            "meal_count": row.meal_count,
+            "top_food": row.top_food,
+            "max_carbon": row.max_carbon,
+            "updated_at": now,
+        }
+        for row in db.execute(query)
+    ]
+
+    db.execute(delete(UserDailyCarbon).where(UserDailyCarbon.user_id.in_(user_ids)))
+    if rows:
+        db.execute(insert(UserDailyCarbon), rows)
+    db.commit()
+    return len(rows)
+
+
+def rebuild_daily_carbon(db: Session, chunk_size: int = 500, user_id: Optional[int] = None) -> dict:
+    """전체(또는 한 사용자) 롤업 재구축"""
+    if user_id is not None:
+        return {"users": 1, "rows": rebuild_chunk(db, [user_id])}
+
+    users = rows = 0
+    last_id = 0
+    while True:
+        user_ids = db.scalars(
+            select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+        ).all()
+        if not user_ids:
+            break
+
+        rows += rebuild_chunk(db, user_ids)
+        users += len(user_ids)
+        last_id = user_ids[-1]
+        print(f"  users <= {last_id}: {users} users, {rows} rollup rows")
+
+    return {"users": users, "rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="user_daily_carbon 롤업 재구축")
+    parser.add_argument("--chunk-size", type=int, default=500, help="트랜잭션당 사용자 수")
+    parser.add_argument("--user-id", type=int, default=None, help="특정 사용자만 재구축")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = rebuild_daily_carbon(db, chunk_size=args.chunk_size, user_id=args.user_id)
+    elapsed = time.perf_counter() - started
+    print(f"rebuilt {result['rows']} rows for {result['users']} users in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+leaderboard_scores 백필 / 재계산
+
+현재 기간의 리더보드 스냅샷을 보드마다 INSERT ... SELECT 한 문장으로 다시 만든다.
+
+- points: user_activity_counters.total_points
+- carbon_weekly: 이번 주(KST 월요일부터) points_ledger 의 탄소 절약 합
+- streak: 오늘 기록해서 이어지고 있는 user_streaks.current_streak
+
+합계와 원장이 맞지 않는다면 rebuild_activity_counters 를 먼저 실행해야 한다.
+실행 중인 워커는 LEADERBOARD_REFRESH_SECONDS 안에 바뀐 행을 따라잡는다.
+
+    python -m app.jobs.rebuild_leaderboards [--board points]
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.leaderboard_score import LeaderboardScore
+from app.models.points_ledger import PointsLedgerEntry
+from app.models.user_activity_counter import UserActivityCounter
+from app.models.user_streak import UserStreak
+from app.services.carbon_rollup import KST_OFFSET, kst_today
+from app.services.leaderboards import BOARDS, CARBON_WEEKLY, POINTS, STREAK, period_for
+
+
+def scores_select(board: str, today: date, now: datetime):
+    """보드의 현재 기간 (board, period, user_id, score, updated_at) 행을 계산하는 SELECT"""
+    period = period_for(board, today)
+    if board == POINTS:
+        return select(
+            literal(board), literal(period), UserActivityCounter.user_id,
+            UserActivityCounter.total_points, literal(now),
+        ).where(UserActivityCounter.total_points > 0)
+    if board == CARBON_WEEKLY:
+        week_start = datetime.combine(date.fromisoformat(period), datetime.min.time()) - KST_OFFSET
+        saved = func.sum(PointsLedgerEntry.carbon_saved)
+        return select(
+            literal(board), literal(period), PointsLedgerEntry.user_id, saved, literal(now),
+        ).where(PointsLedgerEntry.created_at >= week_start).group_by(PointsLedgerEntry.user_id).having(saved > 0)
+    if board == STREAK:
+        return select(
+            literal(board), literal(period), UserStreak.user_id, UserStreak.current_streak, literal(now),
+        ).where(UserStreak.last_day == today, UserStreak.current_streak > 0)
+    raise ValueError(f"unknown board: {board}")
+
+
+def rebuild_board(db: Session, board: str) -> int:
+    """현재 기간의 스냅샷을 교체하고 행 수를 반환"""
+    today = kst_today()
+    period = period_for(board, today)
+    db.execute(delete(LeaderboardScore).where(LeaderboardScore.board == board, LeaderboardScore.period == period))
+    db.execute(
+        insert(LeaderboardScore).from_select(
+            ["board", "period", "user_id", "score", "updated_at"], scores_select(board, today, datetime.utcnow())
+        )
+    )
+    db.commit()
+    return db.scalar(
+        select(func.count()).select_from(LeaderboardScore).where(
+            LeaderboardScore.board == board, LeaderboardScore.period == period
+        )
+    )
+
+
+def rebuild_leaderboards(db: Session, boards=BOARDS) -> dict:
+    return {board: rebuild_board(db, board) for board in boards}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="leaderboard_scores 백필")
+    parser.add_argument("--board", choices=BOARDS, default=None, help="특정 보드만 재계산")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = rebuild_leaderboards(db, [args.board] if args.board else BOARDS)
+    elapsed = time.perf_counter() - started
+    for board, rows in result.items():
+        print(f"  {board}: {rows} users")
+    print(f"rebuilt {len(result)} leaderboards in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
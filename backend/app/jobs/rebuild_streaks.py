@@ -0,0 +1,73 @@
+"""
+user_streaks 백필 / 재계산
+
+user_daily_carbon 의 기록 날짜를 gaps-and-islands 로 묶어서 사용자별
+(현재 연속, 최고 연속, 마지막 기록일) 을 다시 계산한다. 롤업이 원본과
+맞지 않는다면 rebuild_daily_carbon 을 먼저 실행해야 한다.
+
+    python -m app.jobs.rebuild_streaks --chunk-size 500
+"""
+
+import argparse
+import time
+from typing import Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.models.user_streak import UserStreak
+from app.services.streaks import streak_islands_select, streak_rows
+
+
+def rebuild_chunk(db: Session, user_ids: list) -> int:
+    """주어진 사용자들의 연속 기록 행을 롤업 기준으로 교체"""
+    query = streak_islands_select(db.bind.dialect.name, UserDailyCarbon.user_id.in_(user_ids))
+    rows = streak_rows(db.execute(query))
+
+    db.execute(delete(UserStreak).where(UserStreak.user_id.in_(user_ids)))
+    if rows:
+        db.execute(insert(UserStreak), rows)
+    db.commit()
+    return len(rows)
+
+
+def rebuild_streaks(db: Session, chunk_size: int = 500, user_id: Optional[int] = None) -> dict:
+    """전체(또는 한 사용자) 연속 기록 재계산"""
+    if user_id is not None:
+        return {"users": 1, "rows": rebuild_chunk(db, [user_id])}
+
+    users = rows = 0
+    last_id = 0
+    while True:
+        user_ids = db.scalars(
+            select(User.id).where(User.id > last_id).order_by(User.id).limit(chunk_size)
+        ).all()
+        if not user_ids:
+            break
+
+        rows += rebuild_chunk(db, user_ids)
+        users += len(user_ids)
+        last_id = user_ids[-1]
+        print(f"  users <= {last_id}: {users} users, {rows} streak rows")
+
+    return {"users": users, "rows": rows}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="user_streaks 백필")
+    parser.add_argument("--chunk-size", type=int, default=500, help="트랜잭션당 사용자 수")
+    parser.add_argument("--user-id", type=int, default=None, help="특정 사용자만 재계산")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        result = rebuild_streaks(db, chunk_size=args.chunk_size, user_id=args.user_id)
+    elapsed = time.perf_counter() - started
+    print(f"rebuilt {result['rows']} rows for {result['users']} users in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+배출계수가 바뀐 뒤 과거 기록의 탄소 발자국 재계산
+
+meal_logs 와 (전기/가스) activity_logs 를 기본키 구간(--chunk-size) 으로 나눠 읽고,
+구간 안의 고유 음식명마다 계수를 한 번만 해석해서 numpy 로 다시 계산한 뒤
+값과 factor_version 을 구간당 한 문장(Postgres 는 unnest, 그 외는 executemany) 으로 UPDATE 한다.
+구간마다 짧은 트랜잭션이므로 운영 중에도 실행할 수 있고, --max-rows-per-sec 로 속도를 제한한다.
+
+- 대상 데이터셋(--dataset, 기본은 배포된 emission_factors.json) 의 버전이 이미 factor_version 에
+  기록된 행은 건너뛰므로 다시 실행해도 안전하다 (--force 면 모두 다시 계산)
+- 식사는 음식명과 분량만으로 다시 계산한다
+- 에너지 기록은 전기 사용량만 저장되어 있어서, 기록할 때 쓴 데이터셋(--previous-dataset,
+  여러 번 줄 수 있음) 으로 가스 부분을 분리해 다시 계산한다. factor_version 이 NULL 인
+  기록은 --legacy-version 으로 계산된 것으로 본다. 이전 데이터셋이 없으면 건너뛴다
+- 교통 기록은 교통수단 종류가 저장되지 않아 다시 계산할 수 없다
+- 식사가 바뀌었으면 마지막에 user_daily_carbon 을 사용자 구간별로 재구축하고 데이터 버전(ETag) 을 올린다
+  (서버의 대시보드 응답 캐시는 TTL 이 지나면 갱신된다)
+- 진행 상황은 --checkpoint 파일에 단계/구간마다 기록되고, 같은 대상 버전으로 다시 실행하면 이어서 한다
+- --workers 개의 프로세스가 구간을 나눠 처리한다 (SQLite 는 쓰기 잠금 때문에 1개)
+
+    python -m app.jobs.recalculate_footprints --previous-dataset old.json --workers 4 --max-rows-per-sec 50000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, func, or_, select, text, update
+from sqlalchemy.engine import Connection
+
+from app.core.database import SessionLocal, engine
+from app.data.factor_dataset import FactorDataset, dataset_path, load_dataset
+from app.jobs.rebuild_daily_carbon import rebuild_chunk
+from app.models.activity_log import ActivityLog, ActivityType
+from app.models.meal_log import MealLog
+from app.models.user import User
+from app.models.user_data_version import UserDataVersion
+
+CHUNK_SIZE = 10000
+ROLLUP_CHUNK_SIZE = 500
+LEGACY_VERSION = "2024.1"
+TABLES = ("meal_logs", "activity_logs")
+MAX_CACHED_FACTORS = 50000
+
+# 프로세스마다 한 번 읽는 데이터셋 (_init_worker)
+_target: Optional[FactorDataset] = None
+_previous: Dict[str, FactorDataset] = {}
+_legacy_version = LEGACY_VERSION
+_factors: Dict[str, float] = {}
+
+
+def _init_worker(target_path: str, previous_paths: List[str], legacy_version: str):
+    global _target, _previous, _legacy_version
+    _target = load_dataset(target_path)
+    _previous = {dataset.version: dataset for dataset in map(load_dataset, previous_paths)}
+    _previous.setdefault(_target.version, _target)
+    _legacy_version = legacy_version
+    _factors.clear()
+
+
+def _start_worker(*args):
+    # 부모에게서 물려받은 연결을 쓰지 않도록 풀을 비운다
+    engine.dispose(close=False)
+    _init_worker(*args)
+
+
+def meal_factors(food_names: list, dataset: FactorDataset) -> np.ndarray:
+    """음식명별 g 당 탄소 계수 (처음 보는 이름만 해석)"""
+    from app.api.meals import calculate_carbon_footprint
+
+    if len(_factors) > MAX_CACHED_FACTORS:
+        _factors.clear()
+    for name in food_names:
+        if name not in _factors:
+            # 모든 해석 경로가 분량에 비례하므로 1g 값이 곧 계수
+            _factors[name] = calculate_carbon_footprint(name, 1.0, dataset)
+    return np.array([_factors[name] for name in food_names], dtype=np.float64)
+
+
+def recalculated_energy(kwh: np.ndarray, carbon: np.ndarray, versions: list, target: FactorDataset) -> tuple:
+    """에너지 기록의 새 탄소 발자국과 다시 계산할 수 있었던 행 마스크
+
+    원래 값 = kWh * 전기계수 + m³ * 가스계수 이므로, 기록 당시 계수로 가스 부분을 분리해
+    새 계수로 다시 곱한다.
+    """
+    new = carbon.copy()
+    known = np.zeros(len(carbon), dtype=bool)
+    versions = np.array([version or _legacy_version for version in versions], dtype=object)
+    for version in set(versions.tolist()):
+        previous = _previous.get(version)
+        if previous is None:
+            continue
+        rows = versions == version
+        gas_part = carbon[rows] - kwh[rows] * previous.electricity_kg_per_kwh
+        gas_scale = target.city_gas_kg_per_m3 / previous.city_gas_kg_per_m3 if previous.city_gas_kg_per_m3 else 1.0
+        new[rows] = kwh[rows] * target.electricity_kg_per_kwh + gas_part * gas_scale
+        known[rows] = True
+    return new, known
+
+
+def bulk_update(connection: Connection, table, ids: list, carbons: list, version: str):
+    """구간에서 바뀐 행들의 탄소 발자국과 factor_version 을 한 번에 갱신"""
+    if not ids:
+        return
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text(
+                f"UPDATE {table.name} AS t SET carbon_footprint = v.carbon, factor_version = :version "
+                "FROM unnest(CAST(:ids AS integer[]), CAST(:carbons AS double precision[])) AS v(id, carbon) "
+                "WHERE t.id = v.id"
+            ),
+            {"ids": ids, "carbons": carbons, "version": version}
+        )
+    else:
+        connection.execute(
+            update(table).where(table.c.id == bindparam("row_id")).values(
+                carbon_footprint=bindparam("carbon"), factor_version=version
+            ),
+            [{"row_id": row_id, "carbon": carbon} for row_id, carbon in zip(ids, carbons)]
+        )
+
+
+def _stale(table, version: str, force: bool):
+    if force:
+        return ()
+    return (or_(table.c.factor_version.is_(None), table.c.factor_version != version),)
+
+
+def recalculate_chunk(table_name: str, low: int, high: int, force: bool = False) -> dict:
+    """기본키 구간 (low, high] 를 다시 계산해서 한 트랜잭션으로 반영"""
+    target = _target
+    with engine.begin() as connection:
+        if table_name == "meal_logs":
+            table = MealLog.__table__
+            rows = connection.execute(
+                select(table.c.id, table.c.food_name, table.c.portion_size, table.c.carbon_footprint).where(
+                    table.c.id > low, table.c.id <= high, *_stale(table, target.version, force)
+                )
+            ).all()
+            if not rows:
+                return {"low": low, "scanned": 0, "updated": 0, "skipped": 0}
+            ids = np.array([row.id for row in rows])
+            old = np.array([row.carbon_footprint for row in rows], dtype=np.float64)
+            unique_names, inverse = np.unique(np.array([row.food_name for row in rows], dtype=object), return_inverse=True)
+            portions = np.array([row.portion_size for row in rows], dtype=np.float64)
+            new = portions * meal_factors(unique_names.tolist(), target)[inverse]
+            known = np.ones(len(rows), dtype=bool)
+        else:
+            table = ActivityLog.__table__
+            rows = connection.execute(
+                select(table.c.id, table.c.energy_usage, table.c.carbon_footprint, table.c.factor_version).where(
+                    table.c.id > low, table.c.id <= high,
+                    table.c.activity_type == ActivityType.ENERGY,
+                    *_stale(table, target.version, force)
+                )
+            ).all()
+            if not rows:
+                return {"low": low, "scanned": 0, "updated": 0, "skipped": 0}
+            ids = np.array([row.id for row in rows])
+            old = np.array([row.carbon_footprint for row in rows], dtype=np.float64)
+            kwh = np.array([row.energy_usage or 0.0 for row in rows], dtype=np.float64)
+            new, known = recalculated_energy(kwh, old, [row.factor_version for row in rows], target)
+
+        # 값이 같으면 원래 값을 유지하고 버전만 기록 (부동소수 오차로 값이 흔들리지 않게)
+        new = np.where(np.isclose(new, old, rtol=0, atol=1e-9), old, new)
+        changed = known & (new != old)
+        bulk_update(connection, table, ids[known].tolist(), new[known].tolist(), target.version)
+
+    return {"low": low, "scanned": len(rows), "updated": int(changed.sum()), "skipped": int((~known).sum())}
+
+
+class Checkpoint:
+    """단계별 진행 상황 파일 (쓸 때마다 임시 파일을 바꿔 끼워서 중간에 죽어도 깨지지 않음)"""
+
+    def __init__(self, path: Optional[Path], target_version: str):
+        self.path = path
+        self.state = {"target_version": target_version, "phases": {}}
+        if path is not None and path.exists():
+            saved = json.loads(path.read_text(encoding="utf-8"))
+            if saved.get("target_version") != target_version:
+                raise SystemExit(
+                    f"checkpoint {path} is for version {saved.get('target_version')!r}, not {target_version!r} "
+                    "(delete it or pass another --checkpoint)"
+                )
+            self.state = saved
+
+    def phase(self, name: str) -> dict:
+        return self.state["phases"].setdefault(name, {"last_id": 0, "done": False, "scanned": 0, "updated": 0, "skipped": 0})
+
+    def save(self):
+        if self.path is None:
+            return
+        temp = self.path.with_suffix(self.path.suffix + ".tmp")
+        temp.write_text(json.dumps(self.state, indent=2), encoding="utf-8")
+        os.replace(temp, self.path)
+
+
+class Throttle:
+    """처리한 행 수가 max_rows_per_sec 를 넘지 않도록 잠깐씩 쉰다"""
+
+    def __init__(self, max_rows_per_sec: Optional[float]):
+        self.max_rows_per_sec = max_rows_per_sec
+        self.started = time.perf_counter()
+        self.rows = 0
+
+    def add(self, rows: int):
+        self.rows += rows
+        if self.max_rows_per_sec:
+            ahead = self.rows / self.max_rows_per_sec - (time.perf_counter() - self.started)
+            if ahead > 0:
+                time.sleep(ahead)
+
+
+def _report(name: str, state: dict, started: float):
+    elapsed = time.perf_counter() - started
+    print(
+        f"  {name} id <= {state['last_id']}: scanned {state['scanned']}, updated {state['updated']}, "
+        f"skipped {state['skipped']} ({state['scanned'] / elapsed if elapsed else 0:.0f} rows/s)"
+    )
+
+
+def recalculate_table(
+    table_name: str,
+    checkpoint: Checkpoint,
+    executor: Optional[ProcessPoolExecutor],
+    workers: int,
+    chunk_size: int,
+    throttle: Throttle,
+    force: bool = False
+) -> dict:
+    """테이블 하나를 구간별로 재계산 (끝난 구간이 연속된 곳까지 체크포인트를 전진)"""
+    state = checkpoint.phase(table_name)
+    if state["done"]:
+        return state
+
+    table = MealLog.__table__ if table_name == "meal_logs" else ActivityLog.__table__
+    with engine.connect() as connection:
+        max_id = connection.scalar(select(func.max(table.c.id))) or 0
+
+    started = time.perf_counter()
+    lows = iter(range(state["last_id"], max_id, chunk_size))
+    pending = {}  # low -> future
+    finished = {}  # low -> result (체크포인트보다 앞서 끝난 구간)
+
+    def submit_next() -> bool:
+        low = next(lows, None)
+        if low is None:
+            return False
+        if executor is None:
+            finished[low] = recalculate_chunk(table_name, low, low + chunk_size, force)
+        else:
+            pending[low] = executor.submit(recalculate_chunk, table_name, low, low + chunk_size, force)
+        return True
+
+    while True:
+        while len(pending) < workers * 2 and submit_next():
+            if executor is None:
+                break
+        if pending:
+            low = min(pending)
+            finished[low] = pending.pop(low).result()
+        if not finished:
+            break
+
+        while state["last_id"] in finished:
+            result = finished.pop(state["last_id"])
+            state["last_id"] += chunk_size
+            for key in ("scanned", "updated", "skipped"):
+                state[key] += result[key]
+            throttle.add(result["scanned"])
+        checkpoint.save()
+        _report(table_name, state, started)
+
+    state["done"] = True
+    checkpoint.save()
+    return state
+
+
+def rebuild_rollups(checkpoint: Checkpoint, chunk_size: int, throttle: Throttle) -> dict:
+    """식사가 바뀐 뒤 user_daily_carbon 재구축과 데이터 버전(ETag) 갱신을 사용자 구간별로"""
+    state = checkpoint.phase("rollups")
+    if state["done"]:
+        return state
+
+    with SessionLocal() as db:
+        while True:
+            user_ids = db.scalars(
+                select(User.id).where(User.id > state["last_id"]).order_by(User.id).limit(chunk_size)
+            ).all()
+            if not user_ids:
+                break
+            rows = rebuild_chunk(db, user_ids)
+            db.execute(
+                update(UserDataVersion).where(UserDataVersion.user_id.in_(user_ids)).values(
+                    version=UserDataVersion.version + 1
+                )
+            )
+            db.commit()
+            state["last_id"] = user_ids[-1]
+            state["scanned"] += len(user_ids)
+            state["updated"] += rows
+            checkpoint.save()
+            throttle.add(rows)
+            print(f"  rollups users <= {state['last_id']}: {state['scanned']} users, {state['updated']} rollup rows")
+
+    state["done"] = True
+    checkpoint.save()
+    return state
+
+
+def recalculate_footprints(
+    target_path: Optional[Path] = None,
+    previous_paths: List[Path] = (),
+    legacy_version: str = LEGACY_VERSION,
+    tables=TABLES,
+    chunk_size: int = CHUNK_SIZE,
+    workers: int = 1,
+    max_rows_per_sec: Optional[float] = None,
+    checkpoint_path: Optional[Path] = None,
+    force: bool = False
+) -> dict:
+    """재계산 전체 실행 (체크포인트가 있으면 이어서) 하고 단계별 결과를 반환"""
+    target_path = str(target_path or dataset_path())
+    previous_paths = [str(path) for path in previous_paths]
+    _init_worker(target_path, previous_paths, legacy_version)
+    checkpoint = Checkpoint(checkpoint_path, _target.version)
+    throttle = Throttle(max_rows_per_sec)
+
+    if engine.dialect.name == "sqlite":
+        workers = 1
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_start_worker,
+            initargs=(target_path, previous_paths, legacy_version),
+        )
+
+    try:
+        for table_name in tables:
+            recalculate_table(table_name, checkpoint, executor, workers, chunk_size, throttle, force)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if "meal_logs" in tables and checkpoint.phase("meal_logs")["updated"]:
+        rebuild_rollups(checkpoint, ROLLUP_CHUNK_SIZE, throttle)
+    return checkpoint.state["phases"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="배출계수 변경 후 과거 탄소 발자국 재계산")
+    parser.add_argument("--dataset", type=Path, default=None, help="새 계수 파일 (기본: 배포된 데이터셋)")
+    parser.add_argument("--previous-dataset", type=Path, action="append", default=[], help="기록 당시 계수 파일 (에너지 기록용)")
+    parser.add_argument("--legacy-version", default=LEGACY_VERSION, help="factor_version 이 없는 기록의 버전")
+    parser.add_argument("--tables", nargs="+", choices=TABLES, default=list(TABLES))
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="트랜잭션당 기본키 구간 크기")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="프로세스 수 (SQLite 는 1)")
+    parser.add_argument("--max-rows-per-sec", type=float, default=None, help="초당 처리 행 수 상한")
+    parser.add_argument("--checkpoint", type=Path, default=Path("recalculate_footprints.checkpoint.json"))
+    parser.add_argument("--force", action="store_true", help="이미 대상 버전인 행도 다시 계산")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    phases = recalculate_footprints(
+        target_path=args.dataset,
+        previous_paths=args.previous_dataset,
+        legacy_version=args.legacy_version,
+        tables=args.tables,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_rows_per_sec=args.max_rows_per_sec,
+        checkpoint_path=args.checkpoint,
+        force=args.force,
+    )
+    elapsed = time.perf_counter() - started
+    scanned = sum(phases.get(table, {}).get("scanned", 0) for table in args.tables)
+    for name, state in phases.items():
+        print(f"{name}: scanned {state['scanned']}, updated {state['updated']}, skipped {state.get('skipped', 0)}")
+    print(f"done in {elapsed:.1f}s ({scanned / elapsed if elapsed else 0:.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
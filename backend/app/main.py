@@ -1,22 +1,48 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer
+import logging
 import os
 from dotenv import load_dotenv
 
-from app.api import auth, meals, footprint, swaps, dashboard, challenges, energy, gamification
+from app.api import auth, meals, footprint, swaps, dashboard, challenges, energy, gamification, export, admin
 from app.core.database import engine, SessionLocal
+from app.core.logging_config import setup_logging
 from app.models import Base
+from app.services.achievements import sync_badges
+from app.services.factor_reload import install_reload_signal
+from app.services.foods import sync_foods
+from app.services.meal_writer import meal_write_queue
 
 load_dotenv()
 
+# JSON logs written off the request path by a background listener thread
+setup_logging()
+logger = logging.getLogger("app")
+
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# Keep the foods dimension table in step with the emission factor dataset,
+# and the badges table in step with the achievement catalog
+with engine.begin() as connection:
+    sync_foods(connection)
+    sync_badges(connection)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # SIGHUP reloads the emission factor dataset in this worker
+    install_reload_signal()
+    yield
+    # Persist meals still waiting in the group-commit queue before exiting
+    await meal_write_queue.close()
+
 app = FastAPI(
     title="Greenflow Life API",
     description="푸드 카본 레저 앱 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS middleware with comprehensive Vercel support
@@ -54,7 +80,7 @@ def cors_origin_validator(origin: str):
         
     return origin in allowed_origins
 
-print(f"CORS Environment: {cors_origins_env or 'Using defaults with Vercel support'}")
+logger.info("cors configured", extra={"event": "cors.configured", "cors_origins": cors_origins_env or "defaults+vercel"})
 
 app.add_middleware(
     CORSMiddleware,
@@ -73,6 +99,8 @@ app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"]
 app.include_router(challenges.router, prefix="/api/challenges", tags=["challenges"])
 app.include_router(energy.router, prefix="/api", tags=["energy"])
 app.include_router(gamification.router, prefix="/api/gamification", tags=["gamification"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 @app.get("/")
 async def root():
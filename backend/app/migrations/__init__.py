@@ -0,0 +1 @@
+# Versioned schema migrations package
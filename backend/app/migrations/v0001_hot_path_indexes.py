@@ -0,0 +1,21 @@
+"""
+거의 모든 엔드포인트가 사용자 단위로 거르는 테이블의 복합 인덱스
+
+meal_logs.user_id 단독 인덱스는 따로 만들지 않는다. (user_id, logged_at, id) 인덱스의
+앞부분이 같은 역할을 한다.
+"""
+
+
+def upgrade(ctx):
+    # 식사 기록 목록(키셋), 상위 기여 음식, 스왑 조인
+    ctx.create_index("ix_meal_logs_user_logged_at_id", "meal_logs", ["user_id", "logged_at", "id"])
+    # 에너지/교통 월별 통계
+    ctx.create_index(
+        "ix_activity_logs_user_type_logged_at", "activity_logs", ["user_id", "activity_type", "logged_at"]
+    )
+    # 수락한 스왑 합계/개수
+    ctx.create_index(
+        "ix_recommended_swaps_meal_accepted_created", "recommended_swaps", ["meal_log_id", "accepted", "created_at"]
+    )
+    # 진행 중/완료 챌린지 개수
+    ctx.create_index("ix_user_challenges_user_completed", "user_challenges", ["user_id", "completed"])
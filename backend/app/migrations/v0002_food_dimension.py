@@ -0,0 +1,25 @@
+"""
+음식 차원 테이블 foods 와 meal_logs.food_id
+
+foods 테이블 자체는 create_all 이 만든다 (app.jobs.migrate 가 먼저 실행).
+Postgres 에서 외래 키는 NOT VALID 로 붙인 뒤 따로 검증해서, 검증 중에도 쓰기를 막지 않는다.
+"""
+
+from app.services.foods import backfill_meal_food_ids, sync_foods
+
+
+def upgrade(ctx):
+    if not ctx.has_column("meal_logs", "food_id"):
+        if ctx.dialect == "postgresql":
+            ctx.execute("ALTER TABLE meal_logs ADD COLUMN food_id INTEGER")
+            ctx.execute(
+                "ALTER TABLE meal_logs ADD CONSTRAINT meal_logs_food_id_fkey "
+                "FOREIGN KEY (food_id) REFERENCES foods (id) NOT VALID"
+            )
+            ctx.execute("ALTER TABLE meal_logs VALIDATE CONSTRAINT meal_logs_food_id_fkey")
+        else:
+            ctx.execute("ALTER TABLE meal_logs ADD COLUMN food_id INTEGER REFERENCES foods (id)")
+
+    sync_foods(ctx.connection)
+    backfill_meal_food_ids(ctx.connection)
+    ctx.create_index("ix_meal_logs_food_id", "meal_logs", ["food_id"])
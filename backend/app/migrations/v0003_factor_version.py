@@ -0,0 +1,12 @@
+"""
+계산 기록의 배출계수 데이터셋 버전 (meal_logs/activity_logs.factor_version)
+
+기본값 없는 NULL 컬럼 추가라서 Postgres 에서도 테이블을 다시 쓰지 않는다.
+도입 전 기록은 어떤 계수로 계산했는지 알 수 없으므로 NULL 로 둔다.
+"""
+
+
+def upgrade(ctx):
+    for table in ("meal_logs", "activity_logs"):
+        if not ctx.has_column(table, "factor_version"):
+            ctx.execute(f"ALTER TABLE {table} ADD COLUMN factor_version VARCHAR(32)")
@@ -0,0 +1,25 @@
+"""
+성취 엔진 (badges.badge_type/points, user_badges 고유 인덱스, 배지 카탈로그)
+
+user_activity_counters 테이블은 create_all 이 만든다 (app.jobs.migrate 가 먼저 실행).
+기존 사용자의 카운터와 이미 기준을 넘은 배지는 python -m app.jobs.rebuild_activity_counters 로 채운다.
+"""
+
+from app.services.achievements import sync_badges
+
+
+def upgrade(ctx):
+    if not ctx.has_column("badges", "badge_type"):
+        ctx.execute("ALTER TABLE badges ADD COLUMN badge_type VARCHAR")
+    if not ctx.has_column("badges", "points"):
+        ctx.execute("ALTER TABLE badges ADD COLUMN points INTEGER NOT NULL DEFAULT 100")
+    ctx.create_index("ix_badges_badge_type", "badges", ["badge_type"], unique=True)
+
+    # 같은 배지를 두 번 받은 행은 먼저 받은 것만 남긴다
+    ctx.execute(
+        "DELETE FROM user_badges WHERE id NOT IN "
+        "(SELECT MIN(id) FROM user_badges GROUP BY user_id, badge_id)"
+    )
+    ctx.create_index("ix_user_badges_user_badge", "user_badges", ["user_id", "badge_id"], unique=True)
+
+    sync_badges(ctx.connection)
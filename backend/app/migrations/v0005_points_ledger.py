@@ -0,0 +1,20 @@
+"""
+포인트 원장 (points_ledger) 과 user_activity_counters 의 합계 컬럼
+
+points_ledger 테이블은 create_all 이 만든다 (app.jobs.migrate 가 먼저 실행).
+기존 배지/수락한 스왑의 원장 행과 합계는 python -m app.jobs.rebuild_activity_counters 로 채운다.
+"""
+
+COLUMNS = (
+    ("challenges_joined", "INTEGER NOT NULL DEFAULT 0"),
+    ("total_points", "INTEGER NOT NULL DEFAULT 0"),
+    ("badge_count", "INTEGER NOT NULL DEFAULT 0"),
+    ("level", "INTEGER NOT NULL DEFAULT 1"),
+)
+
+
+def upgrade(ctx):
+    for name, ddl in COLUMNS:
+        if not ctx.has_column("user_activity_counters", name):
+            ctx.execute(f"ALTER TABLE user_activity_counters ADD COLUMN {name} {ddl}")
+    ctx.create_index("ix_points_ledger_user_id_id", "points_ledger", ["user_id", "id"])
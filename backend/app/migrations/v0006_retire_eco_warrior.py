@@ -0,0 +1,14 @@
+"""
+eco_warrior 배지 정리
+
+eco_warrior 는 지급 조건이 정해진 적이 없어서 아무도 받을 수 없는 배지였다. BADGE_CATALOG 에서 뺐으므로
+sync_badges 가 이미 넣어 둔 badges 행도 지운다. 누군가 받은 기록이 있으면 (수동 지급 등) 그대로 둔다.
+"""
+
+
+def upgrade(ctx):
+    ctx.execute(
+        "DELETE FROM badges WHERE badge_type = :badge_type "
+        "AND NOT EXISTS (SELECT 1 FROM user_badges WHERE user_badges.badge_id = badges.id)",
+        badge_type="eco_warrior",
+    )
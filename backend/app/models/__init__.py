@@ -1,19 +1,35 @@
 from app.core.database import Base
 from .user import User
+from .food import Food
 from .meal_log import MealLog
 from .recommended_swap import RecommendedSwap
 from .challenge import Challenge, UserChallenge
 from .badge import Badge, UserBadge
 from .activity_log import ActivityLog
+from .user_daily_carbon import UserDailyCarbon
+from .user_streak import UserStreak
+from .user_activity_counter import UserActivityCounter
+from .points_ledger import PointsLedgerEntry
+from .leaderboard_score import LeaderboardScore
+from .user_data_version import UserDataVersion
+from .idempotency_key import IdempotencyKey
 
 __all__ = [
     "Base",
     "User", 
+    "Food",
     "MealLog", 
     "RecommendedSwap", 
     "Challenge", 
     "UserChallenge",
     "Badge", 
     "UserBadge", 
-    "ActivityLog"
+    "ActivityLog",
+    "UserDailyCarbon",
+    "UserStreak",
+    "UserActivityCounter",
+    "PointsLedgerEntry",
+    "LeaderboardScore",
+    "UserDataVersion",
+    "IdempotencyKey"
 ] 
\ No newline at end of file
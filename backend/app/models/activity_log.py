@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -21,6 +21,9 @@ class TransportMode(enum.Enum):
 
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        Index("ix_activity_logs_user_type_logged_at", "user_id", "activity_type", "logged_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -29,6 +32,7 @@ class ActivityLog(Base):
     distance_km = Column(Float, nullable=True)
     energy_usage = Column(Float, nullable=True)  # kWh
     carbon_footprint = Column(Float, nullable=False)  # kg CO2e
+    factor_version = Column(String(32), nullable=True)  # 계산에 쓴 배출계수 데이터셋 버전 (도입 전 기록은 NULL)
     logged_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
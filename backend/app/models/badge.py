@@ -1,16 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 
 class Badge(Base):
     __tablename__ = "badges"
+    __table_args__ = (
+        Index("ix_badges_badge_type", "badge_type", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     description = Column(Text, nullable=False)
     icon_url = Column(String, nullable=False)
     achievement_criteria = Column(String, nullable=False)
+    badge_type = Column(String, nullable=True)  # 성취 규칙의 배지 키 (app/services/achievements.py)
+    points = Column(Integer, nullable=False, default=100)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -18,6 +23,9 @@ class Badge(Base):
 
 class UserBadge(Base):
     __tablename__ = "user_badges"
+    __table_args__ = (
+        Index("ix_user_badges_user_badge", "user_id", "badge_id", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -26,4 +34,4 @@ class UserBadge(Base):
     
     # Relationships
     user = relationship("User", back_populates="user_badges")
-    badge = relationship("Badge", back_populates="user_badges") 
\ No newline at end of file
+    badge = relationship("Badge", back_populates="user_badges") 
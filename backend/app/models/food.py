@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime
+from datetime import datetime
+from app.core.database import Base
+
+class Food(Base):
+    """음식 차원 테이블 - KOREAN_FOOD_CARBON_DB 의 음식 하나가 한 행 (app/services/foods.py 가 동기화)"""
+    __tablename__ = "foods"
+    
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+    category = Column(String, nullable=False, default="기타")
+    carbon_per_serving = Column(Float, nullable=False)  # kg CO2e (1인분)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
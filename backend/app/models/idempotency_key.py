@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from datetime import datetime
+from app.core.database import Base
+
+class IdempotencyKey(Base):
+    """Idempotency-Key 로 처리한 쓰기 요청과 그 응답 - 재시도 요청에 같은 응답을 돌려준다"""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # 같은 키로 동시에 들어온 요청 중 하나만 커밋되도록 하는 최종 방어선
+        UniqueConstraint("user_id", "key", name="uq_idempotency_keys_user_key"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    key = Column(String(255), nullable=False)
+    endpoint = Column(String, nullable=False)
+    request_hash = Column(String(40), nullable=False)  # 요청 본문 sha1
+    response_body = Column(Text, nullable=False)  # JSON
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.core.database import Base
+
+class LeaderboardScore(Base):
+    """리더보드 점수 스냅샷 - 워커의 순위 집합을 다시 만들거나 다른 워커의 변경을 따라잡는 기준"""
+    __tablename__ = "leaderboard_scores"
+    __table_args__ = (
+        Index("ix_leaderboard_scores_board_period_updated", "board", "period", "updated_at"),
+    )
+    
+    board = Column(String(32), primary_key=True)  # points, carbon_weekly, streak
+    period = Column(String(10), primary_key=True)  # all, 주 시작일 또는 날짜 (KST)
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    score = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
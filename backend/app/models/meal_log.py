@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -12,13 +12,19 @@ class MealType(enum.Enum):
 
 class MealLog(Base):
     __tablename__ = "meal_logs"
+    __table_args__ = (
+        # 식사 기록 목록의 키셋 페이지네이션 (최신순) - app/migrations/v0001 과 이름이 같아야 함
+        Index("ix_meal_logs_user_logged_at_id", "user_id", "logged_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     food_name = Column(String, nullable=False)
+    food_id = Column(Integer, ForeignKey("foods.id"), nullable=True, index=True)  # 해석되지 않는 음식은 NULL
     portion_size = Column(Float, nullable=False)  # in grams
     meal_type = Column(Enum(MealType), nullable=False)
     carbon_footprint = Column(Float, nullable=False)  # kg CO2e
+    factor_version = Column(String(32), nullable=True)  # 계산에 쓴 배출계수 데이터셋 버전 (도입 전 기록은 NULL)
     image_url = Column(String, nullable=True)
     logged_at = Column(DateTime, default=datetime.utcnow)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+from app.core.database import Base
+
+class PointsLedgerEntry(Base):
+    """포인트/탄소 절약 원장 - 추가만 하고 고치거나 지우지 않는다 (취소는 반대 부호 행)"""
+    __tablename__ = "points_ledger"
+    __table_args__ = (
+        Index("ix_points_ledger_user_id_id", "user_id", "id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    kind = Column(String(32), nullable=False)  # badge_awarded, swap_accepted, swap_unaccepted
+    points = Column(Integer, nullable=False, default=0)
+    carbon_saved = Column(Float, nullable=False, default=0.0)  # kg CO2e
+    ref_id = Column(Integer, nullable=True)  # badges.id 또는 recommended_swaps.id
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,10 +1,13 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.database import Base
 
 class RecommendedSwap(Base):
     __tablename__ = "recommended_swaps"
+    __table_args__ = (
+        Index("ix_recommended_swaps_meal_accepted_created", "meal_log_id", "accepted", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     meal_log_id = Column(Integer, ForeignKey("meal_logs.id"), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+class UserActivityCounter(Base):
+    """사용자별 누적 합계 - 성취 규칙의 입력이자 게이미피케이션 통계, 이벤트/원장 기록과 같은 트랜잭션에서 갱신"""
+    __tablename__ = "user_activity_counters"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    meals_logged = Column(Integer, nullable=False, default=0)
+    swaps_accepted = Column(Integer, nullable=False, default=0)
+    carbon_saved = Column(Float, nullable=False, default=0.0)  # 원장 carbon_saved 합 (kg CO2e)
+    challenges_joined = Column(Integer, nullable=False, default=0)
+    challenges_completed = Column(Integer, nullable=False, default=0)
+    total_points = Column(Integer, nullable=False, default=0)  # 원장 points 합
+    badge_count = Column(Integer, nullable=False, default=0)
+    level = Column(Integer, nullable=False, default=1)  # total_points 로 정해지는 레벨 (points_ledger.LEVELS)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
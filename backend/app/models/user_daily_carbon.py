@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+class UserDailyCarbon(Base):
+    """사용자별 일일(KST) 탄소 배출 롤업 - MealLog 기록 시 함께 갱신"""
+    __tablename__ = "user_daily_carbon"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)  # KST 기준 날짜
+    total_carbon = Column(Float, nullable=False, default=0.0)  # kg CO2e
+    meal_count = Column(Integer, nullable=False, default=0)
+    top_food = Column(String, nullable=True)
+    max_carbon = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
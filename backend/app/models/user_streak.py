@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, Date, DateTime, ForeignKey
+from datetime import datetime
+from app.core.database import Base
+
+class UserStreak(Base):
+    """사용자별 연속 기록 상태 - MealLog 기록 시 함께 갱신"""
+    __tablename__ = "user_streaks"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    current_streak = Column(Integer, nullable=False, default=0)  # last_day 까지 이어진 일수
+    best_streak = Column(Integer, nullable=False, default=0)
+    last_day = Column(Date, nullable=True)  # 마지막 기록 KST 날짜
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1 @@
+# Domain services package
\ No newline at end of file
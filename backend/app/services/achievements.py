@@ -0,0 +1,262 @@
+"""
+이벤트 기반 성취(배지) 엔진
+
+쓰기 경로가 도메인 이벤트(식사 기록, 스왑 수락, 챌린지 완료) 를 publish 하면
+
+1. 사용자 합계(user_activity_counters) 를 한 문장(INSERT ... ON CONFLICT ... RETURNING)
+   으로 늘리고 늘어난 값을 돌려받는다 (스왑과 배지는 points_ledger 에 원장 행도 남긴다)
+2. 이 이벤트가 바꾸는 지표(EVENT_METRICS) 를 입력으로 쓰는 규칙만 꺼내서
+3. 이전 값 < 기준 <= 새 값 으로 기준을 넘은 규칙만 배지를 준다
+
+평가 비용은 이벤트가 건드린 규칙 수에 비례하고, 식사나 스왑 이력을 다시 세지 않는다.
+연속 기록 규칙은 user_streaks 기본키 조회 한 번으로 현재 값을 읽는다 (이전 값을 모르므로
+기준 이상이면 매번 지급을 시도하고, 이미 받은 배지는 고유 인덱스에서 걸러진다).
+
+배지 정의(BADGE_CATALOG) 는 sync_badges 로 badges 테이블과 맞추며 badge_type 으로 찾는다.
+모든 함수는 호출한 쪽 트랜잭션 안에서 실행되고 커밋하지 않는다.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.badge import Badge, UserBadge
+from app.models.user_streak import UserStreak
+from app.services import challenge_progress, leaderboards, points_ledger
+from app.services.streaks import current_streak_of
+
+MEAL_LOGGED = "meal_logged"
+SWAP_ACCEPTED = "swap_accepted"
+SWAP_UNACCEPTED = "swap_unaccepted"
+CHALLENGE_COMPLETED = "challenge_completed"
+
+COUNTERS = ("meals_logged", "swaps_accepted", "carbon_saved", "challenges_completed")
+CURRENT_STREAK = "current_streak"
+
+# 이벤트가 바꾸는 지표 -> 이 지표를 입력으로 쓰는 규칙만 평가한다
+EVENT_METRICS = {
+    MEAL_LOGGED: ("meals_logged", CURRENT_STREAK),
+    SWAP_ACCEPTED: ("swaps_accepted", "carbon_saved"),
+    SWAP_UNACCEPTED: (),  # 받은 배지는 회수하지 않는다
+    CHALLENGE_COMPLETED: ("challenges_completed",),
+}
+
+
+class BadgeInfo(NamedTuple):
+    name: str
+    description: str
+    icon: str
+    points: int
+    rarity: str
+
+
+BADGE_CATALOG = {
+    "first_meal": BadgeInfo("첫 기록의 주인공", "첫 번째 식사를 기록한 특별한 순간", "🍽️", 100, "common"),
+    "week_streak": BadgeInfo("일주일 연속 달성자", "7일 연속으로 꾸준히 기록한 의지력의 증거", "🔥", 300, "rare"),
+    "month_streak": BadgeInfo("한달 연속 마스터", "30일 연속 기록의 놀라운 끈기", "👑", 1000, "epic"),
+    "carbon_saver": BadgeInfo("탄소 절약 영웅", "10kg 이상의 탄소를 절약한 환경 지킴이", "🌱", 500, "rare"),
+    "smart_swapper": BadgeInfo("스마트 선택 마스터", "현명한 식단 선택으로 변화를 만드는 리더", "⚡", 400, "rare"),
+    "challenge_master": BadgeInfo("챌린지 정복자", "다양한 챌린지를 완수한 도전의 달인", "🏆", 800, "epic"),
+}
+DEFAULT_BADGE = BadgeInfo("특별한 성취", "특별한 성취를 달성했습니다", "🏅", 100, "common")
+
+
+def badge_info(badge_type: Optional[str]) -> BadgeInfo:
+    return BADGE_CATALOG.get(badge_type, DEFAULT_BADGE)
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    badge_type: str
+    metric: str  # COUNTERS 중 하나 또는 CURRENT_STREAK
+    threshold: float
+    message: str
+
+
+_rules_by_metric: Dict[str, List[AchievementRule]] = defaultdict(list)
+
+
+def register_rule(rule: AchievementRule) -> AchievementRule:
+    if rule.badge_type not in BADGE_CATALOG:
+        raise ValueError(f"unknown badge type: {rule.badge_type}")
+    if rule.metric not in COUNTERS and rule.metric != CURRENT_STREAK:
+        raise ValueError(f"unknown metric: {rule.metric}")
+    _rules_by_metric[rule.metric].append(rule)
+    return rule
+
+
+def rules_for(metric: str) -> List[AchievementRule]:
+    return _rules_by_metric.get(metric, [])
+
+
+def all_rules() -> List[AchievementRule]:
+    return [rule for rules in _rules_by_metric.values() for rule in rules]
+
+
+register_rule(AchievementRule("first_meal", "meals_logged", 1, "첫 기록을 축하해요! 🎉"))
+register_rule(AchievementRule("week_streak", CURRENT_STREAK, 7, "7일 연속 기록! 꾸준함의 힘을 보여주고 계시네요! 🔥"))
+register_rule(AchievementRule("month_streak", CURRENT_STREAK, 30, "30일 연속 기록! 이제 습관이 되었어요! 👑"))
+register_rule(AchievementRule("carbon_saver", "carbon_saved", 10.0, "10kg 탄소 절약 달성! 정말 대단한 환경 지킨이에요! 🌱"))
+register_rule(AchievementRule("smart_swapper", "swaps_accepted", 10, "스마트 스왑 10번 수락! 현명한 선택의 달인이에요! ⚡"))
+register_rule(AchievementRule("challenge_master", "challenges_completed", 5, "챌린지 5개 완주! 도전의 달인이에요! 🏆"))
+
+
+def _insert(model, dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+def sync_badges(connection: Connection) -> int:
+    """BADGE_CATALOG 의 배지를 badges 에 추가/갱신하고 바뀐 행 수를 반환 (sync_foods 와 같은 방식)"""
+    existing = {
+        row.badge_type: (row.name, row.description, row.icon_url, row.points)
+        for row in connection.execute(
+            select(Badge.badge_type, Badge.name, Badge.description, Badge.icon_url, Badge.points).where(
+                Badge.badge_type.in_(list(BADGE_CATALOG))
+            )
+        )
+    }
+    criteria = {rule.badge_type: f"{rule.metric} >= {rule.threshold:g}" for rule in all_rules()}
+    changed = 0
+    for badge_type, info in BADGE_CATALOG.items():
+        values = (info.name, info.description, info.icon, info.points)
+        if badge_type not in existing:
+            connection.execute(
+                _insert(Badge, connection.dialect.name).values(
+                    badge_type=badge_type,
+                    name=info.name,
+                    description=info.description,
+                    icon_url=info.icon,
+                    points=info.points,
+                    achievement_criteria=criteria.get(badge_type, "-"),
+                ).on_conflict_do_nothing(index_elements=[Badge.badge_type])
+            )
+            changed += 1
+        elif existing[badge_type] != values:
+            connection.execute(
+                Badge.__table__.update().where(Badge.badge_type == badge_type).values(
+                    name=info.name, description=info.description, icon_url=info.icon, points=info.points
+                )
+            )
+            changed += 1
+    return changed
+
+
+# badge_type -> badges.id (한 번 만들어진 행의 id 는 바뀌지 않는다)
+_badge_ids: Dict[str, int] = {}
+
+
+async def badge_id_for(db: AsyncSession, badge_type: str) -> Optional[int]:
+    if badge_type not in _badge_ids:
+        badge_id = await db.scalar(select(Badge.id).where(Badge.badge_type == badge_type))
+        if badge_id is None:
+            return None
+        _badge_ids[badge_type] = badge_id
+    return _badge_ids[badge_type]
+
+
+async def award_badge(db: AsyncSession, user_id: int, rule: AchievementRule) -> Optional[dict]:
+    """배지를 지급하고 새로 받았으면 알림용 정보를, 이미 있으면 None 을 반환"""
+    badge_id = await badge_id_for(db, rule.badge_type)
+    if badge_id is None:
+        return None
+    stmt = _insert(UserBadge, db.bind.dialect.name).values(
+        user_id=user_id, badge_id=badge_id, earned_at=datetime.utcnow()
+    ).on_conflict_do_nothing(index_elements=[UserBadge.user_id, UserBadge.badge_id])
+    awarded = await db.scalar(stmt.returning(UserBadge.id))
+    if awarded is None:
+        return None
+    info = badge_info(rule.badge_type)
+    await points_ledger.record_entry(
+        db, user_id, points_ledger.BADGE_AWARDED, points=info.points, ref_id=badge_id
+    )
+    return {
+        "badge_type": rule.badge_type,
+        "title": info.name,
+        "message": rule.message,
+        "icon": info.icon,
+        "points": info.points,
+    }
+
+
+def counter_deltas(event: str, count: int = 1, carbon_saved: float = 0.0) -> dict:
+    if event == MEAL_LOGGED:
+        return {"meals_logged": count}
+    if event == SWAP_ACCEPTED:
+        return {"swaps_accepted": count, "carbon_saved": carbon_saved}
+    if event == SWAP_UNACCEPTED:
+        return {"swaps_accepted": -count, "carbon_saved": -carbon_saved}
+    if event == CHALLENGE_COMPLETED:
+        return {"challenges_completed": count}
+    raise ValueError(f"unknown event: {event}")
+
+
+async def publish(
+    db: AsyncSession,
+    user_id: int,
+    event: str,
+    count: int = 1,
+    carbon_saved: float = 0.0,
+    ref_id: Optional[int] = None
+) -> List[dict]:
+    """이벤트를 합계에 반영하고 입력이 바뀐 규칙만 평가해서 새로 받은 배지 목록을 반환
+
+    식사 이벤트는 연속 기록이 갱신된 뒤(record_meal_streak 다음) 에 보내야 한다.
+    식사/스왑 이벤트는 챌린지 진행도도 갱신하고, 그 이벤트로 완료된 챌린지는 CHALLENGE_COMPLETED 로 이어진다.
+    스왑 이벤트는 탄소 절약량이 바뀌므로 원장에 ref_id(스왑 id) 로 한 행을 남긴다.
+    """
+    deltas = counter_deltas(event, count, carbon_saved)
+    if event in (SWAP_ACCEPTED, SWAP_UNACCEPTED):
+        counters = await points_ledger.record_entry(
+            db, user_id, event, carbon_saved=deltas["carbon_saved"], ref_id=ref_id,
+            counters={"swaps_accepted": deltas["swaps_accepted"]}
+        )
+    else:
+        counters = await points_ledger.add_to_totals(db, user_id, deltas)
+
+    streak = None
+    if CURRENT_STREAK in EVENT_METRICS[event]:
+        state = (await db.execute(
+            select(UserStreak.current_streak, UserStreak.last_day).where(UserStreak.user_id == user_id)
+        )).first()
+        streak = current_streak_of(state)
+        await leaderboards.set_score(db, leaderboards.STREAK, user_id, streak)
+
+    # 이벤트와 맞는 유형의 진행 중인 챌린지를 한 문장으로 갱신
+    if event == MEAL_LOGGED:
+        completed = await challenge_progress.on_meals_logged(db, user_id, count, streak)
+    elif event in (SWAP_ACCEPTED, SWAP_UNACCEPTED):
+        completed = await challenge_progress.on_swap_changed(
+            db, user_id, event == SWAP_ACCEPTED,
+            counters.carbon_saved - deltas["carbon_saved"], counters.carbon_saved
+        )
+    else:
+        completed = []
+
+    awarded = []
+    for metric in EVENT_METRICS[event]:
+        rules = rules_for(metric)
+        if not rules:
+            continue
+        if metric == CURRENT_STREAK:
+            before, after = None, streak
+        else:
+            after = getattr(counters, metric)
+            before = after - deltas[metric]
+        for rule in rules:
+            if after >= rule.threshold and (before is None or before < rule.threshold):
+                badge = await award_badge(db, user_id, rule)
+                if badge is not None:
+                    awarded.append(badge)
+
+    if completed:
+        awarded.extend(await publish(db, user_id, CHALLENGE_COMPLETED, count=len(completed)))
+    return awarded
@@ -0,0 +1,133 @@
+"""
+사용자별 일일 탄소 롤업 (user_daily_carbon)
+
+MealLog 가 추가될 때 같은 트랜잭션 안에서 (user_id, KST 날짜) 행을 upsert 해서,
+조회 API 가 원본 meal_logs 를 매번 다시 집계하지 않도록 한다.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import Date, case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_daily_carbon import UserDailyCarbon
+
+KST_OFFSET = timedelta(hours=9)
+
+
+def kst_day(logged_at: datetime) -> date:
+    """UTC 로 저장된 logged_at 을 KST 날짜로 변환"""
+    return (logged_at + KST_OFFSET).date()
+
+
+def kst_today() -> date:
+    return kst_day(datetime.utcnow())
+
+
+def kst_day_expr(column, dialect_name: str):
+    """SQL 에서 UTC datetime 컬럼을 KST 날짜로 변환하는 식"""
+    if dialect_name == "postgresql":
+        return func.date(column + KST_OFFSET, type_=Date)
+    return func.date(column, "+9 hours", type_=Date)
+
+
+def daily_carbon_select(dialect_name: str, *filters):
+    """원본 meal_logs 에서 일별 합계/건수/최고 배출 음식을 한 문장으로 집계
+
+    윈도 함수로 (user_id, KST 날짜) 파티션마다 탄소 발자국이 가장 큰 행 하나만
+    남기므로, 날짜마다 추가 쿼리를 날릴 필요가 없다. 동률이면 먼저 기록된 식사.
+    """
+    from app.models.meal_log import MealLog
+
+    day = kst_day_expr(MealLog.logged_at, dialect_name)
+    partition = (MealLog.user_id, day)
+    ranked = select(
+        MealLog.user_id,
+        day.label("day"),
+        MealLog.food_name,
+        MealLog.carbon_footprint,
+        func.sum(MealLog.carbon_footprint).over(partition_by=partition).label("total_carbon"),
+        func.count().over(partition_by=partition).label("meal_count"),
+        func.row_number().over(
+            partition_by=partition,
+            order_by=(MealLog.carbon_footprint.desc(), MealLog.id)
+        ).label("meal_rank"),
+    ).where(*filters).subquery()
+
+    return select(
+        ranked.c.user_id,
+        ranked.c.day,
+        ranked.c.total_carbon,
+        ranked.c.meal_count,
+        ranked.c.food_name.label("top_food"),
+        ranked.c.carbon_footprint.label("max_carbon"),
+    ).where(ranked.c.meal_rank == 1)
+
+
+def upsert_statement(dialect_name: str, rows: list):
+    """부분 집계 행들을 기존 롤업에 더하는 INSERT ... ON CONFLICT 문"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(UserDailyCarbon).values(rows)
+    excluded = stmt.excluded
+    is_new_max = excluded.max_carbon > UserDailyCarbon.max_carbon
+    return stmt.on_conflict_do_update(
+        index_elements=[UserDailyCarbon.user_id, UserDailyCarbon.day],
+        set_={
+            "total_carbon": UserDailyCarbon.total_carbon + excluded.total_carbon,
+            "meal_count": UserDailyCarbon.meal_count + excluded.meal_count,
+            "top_food": case((is_new_max, excluded.top_food), else_=UserDailyCarbon.top_food),
+            "max_carbon": case((is_new_max, excluded.max_carbon), else_=UserDailyCarbon.max_carbon),
+            "updated_at": excluded.updated_at,
+        }
+    )
+
+
+def aggregate_meals(meals: Iterable) -> list:
+    """식사 기록들을 (user_id, KST 날짜) 단위 부분 집계로 묶는다
+
+    같은 문장 안에서 같은 키가 두 번 나오면 Postgres ON CONFLICT 가 실패하므로
+    upsert 전에 반드시 키별로 합쳐야 한다.
+    """
+    now = datetime.utcnow()
+    partials = {}
+    for meal in meals:
+        key = (meal.user_id, kst_day(meal.logged_at))
+        row = partials.get(key)
+        if row is None:
+            partials[key] = {
+                "user_id": meal.user_id,
+                "day": key[1],
+                "total_carbon": meal.carbon_footprint,
+                "meal_count": 1,
+                "top_food": meal.food_name,
+                "max_carbon": meal.carbon_footprint,
+                "updated_at": now,
+            }
+            continue
+        row["total_carbon"] += meal.carbon_footprint
+        row["meal_count"] += 1
+        if meal.carbon_footprint > row["max_carbon"]:
+            row["max_carbon"] = meal.carbon_footprint
+            row["top_food"] = meal.food_name
+    return list(partials.values())
+
+
+async def apply_meals_to_rollup(db: AsyncSession, meals: Iterable):
+    """식사 기록을 롤업에 반영 (호출한 쪽 트랜잭션에 포함, 커밋하지 않음)
+
+    meals 는 flush 이후의 MealLog 처럼 user_id, logged_at, carbon_footprint,
+    food_name 속성을 가진 객체여야 한다.
+    """
+    rows = aggregate_meals(meals)
+    if rows:
+        await db.execute(upsert_statement(db.bind.dialect.name, rows))
+
+
+async def record_meal(db: AsyncSession, meal_log):
+    """단건 식사 기록 반영"""
+    await apply_meals_to_rollup(db, [meal_log])
@@ -0,0 +1,135 @@
+"""
+챌린지 진행도 자동 평가
+
+식사 기록과 스왑 수락/취소 이벤트가 오면, 그 사용자의 진행 중인 챌린지 중 이벤트와 맞는
+ChallengeType 의 행들을 UPDATE ... FROM challenges 한 문장으로 갱신한다. 새 진행도는
+목표(target_value) 에서 자르고, 완료 여부/상태/완료 시각도 같은 문장에서 정한다.
+행을 읽어서 파이썬에서 더하고 다시 쓰지 않으므로 챌린지 수와 관계없이 이벤트당 한 문장이다.
+
+- MEAL_LOGGING: 기록한 식사 수만큼
+- WEEKLY_GOAL: 현재 연속 기록 일수로 (연속이 끊기면 진행도도 내려간다)
+- SWAP_ACCEPTANCE: 수락 +1, 수락 취소 -1
+- CARBON_REDUCTION: 누적 탄소 절약량(kg) 의 정수 부분이 늘어난 만큼 (취소하면 줄어든다)
+
+완료된 챌린지는 다시 바뀌지 않는다. 완료 처리(카운터, 배지) 는 achievements.publish 가 맡는다.
+사용자가 직접 올리는 진행도(PATCH /api/challenges/update-progress) 도 같은 UPDATE 를 쓴다 (add_progress).
+모든 함수는 커밋하지 않는다.
+"""
+
+import math
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import case, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.challenge import Challenge, ChallengeStatus, ChallengeType, UserChallenge
+
+
+def least(dialect_name: str, *args):
+    if dialect_name == "postgresql":
+        return func.least(*args)
+    return func.min(*args)
+
+
+def greatest(dialect_name: str, *args):
+    if dialect_name == "postgresql":
+        return func.greatest(*args)
+    return func.max(*args)
+
+
+def progress_update(dialect_name: str, new_progress, *filters, returning=()):
+    """진행 중인 챌린지 행의 진행도를 new_progress 로 (목표에서 자름) 바꾸고 완료 여부까지 정하는 UPDATE
+
+    new_progress 는 갱신 전 current_progress 와 challenges 컬럼으로 만든 식이다.
+    RETURNING 은 (id, challenge_id, current_progress, completed, *returning).
+    SQLite 는 RETURNING 에서 FROM 의 테이블을 못 쓰므로 challenges 값은 상관 서브쿼리로 넘긴다.
+    """
+    progress = least(dialect_name, Challenge.target_value, greatest(dialect_name, 0, new_progress))
+    done = progress >= Challenge.target_value
+    return (
+        update(UserChallenge)
+        .where(
+            UserChallenge.challenge_id == Challenge.id,
+            UserChallenge.completed == False,
+            *filters
+        )
+        .values(
+            current_progress=progress,
+            completed=done,
+            status=case(
+                (done, literal(ChallengeStatus.COMPLETED, UserChallenge.status.type)),
+                else_=literal(ChallengeStatus.IN_PROGRESS, UserChallenge.status.type)
+            ),
+            completed_at=case((done, datetime.utcnow()), else_=None),
+        )
+        .returning(
+            UserChallenge.id, UserChallenge.challenge_id, UserChallenge.current_progress, UserChallenge.completed,
+            *returning
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def advance(db: AsyncSession, user_id: int, changes: Dict[ChallengeType, tuple]) -> List[int]:
+    """changes 의 유형별 ("add", n) / ("set", n) 을 한 문장으로 반영하고 새로 완료된 챌린지 id 목록을 반환"""
+    changes = {kind: change for kind, change in changes.items() if change[0] == "set" or change[1]}
+    if not changes:
+        return []
+    new_progress = case(
+        *[
+            (
+                Challenge.challenge_type == kind,
+                UserChallenge.current_progress + amount if op == "add" else literal(amount),
+            )
+            for kind, (op, amount) in changes.items()
+        ],
+        else_=UserChallenge.current_progress
+    )
+    rows = (await db.execute(progress_update(
+        db.bind.dialect.name,
+        new_progress,
+        UserChallenge.user_id == user_id,
+        Challenge.is_active == True,
+        Challenge.challenge_type.in_(list(changes)),
+    ))).all()
+    return [row.challenge_id for row in rows if row.completed]
+
+
+async def add_progress(db: AsyncSession, user_id: int, challenge_id: int, amount: int):
+    """진행 중인 챌린지에 amount 를 한 문장으로 더하고 (…, completed, target_value, name) 행을 반환
+
+    동시에 여러 요청이 더해도 각 UPDATE 가 갱신 시점의 값에 더하므로 잃어버리는 증가분이 없다.
+    진행 중인 챌린지가 없으면 None.
+    """
+    challenge = aliased(Challenge)
+    return (await db.execute(progress_update(
+        db.bind.dialect.name,
+        UserChallenge.current_progress + amount,
+        UserChallenge.user_id == user_id,
+        UserChallenge.challenge_id == challenge_id,
+        returning=(
+            select(challenge.target_value).where(challenge.id == UserChallenge.challenge_id).scalar_subquery().label("target_value"),
+            select(challenge.name).where(challenge.id == UserChallenge.challenge_id).scalar_subquery().label("name"),
+        ),
+    ))).first()
+
+
+def whole_kg_gained(before: float, after: float) -> int:
+    """누적 탄소 절약량의 정수 kg 변화 (부동소수 오차는 버림)"""
+    return math.floor(round(after, 6)) - math.floor(round(before, 6))
+
+
+async def on_meals_logged(db: AsyncSession, user_id: int, count: int, streak: Optional[int]) -> List[int]:
+    changes = {ChallengeType.MEAL_LOGGING: ("add", count)}
+    if streak is not None:
+        changes[ChallengeType.WEEKLY_GOAL] = ("set", streak)
+    return await advance(db, user_id, changes)
+
+
+async def on_swap_changed(db: AsyncSession, user_id: int, accepted: bool, carbon_before: float, carbon_after: float) -> List[int]:
+    return await advance(db, user_id, {
+        ChallengeType.SWAP_ACCEPTANCE: ("add", 1 if accepted else -1),
+        ChallengeType.CARBON_REDUCTION: ("add", whole_kg_gained(carbon_before, carbon_after)),
+    })
@@ -0,0 +1,127 @@
+"""
+계정 전체 데이터 내보내기 (NDJSON 스트림)
+
+한 줄에 레코드 하나씩 {"table": ..., "row": {...}} 형태로 내보낸다.
+첫 줄은 내보내기 정보(export), 마지막 줄은 테이블별 행 수(summary) 이므로
+클라이언트는 summary 가 없으면 중간에 끊긴 파일로 판단할 수 있다.
+
+- 테이블마다 기본키 순서로 BATCH_ROWS 행씩 키셋으로 읽고, 각 배치는 yield_per 로
+  서버 사이드 커서에서 조금씩 가져온다. 메모리에는 배치 하나의 일부만 올라간다
+- 배치가 끝날 때마다 트랜잭션을 끝내므로, 느린 클라이언트가 있어도 긴 트랜잭션이
+  스냅샷을 붙잡거나 DDL(마이그레이션) 을 막지 않는다
+- 배치 사이에 쓰기가 들어올 수 있으므로 테이블 간 시점 일관성은 보장하지 않는다
+"""
+
+import enum
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.activity_log import ActivityLog
+from app.models.badge import UserBadge
+from app.models.challenge import UserChallenge
+from app.models.meal_log import MealLog
+from app.models.recommended_swap import RecommendedSwap
+from app.models.user import User
+
+FORMAT_VERSION = 1
+BATCH_ROWS = 5000
+FETCH_ROWS = 500
+WRITE_BUFFER_BYTES = 64 * 1024
+
+# 응답에서 빼는 사용자 컬럼
+EXCLUDED_USER_COLUMNS = {"password_hash"}
+
+
+def export_tables(user_id: int) -> list:
+    """(테이블 이름, 기본키 컬럼, 사용자 조건이 걸린 select) 목록"""
+    meal_table = MealLog.__table__
+    swap_table = RecommendedSwap.__table__
+    return [
+        ("meal_logs", meal_table.c.id, select(meal_table).where(meal_table.c.user_id == user_id)),
+        (
+            "recommended_swaps",
+            swap_table.c.id,
+            select(swap_table)
+            .join(meal_table, meal_table.c.id == swap_table.c.meal_log_id)
+            .where(meal_table.c.user_id == user_id),
+        ),
+        ("activity_logs", ActivityLog.__table__.c.id, select(ActivityLog.__table__).where(ActivityLog.user_id == user_id)),
+        ("user_challenges", UserChallenge.__table__.c.id, select(UserChallenge.__table__).where(UserChallenge.user_id == user_id)),
+        ("user_badges", UserBadge.__table__.c.id, select(UserBadge.__table__).where(UserBadge.user_id == user_id)),
+    ]
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.value
+    raise TypeError(f"{type(value).__name__} 는 JSON 으로 변환할 수 없습니다.")
+
+
+def encode_line(table: str, row: dict) -> bytes:
+    return (json.dumps({"table": table, "row": row}, ensure_ascii=False, default=_json_default) + "\n").encode("utf-8")
+
+
+async def _profile(db, user_id: int) -> Optional[dict]:
+    user_table = User.__table__
+    columns = [column for column in user_table.c if column.name not in EXCLUDED_USER_COLUMNS]
+    result = await db.execute(select(*columns).where(user_table.c.id == user_id))
+    row = result.mappings().first()
+    return dict(row) if row is not None else None
+
+
+async def _table_rows(db, primary_key, stmt, batch_rows: int) -> AsyncIterator[dict]:
+    """기본키 키셋으로 batch_rows 행씩 읽고 배치마다 트랜잭션을 끝낸다"""
+    last_id = None
+    while True:
+        batch = stmt.order_by(primary_key).limit(batch_rows)
+        if last_id is not None:
+            batch = batch.where(primary_key > last_id)
+
+        fetched = 0
+        result = await db.stream(batch.execution_options(yield_per=min(FETCH_ROWS, batch_rows)))
+        async for row in result.mappings():
+            fetched += 1
+            last_id = row[primary_key.name]
+            yield dict(row)
+        await db.commit()
+
+        if fetched < batch_rows:
+            return
+
+
+async def export_user_data(user_id: int, batch_rows: Optional[int] = None) -> AsyncIterator[bytes]:
+    """사용자의 모든 기록을 NDJSON 바이트 조각으로 내보낸다
+
+    응답 스트림이 요청 의존성(get_db) 보다 오래 살기 때문에 세션을 직접 연다.
+    """
+    batch_rows = batch_rows or BATCH_ROWS
+    async with AsyncSessionLocal() as db:
+        profile = await _profile(db, user_id)
+        await db.commit()
+
+        buffer = bytearray(encode_line("export", {
+            "format_version": FORMAT_VERSION,
+            "user_id": user_id,
+            "exported_at": datetime.utcnow(),
+        }))
+        if profile is not None:
+            buffer += encode_line("users", profile)
+
+        counts = {}
+        for table, primary_key, stmt in export_tables(user_id):
+            counts[table] = 0
+            async for row in _table_rows(db, primary_key, stmt, batch_rows):
+                counts[table] += 1
+                buffer += encode_line(table, row)
+                if len(buffer) >= WRITE_BUFFER_BYTES:
+                    yield bytes(buffer)
+                    buffer.clear()
+
+        buffer += encode_line("summary", {"counts": counts})
+        yield bytes(buffer)
@@ -0,0 +1,49 @@
+"""
+사용자별 데이터 버전 (user_data_versions)
+
+식사, 스왑, 챌린지, 배지처럼 조회 응답에 영향을 주는 쓰기는 같은 트랜잭션에서
+버전을 1 올린다. 조회 API 는 이 값과 요청 파라미터로 ETag 를 만들고,
+클라이언트의 If-None-Match 와 같으면 집계 쿼리 없이 304 를 돌려준다.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.etag import make_etag
+from app.models.user_data_version import UserDataVersion
+
+
+def bump_statement(dialect_name: str, user_id: int):
+    """버전을 1 올리는 INSERT ... ON CONFLICT 문"""
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    stmt = insert(UserDataVersion).values(user_id=user_id, version=1, updated_at=datetime.utcnow())
+    return stmt.on_conflict_do_update(
+        index_elements=[UserDataVersion.user_id],
+        set_={
+            "version": UserDataVersion.version + 1,
+            "updated_at": stmt.excluded.updated_at,
+        }
+    )
+
+
+async def touch_user_data(db: AsyncSession, user_id: int):
+    """사용자 데이터가 바뀌었음을 기록 (호출한 쪽 트랜잭션에 포함, 커밋하지 않음)"""
+    await db.execute(bump_statement(db.bind.dialect.name, user_id))
+
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    version = await db.scalar(
+        select(UserDataVersion.version).where(UserDataVersion.user_id == user_id)
+    )
+    return version or 0
+
+
+async def user_etag(db: AsyncSession, user_id: int, *parts) -> str:
+    """사용자 데이터 버전과 응답을 결정하는 나머지 값(엔드포인트, 파라미터, 날짜)으로 ETag 생성"""
+    return make_etag(user_id, await get_data_version(db, user_id), *parts)
@@ -0,0 +1,77 @@
+"""
+배출계수 데이터셋 재적재
+
+파일을 다시 읽어 컴파일하고, foods 테이블을 새 음식 표에 맞춘 뒤 활성 데이터셋을 바꾼다.
+foods 를 먼저 맞추므로 교체 직후의 식사 기록도 새 음식의 food_id 를 찾는다.
+파일이 잘못되었거나 foods 동기화가 실패하면 기존 데이터셋이 그대로 유지된다.
+
+컴파일과 foods 동기화는 동기 코드라서 이벤트 루프 밖(스레드) 에서 실행하고,
+진행 중인 요청은 이미 잡은 스냅샷으로 끝나므로 기다리거나 실패하지 않는다.
+
+데이터셋은 워커 프로세스마다 따로 있으므로 워커마다 재적재해야 한다.
+- kill -HUP <워커 pid>
+- POST /api/admin/factors/reload (ADMIN_TOKEN 이 설정된 경우, 요청을 받은 워커만)
+"""
+
+import asyncio
+import logging
+import signal
+import time
+from pathlib import Path
+from typing import Optional
+
+from app.core.database import engine
+from app.data.factor_dataset import activate_dataset, load_dataset
+from app.services.foods import sync_foods
+
+logger = logging.getLogger(__name__)
+
+_signal_tasks = set()
+
+
+def reload_factors(path: Optional[Path] = None) -> dict:
+    """데이터셋을 다시 읽어 교체하고 결과를 반환 (동기, 스레드에서 호출)"""
+    started = time.perf_counter()
+    dataset = load_dataset(path)
+    compiled = time.perf_counter()
+    with engine.begin() as connection:
+        foods_changed = sync_foods(connection, dataset)
+    previous = activate_dataset(dataset)
+    finished = time.perf_counter()
+
+    result = {
+        "previous_version": previous.version,
+        "version": dataset.version,
+        "foods_changed": foods_changed,
+        "compile_ms": round((compiled - started) * 1000, 2),
+        "total_ms": round((finished - started) * 1000, 2),
+    }
+    logger.info("emission factors reloaded: %s", result)
+    return result
+
+
+async def reload_factors_async(path: Optional[Path] = None) -> dict:
+    return await asyncio.to_thread(reload_factors, path)
+
+
+async def _reload_on_signal():
+    try:
+        await reload_factors_async()
+    except Exception:
+        logger.exception("emission factor reload failed; keeping the current dataset")
+
+
+def install_reload_signal() -> bool:
+    """SIGHUP 을 받으면 재적재하도록 등록 (지원하지 않는 플랫폼/스레드면 False)"""
+    loop = asyncio.get_running_loop()
+
+    def handle():
+        task = loop.create_task(_reload_on_signal())
+        _signal_tasks.add(task)
+        task.add_done_callback(_signal_tasks.discard)
+
+    try:
+        loop.add_signal_handler(signal.SIGHUP, handle)
+    except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+        return False
+    return True
@@ -0,0 +1,132 @@
+"""
+음식 차원 테이블 (foods)
+
+배출계수 데이터셋의 음식마다 정수 id 를 두고, 식사 기록은 쓰는 시점에
+탄소 계산과 같은 규칙(정확 일치 -> 부분 일치)으로 해석한 food_id 를 함께 저장한다.
+집계는 가변 길이 문자열 대신 food_id 로 묶고, 이름과 카테고리는 foods 와 조인해서 얻는다.
+해석되지 않는 자유 입력 음식은 food_id 가 NULL 이다.
+
+foods 는 서버 시작, 배출계수 재적재, 마이그레이션에서 sync_foods 로 데이터와 맞춘다.
+id 는 한 번 부여되면 바뀌지 않으므로 프로세스 안에 이름 -> id 를 캐시한다.
+"""
+
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, distinct, func, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data.factor_dataset import FactorDataset, current_dataset
+from app.models.food import Food
+from app.models.meal_log import MealLog
+
+BACKFILL_CHUNK_SIZE = 10000
+
+_food_ids: Dict[str, int] = {}
+
+
+def resolve_food_name(food_name: str, dataset: Optional[FactorDataset] = None) -> Optional[str]:
+    """입력 음식명을 foods 의 이름으로 해석 (탄소 계산과 같은 규칙, 없으면 None)"""
+    resolver = (dataset or current_dataset()).resolver
+    if resolver.lookup(food_name) is not None:
+        return food_name
+    return resolver.find_partial(food_name)
+
+
+def _insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(Food)
+
+
+def sync_foods(connection: Connection, dataset: Optional[FactorDataset] = None) -> int:
+    """배출계수 데이터셋의 음식을 foods 에 추가/갱신하고 바뀐 행 수를 반환
+
+    여러 워커가 동시에 시작하거나 재적재해도 안전하도록 추가는 ON CONFLICT DO NOTHING 이다.
+    데이터셋에서 빠진 음식의 행은 기존 기록이 참조하므로 지우지 않는다.
+    """
+    dataset = dataset or current_dataset()
+    existing = {
+        row.name: (row.category, row.carbon_per_serving)
+        for row in connection.execute(select(Food.name, Food.category, Food.carbon_per_serving))
+    }
+    rows = [
+        {"name": name, "category": dataset.category_of(name), "carbon_per_serving": carbon}
+        for name, carbon in dataset.foods.items()
+    ]
+
+    new_rows = [row for row in rows if row["name"] not in existing]
+    changed = [
+        row for row in rows
+        if row["name"] in existing and existing[row["name"]] != (row["category"], row["carbon_per_serving"])
+    ]
+    if new_rows:
+        connection.execute(_insert(connection.dialect.name).on_conflict_do_nothing(index_elements=[Food.name]), new_rows)
+    for row in changed:
+        connection.execute(
+            update(Food).where(Food.name == row["name"]).values(
+                category=row["category"], carbon_per_serving=row["carbon_per_serving"]
+            )
+        )
+    return len(new_rows) + len(changed)
+
+
+def load_food_ids(connection: Connection) -> Dict[str, int]:
+    return dict(connection.execute(select(Food.name, Food.id)).all())
+
+
+async def food_id_map(db: AsyncSession, reload: bool = False) -> Dict[str, int]:
+    """이름 -> id (처음 한 번만 읽는다)"""
+    if reload or not _food_ids:
+        result = await db.execute(select(Food.name, Food.id))
+        _food_ids.clear()
+        _food_ids.update(result.all())
+    return _food_ids
+
+
+async def food_id_for(db: AsyncSession, food_name: str, dataset: Optional[FactorDataset] = None) -> Optional[int]:
+    """식사 기록에 저장할 food_id (해석되지 않으면 None)"""
+    name = resolve_food_name(food_name, dataset)
+    if name is None:
+        return None
+    ids = await food_id_map(db)
+    if name not in ids:
+        # 다른 워커(또는 재적재) 가 방금 추가한 음식일 수 있다
+        ids = await food_id_map(db, reload=True)
+    return ids.get(name)
+
+
+def backfill_meal_food_ids(connection: Connection, chunk_size: int = BACKFILL_CHUNK_SIZE) -> int:
+    """food_id 가 비어 있는 기존 식사 기록을 id 구간별로 채우고 갱신한 행 수를 반환
+
+    구간마다 그 안의 고유 음식명만 해석해서 (구간, 이름) 단위 UPDATE 를 executemany 로 보낸다.
+    autocommit 연결에서 호출하면 구간마다 짧은 트랜잭션으로 끝난다.
+    """
+    ids = load_food_ids(connection)
+    table = MealLog.__table__
+    max_id = connection.scalar(select(func.max(table.c.id))) or 0
+    stmt = update(table).where(
+        table.c.id > bindparam("low"),
+        table.c.id <= bindparam("high"),
+        table.c.food_name == bindparam("name"),
+        table.c.food_id.is_(None)
+    ).values(food_id=bindparam("resolved_id"))
+
+    updated = 0
+    for low in range(0, max_id, chunk_size):
+        high = low + chunk_size
+        names = connection.scalars(
+            select(distinct(table.c.food_name)).where(
+                table.c.id > low, table.c.id <= high, table.c.food_id.is_(None)
+            )
+        ).all()
+        params = []
+        for name in names:
+            food_id = ids.get(resolve_food_name(name))
+            if food_id is not None:
+                params.append({"low": low, "high": high, "name": name, "resolved_id": food_id})
+        if params:
+            updated += connection.execute(stmt, params).rowcount
+    return updated
@@ -0,0 +1,149 @@
+"""
+쓰기 요청 멱등성 (Idempotency-Key)
+
+클라이언트가 응답을 받지 못하고 같은 요청을 다시 보내도 기록이 한 번만 생기도록,
+Idempotency-Key 헤더가 있는 요청은 응답 본문을 (user_id, key) 로 저장하고
+재시도에는 저장된 응답을 그대로 돌려준다 (Idempotent-Replayed: true).
+
+- 키 행은 쓰기와 같은 트랜잭션에서 커밋되므로 기록만 있고 키가 없는 상태는 생기지 않는다
+- 같은 키로 동시에 들어온 요청은 유니크 제약 때문에 하나만 커밋되고, 나머지는
+  자기 쓰기를 롤백한 뒤 먼저 커밋된 응답을 돌려준다
+- 최근 키는 프로세스 안 LRU 에 있어서 대부분의 재시도는 DB 를 읽지 않는다
+- 같은 키를 다른 본문으로 다시 쓰면 422
+- 키는 IDEMPOTENCY_TTL_HOURS(기본 24) 동안 유효하고, 만료된 행은
+  python -m app.jobs.purge_idempotency_keys 로 지운다
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency_key import IdempotencyKey
+
+REPLAY_HEADER = "Idempotent-Replayed"
+IDEMPOTENCY_TTL = timedelta(hours=float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24")))
+
+
+def request_hash(endpoint: str, payload: BaseModel) -> str:
+    return hashlib.sha1(f"{endpoint}|{payload.model_dump_json()}".encode()).hexdigest()
+
+
+class IdempotencyCache:
+    """최근 처리한 키의 (만료 시각, 요청 해시, 응답 본문) LRU"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (user_id, key) -> (expires_at, request_hash, body)
+
+    def get(self, user_id: int, key: str) -> Optional[tuple]:
+        entry = self._entries.get((user_id, key))
+        if entry is None:
+            return None
+        if entry[0] < datetime.utcnow():
+            del self._entries[(user_id, key)]
+            return None
+        self._entries.move_to_end((user_id, key))
+        return entry
+
+    def set(self, user_id: int, key: str, entry: tuple):
+        self._entries[(user_id, key)] = entry
+        self._entries.move_to_end((user_id, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+idempotency_cache = IdempotencyCache(
+    max_entries=int(os.getenv("IDEMPOTENCY_CACHE_MAX_ENTRIES", "10000")),
+)
+
+
+class IdempotentRequest:
+    """쓰기 엔드포인트 한 번의 멱등 처리 (key 가 None 이면 평소처럼 커밋만 한다)
+
+        idempotent = IdempotentRequest(user_id, idempotency_key, "meals.create", payload)
+        replay = await idempotent.find_replay(db)
+        if replay is not None:
+            return replay
+        ... 쓰기 ...
+        replay = await idempotent.commit(db, response)
+    """
+
+    def __init__(self, user_id: int, key: Optional[str], endpoint: str, payload: BaseModel):
+        self.user_id = user_id
+        self.key = key
+        self.endpoint = endpoint
+        self.request_hash = request_hash(endpoint, payload) if key is not None else None
+
+    async def find_replay(self, db: AsyncSession) -> Optional[JSONResponse]:
+        """이미 처리한 키면 저장된 응답, 처음 보는 키면 None"""
+        if self.key is None:
+            return None
+
+        entry = idempotency_cache.get(self.user_id, self.key)
+        if entry is None:
+            row = await db.scalar(
+                select(IdempotencyKey).where(
+                    IdempotencyKey.user_id == self.user_id,
+                    IdempotencyKey.key == self.key
+                )
+            )
+            if row is None:
+                return None
+            if row.expires_at < datetime.utcnow():
+                # 만료된 키는 새 요청으로 처리 (같은 트랜잭션에서 새 행이 들어간다)
+                await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == row.id))
+                return None
+            entry = (row.expires_at, row.request_hash, row.response_body)
+            idempotency_cache.set(self.user_id, self.key, entry)
+
+        _, stored_hash, body = entry
+        if stored_hash != self.request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="같은 Idempotency-Key 가 다른 요청에 이미 사용되었습니다."
+            )
+        return JSONResponse(content=json.loads(body), headers={REPLAY_HEADER: "true"})
+
+    async def commit(self, db: AsyncSession, response: BaseModel) -> Optional[JSONResponse]:
+        """응답을 키와 함께 쓰기와 같은 트랜잭션으로 커밋
+
+        같은 키의 동시 요청이 먼저 커밋했으면 이 요청의 쓰기는 롤백되고 그 응답을 반환한다.
+        """
+        if self.key is None:
+            await db.commit()
+            return None
+
+        body = response.model_dump_json()
+        expires_at = datetime.utcnow() + IDEMPOTENCY_TTL
+        db.add(IdempotencyKey(
+            user_id=self.user_id,
+            key=self.key,
+            endpoint=self.endpoint,
+            request_hash=self.request_hash,
+            response_body=body,
+            expires_at=expires_at
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            replay = await self.find_replay(db)
+            if replay is None:
+                raise
+            return replay
+
+        idempotency_cache.set(self.user_id, self.key, (expires_at, self.request_hash, body))
+        return None
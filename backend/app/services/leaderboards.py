@@ -0,0 +1,197 @@
+"""
+리더보드 (주간 탄소 절약, 누적 포인트, 현재 연속 기록)
+
+점수는 이벤트가 일어날 때 바로 갱신한다.
+
+- points: 원장에 포인트가 쌓일 때 합계 행의 total_points 로
+- carbon_weekly: 스왑 수락/취소 원장 행의 탄소 절약량을 이번 주 점수에 더해서
+- streak: 식사 기록으로 연속 기록이 갱신될 때 오늘의 현재 연속 일수로
+
+쓰기 경로는 leaderboard_scores 스냅샷을 호출한 쪽 트랜잭션 안에서 upsert 하고, 이 워커의 순위 집합
+(app.core.ranking.RankedSet) 에는 커밋된 뒤에만 반영한다 (롤백되면 버림). 다른 워커가 바꾼 점수는
+LEADERBOARD_REFRESH_SECONDS 마다 스냅샷에서 updated_at 이 지난 동기화 시점 근처 이후인 행만 읽어서 따라잡는다.
+
+updated_at 은 커밋 시각이 아니라 쓰는 시각이라서, 오래 걸린 트랜잭션은 다른 워커의 새로고침보다
+늦게 커밋되면서도 그보다 이른 updated_at 을 가질 수 있다. 그래서 새로고침은 마지막으로 본 updated_at 에서
+LEADERBOARD_REFRESH_OVERLAP_SECONDS (가장 긴 트랜잭션 + 워커 간 시계 차이보다 길게) 만큼 앞부터 다시 읽는다.
+점수는 누적값이 아니라 그 시점의 절댓값이므로 같은 행을 다시 반영해도 결과가 같다.
+
+주간/일간 보드는 기간(period) 이 키에 들어가므로, 주가 바뀌면 새 키의 빈 보드에서 시작하고
+지난 기간의 집합은 메모리에서 버린다. 전체를 다시 계산하지 않는다.
+"""
+
+import os
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.ranking import RankedSet
+from app.models.leaderboard_score import LeaderboardScore
+from app.services.carbon_rollup import kst_today
+
+POINTS = "points"
+CARBON_WEEKLY = "carbon_weekly"
+STREAK = "streak"
+BOARDS = (POINTS, CARBON_WEEKLY, STREAK)
+
+ALL_TIME = "all"
+_PENDING = "leaderboard_updates"
+
+
+def period_for(board: str, today: Optional[date] = None) -> str:
+    """보드의 현재 기간 키 (주간은 KST 월요일, 연속 기록은 KST 오늘)"""
+    today = today or kst_today()
+    if board == CARBON_WEEKLY:
+        return (today - timedelta(days=today.weekday())).isoformat()
+    if board == STREAK:
+        # 연속 기록은 오늘 기록한 사용자만 이어지고 있다 (current_streak_of 와 같은 기준)
+        return today.isoformat()
+    return ALL_TIME
+
+
+def _insert(model, dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+class _Board:
+    __slots__ = ("ranking", "synced_at", "checked_at")
+
+    def __init__(self, ranking: RankedSet, synced_at: datetime):
+        self.ranking = ranking
+        self.synced_at = synced_at
+        self.checked_at = time.monotonic()
+
+
+class Leaderboards:
+    """(board, period) 별 순위 집합 - 처음 조회할 때 스냅샷에서 한 번 만든다"""
+
+    def __init__(self, refresh_seconds: float, overlap_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.overlap_seconds = overlap_seconds
+        self._boards: Dict[Tuple[str, str], _Board] = {}
+        self.loads = 0
+        self.refreshes = 0
+
+    async def ranking(self, db: AsyncSession, board: str) -> Tuple[RankedSet, str]:
+        period = period_for(board)
+        entry = self._boards.get((board, period))
+        if entry is None:
+            entry = await self._load(db, board, period)
+        elif time.monotonic() - entry.checked_at >= self.refresh_seconds:
+            await self._refresh(db, board, period, entry)
+        return entry.ranking, period
+
+    async def _load(self, db: AsyncSession, board: str, period: str) -> _Board:
+        rows = (await db.execute(
+            select(LeaderboardScore.user_id, LeaderboardScore.score, LeaderboardScore.updated_at).where(
+                LeaderboardScore.board == board, LeaderboardScore.period == period
+            )
+        )).all()
+        ranking = RankedSet.from_scores((user_id, score) for user_id, score, _updated_at in rows if score > 0)
+        synced_at = max((updated_at for _user_id, _score, updated_at in rows), default=datetime.min)
+        entry = _Board(ranking, synced_at)
+        # 지난 기간의 보드는 버린다 (롤오버)
+        for key in [key for key in self._boards if key[0] == board and key[1] != period]:
+            del self._boards[key]
+        self._boards[(board, period)] = entry
+        self.loads += 1
+        return entry
+
+    async def _refresh(self, db: AsyncSession, board: str, period: str, entry: _Board):
+        """다른 워커가 바꾼 점수를 따라잡는다 (늦게 커밋된 이른 updated_at 의 행도 겹치는 구간에서 다시 읽는다)"""
+        since = entry.synced_at
+        if since != datetime.min:
+            since -= timedelta(seconds=self.overlap_seconds)
+        rows = (await db.execute(
+            select(LeaderboardScore.user_id, LeaderboardScore.score, LeaderboardScore.updated_at).where(
+                LeaderboardScore.board == board,
+                LeaderboardScore.period == period,
+                LeaderboardScore.updated_at >= since,
+            )
+        )).all()
+        for user_id, score, updated_at in rows:
+            self._set(entry.ranking, user_id, score)
+            entry.synced_at = max(entry.synced_at, updated_at)
+        entry.checked_at = time.monotonic()
+        self.refreshes += 1
+
+    def apply(self, updates: List[Tuple[str, str, int, float]]):
+        """커밋된 점수 변경을 메모리에 올라온 보드에만 반영"""
+        for board, period, user_id, score in updates:
+            entry = self._boards.get((board, period))
+            if entry is not None:
+                self._set(entry.ranking, user_id, score)
+
+    @staticmethod
+    def _set(ranking: RankedSet, user_id: int, score: float):
+        if score > 0:
+            ranking.set(user_id, score)
+        else:
+            ranking.discard(user_id)
+
+    def clear(self):
+        self._boards.clear()
+
+    def stats(self) -> dict:
+        return {
+            "boards": {f"{board}:{period}": len(entry.ranking) for (board, period), entry in self._boards.items()},
+            "loads": self.loads,
+            "refreshes": self.refreshes,
+        }
+
+
+leaderboards = Leaderboards(
+    refresh_seconds=float(os.getenv("LEADERBOARD_REFRESH_SECONDS", "30")),
+    overlap_seconds=float(os.getenv("LEADERBOARD_REFRESH_OVERLAP_SECONDS", "300")),
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session: Session):
+    updates = session.info.pop(_PENDING, None)
+    if updates:
+        leaderboards.apply(updates)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session):
+    session.info.pop(_PENDING, None)
+
+
+def _upsert(db: AsyncSession, board: str, user_id: int, score, now: datetime):
+    period = period_for(board)
+    stmt = _insert(LeaderboardScore, db.bind.dialect.name).values(
+        board=board, period=period, user_id=user_id, score=score, updated_at=now
+    )
+    return period, stmt
+
+
+async def set_score(db: AsyncSession, board: str, user_id: int, score: float):
+    """현재 기간의 점수를 score 로 (커밋되면 이 워커의 보드에도 반영)"""
+    now = datetime.utcnow()
+    period, stmt = _upsert(db, board, user_id, score, now)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=[LeaderboardScore.board, LeaderboardScore.period, LeaderboardScore.user_id],
+        set_={"score": score, "updated_at": now}
+    ))
+    db.info.setdefault(_PENDING, []).append((board, period, user_id, score))
+
+
+async def add_score(db: AsyncSession, board: str, user_id: int, delta: float) -> float:
+    """현재 기간의 점수에 delta 를 더하고 새 점수를 반환"""
+    now = datetime.utcnow()
+    period, stmt = _upsert(db, board, user_id, delta, now)
+    score = await db.scalar(stmt.on_conflict_do_update(
+        index_elements=[LeaderboardScore.board, LeaderboardScore.period, LeaderboardScore.user_id],
+        set_={"score": LeaderboardScore.score + delta, "updated_at": now}
+    ).returning(LeaderboardScore.score))
+    db.info.setdefault(_PENDING, []).append((board, period, user_id, score))
+    return score
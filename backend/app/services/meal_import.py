@@ -0,0 +1,253 @@
+"""
+식사 기록 대량 가져오기 (CSV / NDJSON)
+
+입력을 한 줄씩 읽어서 chunk_size 행마다 한 트랜잭션으로 넣는다.
+- 음식별 탄소 계수와 food_id 는 청크 안의 고유 음식명마다 한 번만 해석하고 계수는 numpy 로 곱한다
+- 가져오기 하나는 시작할 때의 배출계수 데이터셋으로 계산하고 그 버전을 factor_version 에 남긴다
+- Postgres 는 COPY, 그 외는 executemany 로 삽입한다
+- 일일 롤업/연속 기록/데이터 버전도 청크마다 같은 트랜잭션에서 갱신한다
+- 잘못된 행은 건너뛰고 줄 번호와 사유를 남긴다 (최대 MAX_REPORTED_ERRORS 건)
+
+청크와 오류 목록 크기가 고정이므로 파일 크기와 상관없이 메모리 사용량이 일정하다.
+CSV 는 한 줄이 한 행이어야 한다 (따옴표 안의 줄바꿈은 지원하지 않음).
+"""
+
+import codecs
+import csv
+import json
+import math
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import AsyncIterator, Iterable, Optional
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data.factor_dataset import current_dataset
+from app.models.meal_log import MealLog, MealType
+from app.services.achievements import MEAL_LOGGED, publish
+from app.services.carbon_rollup import apply_meals_to_rollup
+from app.services.data_version import touch_user_data
+from app.services.foods import food_id_map, resolve_food_name
+from app.services.streaks import refresh_streaks
+
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+MAX_CACHED_FACTORS = 50000
+
+MealRow = namedtuple(
+    "MealRow",
+    ["user_id", "food_name", "portion_size", "meal_type", "carbon_footprint", "image_url", "logged_at", "created_at", "food_id", "factor_version"]
+)
+
+COPY_COLUMNS = ", ".join(MealRow._fields)
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line: int, message: str):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def to_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """바이트 스트림을 UTF-8 (BOM 허용) 줄 단위로 변환"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer.rstrip("\r")
+
+
+async def aiter_file_lines(lines: Iterable[str]) -> AsyncIterator[str]:
+    """CLI 용: 동기 파일 객체를 비동기 줄 스트림으로 감싼다"""
+    for line in lines:
+        yield line.rstrip("\r\n")
+
+
+def parse_meal(record: dict, now: datetime) -> tuple:
+    """입력 레코드를 검증해서 (food_name, portion_size, meal_type, logged_at, image_url) 로 변환
+
+    잘못된 값이면 사용자에게 보여줄 메시지로 ValueError.
+    """
+    food_name = str(record.get("food_name") or "").strip()
+    if not food_name:
+        raise ValueError("food_name 이 비어 있습니다.")
+
+    try:
+        portion_size = float(record.get("portion_size"))
+    except (TypeError, ValueError):
+        raise ValueError("portion_size 는 숫자여야 합니다.")
+    if not (math.isfinite(portion_size) and portion_size > 0):
+        raise ValueError("portion_size 는 0보다 커야 합니다.")
+
+    raw_meal_type = str(record.get("meal_type") or "").strip()
+    try:
+        meal_type = MealType(raw_meal_type.lower())
+    except ValueError:
+        raise ValueError(f"알 수 없는 meal_type: {raw_meal_type!r}")
+
+    raw_logged_at = record.get("logged_at")
+    if raw_logged_at:
+        try:
+            logged_at = datetime.fromisoformat(str(raw_logged_at).strip())
+        except ValueError:
+            raise ValueError(f"logged_at 형식이 잘못되었습니다: {raw_logged_at!r}")
+        if logged_at.tzinfo is not None:
+            logged_at = logged_at.astimezone(timezone.utc).replace(tzinfo=None)
+    else:
+        logged_at = now
+
+    image_url = record.get("image_url") or None
+    return food_name, portion_size, meal_type, logged_at, image_url
+
+
+class MealImporter:
+    def __init__(self, db: AsyncSession, user_id: int, chunk_size: int = CHUNK_SIZE):
+        self.db = db
+        # 가져오는 도중 배출계수가 재적재되어도 한 파일은 같은 데이터셋으로 계산한다
+        self.dataset = current_dataset()
+        self.user_id = user_id
+        self.chunk_size = chunk_size
+        self.report = ImportReport()
+        self._pending = []
+        self._factors = {}  # 음식명 -> g 당 kg CO2e
+        self._food_ids = {}  # 음식명 -> food_id (해석되지 않으면 None)
+
+    def carbon_factors(self, food_names) -> np.ndarray:
+        """음식명별 g 당 탄소 계수 (처음 보는 이름만 해석)"""
+        from app.api.meals import calculate_carbon_footprint
+
+        if len(self._factors) > MAX_CACHED_FACTORS:
+            self._factors.clear()
+        for name in food_names:
+            if name not in self._factors:
+                # 모든 해석 경로가 분량에 비례하므로 1g 값이 곧 계수
+                self._factors[name] = calculate_carbon_footprint(name, 1.0, self.dataset)
+        return np.array([self._factors[name] for name in food_names], dtype=np.float64)
+
+    async def food_ids(self, food_names) -> list:
+        """음식명별 food_id (처음 보는 이름만 해석)"""
+        if len(self._food_ids) > MAX_CACHED_FACTORS:
+            self._food_ids.clear()
+        missing = [name for name in food_names if name not in self._food_ids]
+        if missing:
+            ids = await food_id_map(self.db)
+            for name in missing:
+                self._food_ids[name] = ids.get(resolve_food_name(name, self.dataset))
+        return [self._food_ids[name] for name in food_names]
+
+    async def add(self, line: int, record) -> None:
+        if not isinstance(record, dict):
+            self.report.add_error(line, "행이 객체 형식이 아닙니다.")
+            return
+        try:
+            self._pending.append(parse_meal(record, datetime.utcnow()))
+        except ValueError as exc:
+            self.report.add_error(line, str(exc))
+            return
+        if len(self._pending) >= self.chunk_size:
+            await self.flush()
+
+    async def flush(self):
+        """대기 중인 행을 한 트랜잭션으로 삽입"""
+        if not self._pending:
+            return
+        parsed, self._pending = self._pending, []
+
+        unique_names, inverse = np.unique(np.array([p[0] for p in parsed], dtype=object), return_inverse=True)
+        portions = np.array([p[1] for p in parsed], dtype=np.float64)
+        carbon = portions * self.carbon_factors(unique_names.tolist())[inverse]
+        food_ids = np.array(await self.food_ids(unique_names.tolist()), dtype=object)[inverse]
+
+        now = datetime.utcnow()
+        rows = [
+            MealRow(self.user_id, food_name, portion_size, meal_type, float(carbon[i]), image_url, logged_at, now, food_ids[i], self.dataset.version)
+            for i, (food_name, portion_size, meal_type, logged_at, image_url) in enumerate(parsed)
+        ]
+
+        if self.db.bind.dialect.name == "postgresql":
+            await self._copy(rows)
+        else:
+            # ORM bulk 경로를 거치지 않는 Core insert (executemany)
+            await self.db.execute(insert(MealLog.__table__), [row._asdict() for row in rows])
+
+        await apply_meals_to_rollup(self.db, rows)
+        await refresh_streaks(self.db, [self.user_id])
+        await publish(self.db, self.user_id, MEAL_LOGGED, count=len(rows))
+        await touch_user_data(self.db, self.user_id)
+        await self.db.commit()
+        self.report.imported += len(rows)
+
+    async def _copy(self, rows: list):
+        """psycopg COPY FROM STDIN 으로 삽입 (현재 세션 트랜잭션 안에서)"""
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        async with raw.driver_connection.cursor() as cursor:
+            async with cursor.copy(f"COPY meal_logs ({COPY_COLUMNS}) FROM STDIN") as copy:
+                for row in rows:
+                    await copy.write_row(row._replace(meal_type=row.meal_type.name))
+
+
+async def import_meals(
+    db: AsyncSession,
+    user_id: int,
+    lines: AsyncIterator[str],
+    fmt: str,
+    chunk_size: int = CHUNK_SIZE
+) -> ImportReport:
+    """CSV(첫 줄 헤더) 또는 NDJSON 줄 스트림을 가져온다
+
+    CSV 헤더에 food_name, portion_size, meal_type 이 없으면 아무것도 넣지 않고 ValueError.
+    """
+    importer = MealImporter(db, user_id, chunk_size)
+    header: Optional[list] = None
+    line_no = 0
+
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+
+        if fmt == "csv":
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [column.strip() for column in values]
+                missing = {"food_name", "portion_size", "meal_type"} - set(header)
+                if missing:
+                    raise ValueError(f"CSV 헤더에 필요한 컬럼이 없습니다: {', '.join(sorted(missing))}")
+                continue
+            if len(values) != len(header):
+                importer.report.add_error(line_no, f"컬럼 수가 헤더({len(header)})와 다릅니다.")
+                continue
+            record = dict(zip(header, values))
+        else:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                importer.report.add_error(line_no, "JSON 형식이 잘못되었습니다.")
+                continue
+
+        await importer.add(line_no, record)
+
+    await importer.flush()
+    return importer.report
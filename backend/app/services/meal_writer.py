@@ -0,0 +1,171 @@
+"""
+식사 기록 그룹 커밋 (write-behind 큐)
+
+MEAL_WRITE_BATCHING=1 이면 POST /api/meals/ 가 식사 기록을 직접 커밋하지 않고 큐에 넣는다.
+백그라운드 태스크가 첫 행이 들어온 뒤 최대 max_delay 동안, 또는 max_batch 행이 모일
+때까지 모아서 한 트랜잭션으로 삽입, 일일 롤업, 연속 기록, 데이터 버전을 반영하고 커밋한다.
+
+요청은 자기 행이 들어간 배치가 커밋된 뒤 부여된 id 와 함께 돌아오므로, 응답을 받은
+기록은 항상 저장되어 있다. 대신 요청 지연이 최대 max_delay 만큼 늘어난다.
+배치가 실패하면 행마다 따로 다시 시도해서 문제가 있는 행의 요청만 실패시킨다.
+
+큐와 작업 태스크는 이벤트 루프마다 하나이며, 처음 제출될 때 시작된다.
+"""
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import dashboard_cache
+from app.core.database import AsyncSessionLocal
+from app.models.meal_log import MealLog, MealType
+from app.services.achievements import MEAL_LOGGED, publish
+from app.services.carbon_rollup import apply_meals_to_rollup
+from app.services.data_version import touch_user_data
+from app.services.meal_import import MealRow
+from app.services.streaks import record_meals_streaks
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+async def write_meals(db: AsyncSession, meals: list) -> list:
+    """식사 기록들을 한 트랜잭션에 넣고 부여된 id 목록을 입력 순서대로 반환 (커밋하지 않음)"""
+    table = MealLog.__table__
+    result = await db.execute(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True),
+        [meal._asdict() for meal in meals]
+    )
+    ids = result.scalars().all()
+
+    await apply_meals_to_rollup(db, meals)
+    await record_meals_streaks(db, meals)
+    for user_id, count in sorted(Counter(meal.user_id for meal in meals).items()):
+        await publish(db, user_id, MEAL_LOGGED, count=count)
+        await touch_user_data(db, user_id)
+    return ids
+
+
+class MealWriteQueue:
+    def __init__(self, enabled: bool, max_delay: float = 0.02, max_batch: int = 200):
+        self.enabled = enabled
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._loop = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.rows = 0
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(
+        self,
+        user_id: int,
+        food_name: str,
+        portion_size: float,
+        meal_type: MealType,
+        carbon_footprint: float,
+        image_url: Optional[str] = None,
+        food_id: Optional[int] = None,
+        factor_version: Optional[str] = None
+    ) -> dict:
+        """식사 기록을 큐에 넣고, 배치가 커밋되면 id 가 포함된 행을 반환"""
+        self._ensure_worker()
+        now = datetime.utcnow()
+        meal = MealRow(user_id, food_name, portion_size, meal_type, carbon_footprint, image_url, now, now, food_id, factor_version)
+        future = self._loop.create_future()
+        self._queue.put_nowait((meal, future))
+        return await future
+
+    async def close(self):
+        """남은 행을 모두 저장하고 작업 태스크를 끝낸다 (앱 종료 시)"""
+        if self._task is None or self._task.done() or self._loop is not asyncio.get_running_loop():
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "batches": self.batches,
+            "rows": self.rows,
+            "average_batch": round(self.rows / self.batches, 1) if self.batches else 0.0,
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            deadline = loop.time() + self.max_delay
+            stopping = False
+            while len(batch) < self.max_batch:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    item = self._queue.get_nowait()
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch: list):
+        meals = [meal for meal, _ in batch]
+        try:
+            async with AsyncSessionLocal() as db:
+                ids = await write_meals(db, meals)
+                await db.commit()
+        except Exception as exc:
+            if len(batch) > 1:
+                # 어느 행이 문제인지 모르므로 한 행씩 다시 시도
+                logger.warning("meal batch of %d failed, retrying rows one by one: %s", len(batch), exc)
+                for item in batch:
+                    await self._flush([item])
+                return
+            _, future = batch[0]
+            if not future.done():
+                future.set_exception(exc)
+            return
+
+        self.batches += 1
+        self.rows += len(batch)
+        for user_id in {meal.user_id for meal in meals}:
+            dashboard_cache.invalidate(user_id)
+        for (meal, future), meal_id in zip(batch, ids):
+            # 요청이 먼저 취소(연결 끊김)됐어도 기록은 이미 저장됨
+            if not future.done():
+                future.set_result({"id": meal_id, **meal._asdict()})
+
+
+# MEAL_WRITE_BATCHING=1 일 때만 사용 (기본은 요청마다 커밋)
+meal_write_queue = MealWriteQueue(
+    enabled=os.getenv("MEAL_WRITE_BATCHING", "0") == "1",
+    max_delay=float(os.getenv("MEAL_WRITE_MAX_DELAY_MS", "20")) / 1000,
+    max_batch=int(os.getenv("MEAL_WRITE_MAX_BATCH", "200")),
+)
@@ -0,0 +1,144 @@
+"""
+포인트/탄소 절약 원장 (points_ledger) 과 사용자별 누적 합계 (user_activity_counters)
+
+배지 지급과 스왑 수락/취소는 원장에 한 행을 추가하고, 같은 트랜잭션에서 합계 행을
+INSERT ... ON CONFLICT ... RETURNING 한 문장으로 늘린다. 레벨도 같은 문장에서
+새 포인트 합계로 다시 정하므로 /api/gamification/stats 는 합계 행 하나만 읽는다.
+포인트와 탄소 절약량이 바뀌면 리더보드 점수(leaderboards) 도 같은 트랜잭션에서 갱신한다.
+
+원장은 추가만 하므로 ledger_totals_select 로 언제든 합계를 다시 계산해서 맞는지 감사할 수 있다
+(python -m app.jobs.audit_points_ledger). 모든 함수는 커밋하지 않는다.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.points_ledger import PointsLedgerEntry
+from app.models.user_activity_counter import UserActivityCounter
+from app.services import leaderboards
+
+BADGE_AWARDED = "badge_awarded"
+SWAP_ACCEPTED = "swap_accepted"
+SWAP_UNACCEPTED = "swap_unaccepted"
+
+# 합계 행의 누적 컬럼 (원장에서 나오는 것: total_points, carbon_saved, badge_count)
+TOTALS = (
+    "meals_logged", "swaps_accepted", "carbon_saved", "challenges_joined",
+    "challenges_completed", "total_points", "badge_count",
+)
+
+# (최소 포인트, 칭호, 다음 레벨 포인트)
+LEVELS = (
+    (0, "새싹 지킴이", 500),
+    (500, "친환경 실천가", 1500),
+    (1500, "탄소 절약자", 3000),
+    (3000, "환경 전문가", 5000),
+    (5000, "지구 지킴이", 10000),
+    (10000, "환경 마스터", None),
+)
+
+
+def level_for(total_points: int) -> int:
+    level = 1
+    for number, (threshold, _title, _next) in enumerate(LEVELS, start=1):
+        if total_points >= threshold:
+            level = number
+    return level
+
+
+def level_expr(points):
+    """포인트 식으로 레벨을 정하는 SQL CASE (level_for 와 같은 규칙)"""
+    return case(
+        *[(points >= threshold, number) for number, (threshold, _title, _next) in reversed(list(enumerate(LEVELS, start=1)))],
+        else_=1
+    )
+
+
+def _insert(model, dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+async def add_to_totals(db: AsyncSession, user_id: int, deltas: dict):
+    """합계 행에 deltas 를 더하고 (포인트가 바뀌면 레벨도) 갱신된 행을 반환"""
+    now = datetime.utcnow()
+    initial = {name: deltas.get(name, 0) for name in TOTALS}
+    stmt = _insert(UserActivityCounter, db.bind.dialect.name).values(
+        user_id=user_id, level=level_for(initial["total_points"]), updated_at=now, **initial
+    )
+    set_ = {name: getattr(UserActivityCounter, name) + delta for name, delta in deltas.items()}
+    if deltas.get("total_points"):
+        set_["level"] = level_expr(UserActivityCounter.total_points + deltas["total_points"])
+    set_["updated_at"] = now
+    stmt = stmt.on_conflict_do_update(index_elements=[UserActivityCounter.user_id], set_=set_).returning(
+        *[getattr(UserActivityCounter, name) for name in TOTALS], UserActivityCounter.level
+    )
+    return (await db.execute(stmt)).one()
+
+
+async def record_entry(
+    db: AsyncSession,
+    user_id: int,
+    kind: str,
+    points: int = 0,
+    carbon_saved: float = 0.0,
+    ref_id: Optional[int] = None,
+    counters: Optional[dict] = None
+):
+    """원장에 한 행을 추가하고 합계 행에 반영 (counters 는 함께 늘릴 다른 누적 컬럼)"""
+    await db.execute(
+        _insert(PointsLedgerEntry, db.bind.dialect.name).values(
+            user_id=user_id, kind=kind, points=points, carbon_saved=carbon_saved,
+            ref_id=ref_id, created_at=datetime.utcnow()
+        )
+    )
+    deltas = dict(counters or {})
+    if points:
+        deltas["total_points"] = deltas.get("total_points", 0) + points
+    if carbon_saved:
+        deltas["carbon_saved"] = deltas.get("carbon_saved", 0.0) + carbon_saved
+    if kind == BADGE_AWARDED:
+        deltas["badge_count"] = deltas.get("badge_count", 0) + 1
+    totals = await add_to_totals(db, user_id, deltas)
+
+    if points:
+        await leaderboards.set_score(db, leaderboards.POINTS, user_id, totals.total_points)
+    if carbon_saved:
+        await leaderboards.add_score(db, leaderboards.CARBON_WEEKLY, user_id, carbon_saved)
+    return totals
+
+
+def ledger_totals_select(user_ids: Iterable[int]):
+    """원장에서 사용자별 (total_points, carbon_saved, badge_count) 를 다시 계산하는 SELECT"""
+    return select(
+        PointsLedgerEntry.user_id,
+        func.coalesce(func.sum(PointsLedgerEntry.points), 0).label("total_points"),
+        func.coalesce(func.sum(PointsLedgerEntry.carbon_saved), 0.0).label("carbon_saved"),
+        func.coalesce(
+            func.sum(case((PointsLedgerEntry.kind == BADGE_AWARDED, 1), else_=0)), 0
+        ).label("badge_count"),
+    ).where(PointsLedgerEntry.user_id.in_(list(user_ids))).group_by(PointsLedgerEntry.user_id)
+
+
+def totals_mismatches(stored: dict, recomputed: dict, tolerance: float = 1e-6) -> list:
+    """저장된 합계와 원장 재계산 값이 다른 사용자 목록
+
+    stored / recomputed: user_id -> (total_points, carbon_saved, badge_count)
+    """
+    mismatches = []
+    for user_id in sorted(set(stored) | set(recomputed)):
+        points, carbon, badges = stored.get(user_id, (0, 0.0, 0))
+        expected_points, expected_carbon, expected_badges = recomputed.get(user_id, (0, 0.0, 0))
+        if points != expected_points or badges != expected_badges or abs(carbon - expected_carbon) > tolerance:
+            mismatches.append({
+                "user_id": user_id,
+                "stored": {"total_points": points, "carbon_saved": carbon, "badge_count": badges},
+                "ledger": {"total_points": expected_points, "carbon_saved": expected_carbon, "badge_count": expected_badges},
+            })
+    return mismatches
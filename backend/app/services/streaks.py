@@ -0,0 +1,200 @@
+"""
+사용자별 연속 기록 (user_streaks)
+
+식사가 기록될 때 (현재 연속, 최고 연속, 마지막 기록일) 을 한 문장으로 갱신해서,
+연속 기록 조회가 사용자의 모든 식사를 읽지 않고 기본키 조회 한 번으로 끝나도록 한다.
+과거 날짜가 끼어드는 경우와 초기 백필은 user_daily_carbon 의 날짜들을
+gaps-and-islands 로 묶어서 다시 계산한다.
+"""
+
+from datetime import date, datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.models.user_streak import UserStreak
+from app.services.carbon_rollup import kst_day, kst_today
+
+DAY_ZERO = date(2000, 1, 1)
+
+
+def day_number_expr(column, dialect_name: str):
+    """날짜 컬럼을 연속된 정수(일 단위)로 바꾸는 식"""
+    if dialect_name == "postgresql":
+        return column - DAY_ZERO
+    return func.julianday(column)
+
+
+def streak_islands_select(dialect_name: str, *filters):
+    """롤업의 기록 날짜들로 사용자별 연속 기록 상태를 한 문장으로 계산
+
+    날짜 번호에서 row_number 를 빼면 연속된 날짜끼리 같은 값(섬)이 된다.
+    섬의 길이 중 최댓값이 최고 연속, 가장 최근 섬이 현재 연속이다.
+    """
+    days = select(
+        UserDailyCarbon.user_id,
+        UserDailyCarbon.day,
+        (
+            day_number_expr(UserDailyCarbon.day, dialect_name)
+            - func.row_number().over(
+                partition_by=UserDailyCarbon.user_id,
+                order_by=UserDailyCarbon.day
+            )
+        ).label("island"),
+    ).where(*filters).subquery()
+
+    islands = select(
+        days.c.user_id,
+        func.max(days.c.day).label("end_day"),
+        func.count().label("length"),
+    ).group_by(days.c.user_id, days.c.island).subquery()
+
+    ranked = select(
+        islands.c.user_id,
+        islands.c.end_day,
+        islands.c.length,
+        func.max(islands.c.length).over(partition_by=islands.c.user_id).label("best"),
+        func.row_number().over(
+            partition_by=islands.c.user_id,
+            order_by=islands.c.end_day.desc()
+        ).label("recency"),
+    ).subquery()
+
+    return select(
+        ranked.c.user_id,
+        ranked.c.length.label("current_streak"),
+        ranked.c.best.label("best_streak"),
+        ranked.c.end_day.label("last_day"),
+    ).where(ranked.c.recency == 1)
+
+
+def _insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(UserStreak)
+
+
+def advance_statement(dialect_name: str, user_id: int, day: date):
+    """day 에 기록이 생겼을 때 상태를 전진시키는 INSERT ... ON CONFLICT 문
+
+    같은 날이면 그대로, 다음 날이면 +1, 하루 이상 비었으면 1 로 다시 시작한다.
+    day 가 last_day 보다 이전이면 아무것도 바꾸지 않으므로 호출한 쪽에서 재계산해야 한다.
+    """
+    stmt = _insert(dialect_name).values(
+        user_id=user_id,
+        current_streak=1,
+        best_streak=1,
+        last_day=day,
+        updated_at=datetime.utcnow(),
+    )
+    excluded = stmt.excluded
+    gap = (
+        day_number_expr(excluded.last_day, dialect_name)
+        - day_number_expr(UserStreak.last_day, dialect_name)
+    )
+    extended = UserStreak.current_streak + 1
+    return stmt.on_conflict_do_update(
+        index_elements=[UserStreak.user_id],
+        set_={
+            "current_streak": case(
+                (gap == 1, extended),
+                (gap > 1, 1),
+                else_=UserStreak.current_streak
+            ),
+            "best_streak": case(
+                ((gap == 1) & (extended > UserStreak.best_streak), extended),
+                else_=UserStreak.best_streak
+            ),
+            "last_day": case((gap > 0, excluded.last_day), else_=UserStreak.last_day),
+            "updated_at": excluded.updated_at,
+        }
+    )
+
+
+def replace_statement(dialect_name: str, rows: list):
+    """재계산한 상태로 기존 행을 덮어쓰는 INSERT ... ON CONFLICT 문"""
+    stmt = _insert(dialect_name).values(rows)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[UserStreak.user_id],
+        set_={
+            "current_streak": excluded.current_streak,
+            "best_streak": excluded.best_streak,
+            "last_day": excluded.last_day,
+            "updated_at": excluded.updated_at,
+        }
+    )
+
+
+def streak_rows(result) -> list:
+    """streak_islands_select 결과를 user_streaks 행으로 변환"""
+    now = datetime.utcnow()
+    return [
+        {
+            "user_id": row.user_id,
+            "current_streak": row.current_streak,
+            "best_streak": row.best_streak,
+            "last_day": row.last_day,
+            "updated_at": now,
+        }
+        for row in result
+    ]
+
+
+async def refresh_streaks(db: AsyncSession, user_ids: Iterable[int]):
+    """주어진 사용자들의 상태를 롤업에서 다시 계산 (커밋하지 않음)
+
+    롤업이 먼저 갱신된 뒤에 호출해야 한다.
+    """
+    dialect_name = db.bind.dialect.name
+    result = await db.execute(
+        streak_islands_select(dialect_name, UserDailyCarbon.user_id.in_(list(user_ids)))
+    )
+    rows = streak_rows(result)
+    if rows:
+        await db.execute(replace_statement(dialect_name, rows))
+
+
+async def record_meal_streak(db: AsyncSession, meal_log):
+    """식사 기록을 연속 기록 상태에 반영 (호출한 쪽 트랜잭션에 포함, 커밋하지 않음)
+
+    오늘 기록은 한 문장으로 전진시키고, 과거 날짜로 들어온 기록은
+    중간의 빈 날을 메울 수 있으므로 해당 사용자만 다시 계산한다.
+    """
+    day = kst_day(meal_log.logged_at)
+    if day >= kst_today():
+        await db.execute(advance_statement(db.bind.dialect.name, meal_log.user_id, day))
+    else:
+        await refresh_streaks(db, [meal_log.user_id])
+
+
+async def record_meals_streaks(db: AsyncSession, meals: Iterable):
+    """여러 사용자의 식사 기록을 한꺼번에 반영 (그룹 커밋용, 커밋하지 않음)
+
+    (사용자, 날짜) 마다 한 번만 전진시키고, 과거 날짜가 섞인 사용자는 다시 계산한다.
+    """
+    today = kst_today()
+    days = {(meal.user_id, kst_day(meal.logged_at)) for meal in meals}
+    stale_users = sorted({user_id for user_id, day in days if day < today})
+    dialect_name = db.bind.dialect.name
+    for user_id, day in sorted(days):
+        if user_id not in stale_users:
+            await db.execute(advance_statement(dialect_name, user_id, day))
+    if stale_users:
+        await refresh_streaks(db, stale_users)
+
+
+def current_streak_of(state: Optional[UserStreak], today: Optional[date] = None) -> int:
+    """오늘까지 이어진 연속 일수 (오늘 기록이 없으면 0)"""
+    today = today or kst_today()
+    if state is None or state.last_day != today:
+        return 0
+    return state.current_streak
+
+
+def best_streak_of(state: Optional[UserStreak]) -> int:
+    return state.best_streak if state is not None else 0
@@ -0,0 +1,38 @@
+import os
+import uuid
+
+# Point the app at a throwaway database before anything imports app.core.database
+os.environ["DATABASE_URL"] = "sqlite:///./test.db"
+
+import pytest
+
+from app.core.database import engine, Base
+from app.services.achievements import sync_badges
+from app.services.foods import sync_foods
+from app.tests.utils import client
+
+Base.metadata.drop_all(bind=engine)
+Base.metadata.create_all(bind=engine)
+with engine.begin() as connection:
+    sync_foods(connection)
+    sync_badges(connection)
+
+@pytest.fixture
+def test_user_token():
+    """테스트 사용자 생성 및 토큰 반환"""
+    # Register a fresh user per test so tests do not share history
+    register_data = {
+        "email": f"test-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "testpassword123",
+        "name": "Test User",
+        "dietary_preference": "omnivore"
+    }
+
+    response = client.post("/api/auth/register", json=register_data)
+    assert response.status_code == 200
+
+    return response.json()["access_token"]
+
+@pytest.fixture
+def auth_headers(test_user_token):
+    return {"Authorization": f"Bearer {test_user_token}"}
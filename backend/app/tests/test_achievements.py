@@ -0,0 +1,165 @@
+import asyncio
+from datetime import timedelta
+
+from sqlalchemy import func, select
+
+from app.api.swaps import AcceptSwapRequest, accept_swap_recommendation
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.jobs.rebuild_activity_counters import rebuild_activity_counters
+from app.models.badge import Badge, UserBadge
+from app.models.meal_log import MealLog
+from app.models.points_ledger import PointsLedgerEntry
+from app.models.recommended_swap import RecommendedSwap
+from app.models.user import User
+from app.models.user_activity_counter import UserActivityCounter
+from app.models.user_streak import UserStreak
+from app.services.carbon_rollup import kst_today
+from app.services.points_ledger import BADGE_AWARDED, SWAP_ACCEPTED
+from app.tests.utils import client, count_queries, current_user_id, log_meal
+
+def earned_badges(user_id):
+    with SessionLocal() as db:
+        return sorted(db.scalars(
+            select(Badge.badge_type).join(UserBadge).where(UserBadge.user_id == user_id)
+        ))
+
+def add_swaps(meal_id, reductions):
+    with SessionLocal() as db:
+        swaps = [
+            RecommendedSwap(meal_log_id=meal_id, original_food="불고기", recommended_food="두부", carbon_reduction=reduction, recommendation_message="-")
+            for reduction in reductions
+        ]
+        db.add_all(swaps)
+        db.commit()
+        return [swap.id for swap in swaps]
+
+def accept(headers, swap_id, accepted=True):
+    response = client.post("/api/swaps/accept", json={"swap_id": swap_id, "accepted": accepted}, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+class TestAchievementEngine:
+    """이벤트 기반 성취 엔진 테스트"""
+
+    def test_first_meal_badge_awarded_once(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+
+        log_meal(auth_headers)
+        log_meal(auth_headers, "불고기")
+
+        assert earned_badges(user_id) == ["first_meal"]
+        with SessionLocal() as db:
+            assert db.get(UserActivityCounter, user_id).meals_logged == 2
+        recent = client.get("/api/gamification/achievements/recent", headers=auth_headers).json()
+        assert [(item["title"], item["points"]) for item in recent] == [("첫 기록의 주인공", 100)]
+
+    def test_meal_event_does_not_scan_history(self, auth_headers):
+        """식사 이벤트 평가가 이력을 세거나 더하지 않는지 테스트"""
+
+        for _ in range(5):
+            log_meal(auth_headers)
+
+        with count_queries() as statements:
+            log_meal(auth_headers)
+
+        history_scans = [s for s in statements if "meal_logs" in s and ("count(" in s.lower() or "sum(" in s.lower())]
+        assert history_scans == []
+
+    def test_carbon_saver_crosses_threshold_on_swap(self, auth_headers):
+        """수락한 스왑의 감축량이 10kg 을 넘는 순간 배지가 나오고, 상태 변화가 없으면 세지 않는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        first, second = add_swaps(log_meal(auth_headers, "불고기"), [6.0, 5.0])
+
+        accepted_first = accept(auth_headers, first)
+        accept(auth_headers, first)
+        accepted_second = accept(auth_headers, second)
+
+        assert accepted_first["achievements"] == []
+        assert [badge["badge_type"] for badge in accepted_second["achievements"]] == ["carbon_saver"]
+        with SessionLocal() as db:
+            counters = db.get(UserActivityCounter, user_id)
+            assert (counters.swaps_accepted, counters.carbon_saved) == (2, 11.0)
+
+        accept(auth_headers, first, accepted=False)
+        with SessionLocal() as db:
+            counters = db.get(UserActivityCounter, user_id)
+            assert (counters.swaps_accepted, counters.carbon_saved) == (1, 5.0)
+        assert "carbon_saver" in earned_badges(user_id)
+
+    def test_concurrent_accepts_credit_once(self, auth_headers):
+        """같은 스왑을 동시에 수락해도 카운터와 원장에 한 번만 반영되는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        swap_id, = add_swaps(log_meal(auth_headers, "불고기"), [12.0])
+
+        async def accept_once():
+            async with AsyncSessionLocal() as db:
+                user = await db.get(User, user_id)
+                return await accept_swap_recommendation(AcceptSwapRequest(swap_id=swap_id, accepted=True), current_user=user, db=db)
+
+        async def race():
+            return await asyncio.gather(*[accept_once() for _ in range(5)])
+
+        results = asyncio.run(race())
+
+        assert sum(1 for result in results if result["achievements"]) == 1
+        with SessionLocal() as db:
+            counters = db.get(UserActivityCounter, user_id)
+            credited = db.scalar(select(func.count()).select_from(PointsLedgerEntry).where(
+                PointsLedgerEntry.user_id == user_id, PointsLedgerEntry.kind == SWAP_ACCEPTED
+            ))
+        assert (counters.swaps_accepted, counters.carbon_saved, credited) == (1, 12.0, 1)
+
+    def test_unaccepting_null_swap_is_a_no_op(self, auth_headers):
+        """accepted 가 NULL 인 스왑을 수락 취소해도 카운터를 줄이지 않는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        kept, unknown = add_swaps(log_meal(auth_headers, "불고기"), [4.0, 6.0])
+        accept(auth_headers, kept)
+        with SessionLocal() as db:
+            db.get(RecommendedSwap, unknown).accepted = None
+            db.commit()
+
+        result = accept(auth_headers, unknown, accepted=False)
+
+        assert result["achievements"] == []
+        with SessionLocal() as db:
+            counters = db.get(UserActivityCounter, user_id)
+            entries = db.scalar(select(func.count()).select_from(PointsLedgerEntry).where(
+                PointsLedgerEntry.user_id == user_id, PointsLedgerEntry.kind != BADGE_AWARDED, PointsLedgerEntry.ref_id == unknown
+            ))
+        assert (counters.swaps_accepted, counters.carbon_saved, entries) == (1, 4.0, 0)
+
+    def test_week_streak_awarded_when_streak_reaches_seven(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+        with SessionLocal() as db:
+            db.add(UserStreak(user_id=user_id, current_streak=6, best_streak=6, last_day=kst_today() - timedelta(days=1)))
+            db.commit()
+
+        log_meal(auth_headers)
+
+        assert earned_badges(user_id) == ["first_meal", "week_streak"]
+
+    def test_rebuild_job_restores_counters_and_missing_badges(self, auth_headers):
+        """이력으로 카운터를 다시 만들고 빠진 배지를 지급하는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        meal_id = log_meal(auth_headers, "불고기")
+        with SessionLocal() as db:
+            db.add(MealLog(user_id=user_id, food_name="라면", portion_size=1.0, meal_type="LUNCH", carbon_footprint=1.0))
+            db.query(UserBadge).filter(UserBadge.user_id == user_id).delete()
+            db.query(UserActivityCounter).filter(UserActivityCounter.user_id == user_id).delete()
+            db.commit()
+        with SessionLocal() as db:
+            for swap_id in add_swaps(meal_id, [4.0, 7.0]):
+                db.get(RecommendedSwap, swap_id).accepted = True
+            db.commit()
+
+        with SessionLocal() as db:
+            result = rebuild_activity_counters(db, user_id=user_id)
+            counters = db.get(UserActivityCounter, user_id)
+
+        assert result == {"users": 1, "badges": 2}
+        assert (counters.meals_logged, counters.swaps_accepted, counters.carbon_saved) == (2, 2, 11.0)
+        assert earned_badges(user_id) == ["carbon_saver", "first_meal"]
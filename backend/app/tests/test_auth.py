@@ -0,0 +1,113 @@
+import hashlib
+import jwt
+import uuid
+
+from app.core.auth_cache import AuthCache, auth_cache
+from app.core.database import SessionLocal
+from app.core.security import ALGORITHM, SECRET_KEY, create_access_token, verify_password
+from app.models.user import User
+from app.tests.utils import client, count_queries
+
+def register(password="testpassword123"):
+    email = f"test-{uuid.uuid4().hex[:12]}@example.com"
+    response = client.post("/api/auth/register", json={"email": email, "password": password, "name": "Test User"})
+    assert response.status_code == 200
+    return email
+
+class TestAuthFastPath:
+    """인증 캐시 테스트"""
+
+    def test_token_carries_user_id(self, test_user_token):
+        me = client.get("/api/auth/me", headers={"Authorization": f"Bearer {test_user_token}"})
+
+        payload = jwt.decode(test_user_token, SECRET_KEY, algorithms=[ALGORITHM])
+        assert payload["sub"] == str(me.json()["id"])
+
+    def test_warm_cache_skips_database(self, auth_headers):
+        """두 번째 요청부터 인증에 쿼리가 없는지 테스트"""
+
+        client.get("/api/auth/me", headers=auth_headers)
+        with count_queries() as statements:
+            response = client.get("/api/auth/me", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert statements == []
+
+    def test_profile_update_invalidates_cached_user(self, auth_headers):
+        """프로필 수정 직후 요청이 바뀐 값을 보는지 테스트"""
+
+        client.get("/api/auth/me", headers=auth_headers)
+        updated = client.patch("/api/auth/me", json={"name": "새 이름", "dietary_preference": "vegan"}, headers=auth_headers)
+        me = client.get("/api/auth/me", headers=auth_headers)
+
+        assert updated.status_code == 200
+        assert me.json()["name"] == "새 이름"
+        assert me.json()["dietary_preference"] == "vegan"
+        assert me.json()["target_carbon_reduction"] == 20.0
+
+    def test_legacy_email_token_still_accepted(self, auth_headers):
+        """sub 가 이메일인 기존 토큰도 같은 사용자로 인증되는지 테스트"""
+
+        me = client.get("/api/auth/me", headers=auth_headers).json()
+        legacy = create_access_token(data={"sub": me["email"]})
+
+        response = client.get("/api/auth/me", headers={"Authorization": f"Bearer {legacy}"})
+
+        assert response.json()["id"] == me["id"]
+
+    def test_invalid_and_unknown_tokens_are_rejected(self):
+        forged = jwt.encode({"sub": "1"}, "other-secret", algorithm=ALGORITHM)
+        unknown = create_access_token(data={"sub": f"nobody-{uuid.uuid4().hex}@example.com"})
+
+        assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {forged}"}).status_code == 401
+        assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {unknown}"}).status_code == 401
+        assert auth_cache.user_id_for(forged) is None
+
+    def test_generations_stay_bounded(self):
+        """무효화된 사용자가 많아도 세대 번호가 max_entries 만큼만 남고, 조회 중 무효화된 행은 저장하지 않는지 테스트"""
+
+        cache = AuthCache(ttl_seconds=60, max_entries=10)
+        user = User(id=1, email="a@example.com", password_hash="-", name="A")
+        generation = cache.generation(1)
+        for user_id in range(1, 1001):
+            cache.invalidate(user_id)
+        cache.set_user(user, generation)
+
+        assert len(cache._generations) == 10
+        assert cache.get_user(1) is None
+
+class TestPasswordHashing:
+    """비밀번호 해시 테스트"""
+
+    def test_new_passwords_use_scrypt(self):
+        email = register()
+
+        with SessionLocal() as db:
+            stored = db.query(User).filter(User.email == email).one().password_hash
+        assert stored.startswith("scrypt$")
+        assert verify_password("testpassword123", stored)
+        assert not verify_password("wrongpassword", stored)
+
+    def test_legacy_hash_is_upgraded_on_login(self):
+        """기존 SHA256 해시 계정이 로그인되고, 그때 scrypt 로 바뀌는지 테스트"""
+
+        email = register()
+        salt = "legacysalt"
+        with SessionLocal() as db:
+            user = db.query(User).filter(User.email == email).one()
+            user.password_hash = f"{hashlib.sha256(('legacy-password' + salt).encode()).hexdigest()}:{salt}"
+            db.commit()
+
+        wrong = client.post("/api/auth/login", json={"email": email, "password": "testpassword123"})
+        right = client.post("/api/auth/login", json={"email": email, "password": "legacy-password"})
+        again = client.post("/api/auth/login", json={"email": email, "password": "legacy-password"})
+
+        assert wrong.status_code == 401
+        assert right.status_code == 200 and again.status_code == 200
+        with SessionLocal() as db:
+            assert db.query(User).filter(User.email == email).one().password_hash.startswith("scrypt$")
+
+    def test_unknown_email_is_rejected(self):
+        response = client.post("/api/auth/login", json={"email": f"nobody-{uuid.uuid4().hex}@example.com", "password": "x"})
+
+        assert response.status_code == 401
@@ -0,0 +1,76 @@
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.jobs.rebuild_daily_carbon import rebuild_daily_carbon
+from app.models.user import User
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.services.carbon_rollup import kst_today
+from app.tests.utils import client, current_user_id
+
+def log_meals(headers, meals):
+    for food_name, portion_size in meals:
+        response = client.post("/api/meals/", json={
+            "food_name": food_name,
+            "portion_size": portion_size,
+            "meal_type": "lunch"
+        }, headers=headers)
+        assert response.status_code == 200
+
+class TestDailyCarbonRollup:
+    """일일 탄소 롤업 테스트"""
+    
+    def test_rollup_updated_on_meal_insert(self, auth_headers):
+        """식사 기록 시 롤업이 같은 요청에서 갱신되는지 테스트"""
+        
+        log_meals(auth_headers, [("김치찌개", 1.0), ("불고기", 1.0), ("라면", 1.0)])
+        user_id = current_user_id(auth_headers)
+        
+        with SessionLocal() as db:
+            row = db.get(UserDailyCarbon, (user_id, kst_today()))
+        
+        assert row.meal_count == 3
+        assert round(row.total_carbon, 2) == round(1.2 + 8.5 + 1.1, 2)
+        assert row.top_food == "불고기"
+        assert row.max_carbon == 8.5
+    
+    def test_summary_and_trends_served_from_rollup(self, auth_headers):
+        """일일 요약과 대시보드 트렌드가 롤업 값을 반환하는지 테스트"""
+        
+        log_meals(auth_headers, [("비빔밥", 1.0), ("갈비탕", 1.0)])
+        
+        summary = client.get("/api/footprint/daily-summary", headers=auth_headers).json()
+        assert summary == [{
+            "date": kst_today().strftime("%Y-%m-%d"),
+            "total_carbon": round(1.5 + 5.05, 2),
+            "meal_count": 2,
+            "top_contributor": "갈비탕"
+        }]
+        
+        dashboard = client.get("/api/dashboard/", headers=auth_headers).json()
+        assert dashboard["carbon_trends"] == [{
+            "date": kst_today().strftime("%Y-%m-%d"),
+            "carbon_amount": round(1.5 + 5.05, 2),
+            "meal_count": 2
+        }]
+        assert dashboard["stats"]["meals_logged_this_week"] == 2
+    
+    def test_rebuild_matches_incremental_rollup(self, auth_headers):
+        """재구축 결과가 증분 갱신 결과와 같은지 테스트"""
+        
+        log_meals(auth_headers, [("삼겹살", 1.0), ("된장찌개", 2.0), ("삼겹살", 0.5)])
+        user_id = current_user_id(auth_headers)
+        
+        def snapshot():
+            with SessionLocal() as db:
+                rows = db.scalars(select(UserDailyCarbon).where(UserDailyCarbon.user_id == user_id)).all()
+                return [(r.day, round(r.total_carbon, 6), r.meal_count, r.top_food, r.max_carbon) for r in rows]
+        
+        incremental = snapshot()
+        
+        with SessionLocal() as db:
+            db.query(UserDailyCarbon).filter(UserDailyCarbon.user_id == user_id).delete()
+            db.commit()
+            result = rebuild_daily_carbon(db, chunk_size=2)
+        
+        assert result["users"] >= 1
+        assert snapshot() == incremental
@@ -0,0 +1,145 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.models.challenge import Challenge, ChallengeStatus, ChallengeType, UserChallenge
+from app.models.user_activity_counter import UserActivityCounter
+from app.services.challenge_progress import add_progress
+from app.tests.utils import client, count_queries, current_user_id, log_meal
+from app.tests.test_achievements import accept, add_swaps, earned_badges
+
+def join(headers, challenge_type, target_value):
+    with SessionLocal() as db:
+        challenge = Challenge(name=f"{challenge_type.value} 도전", description="-", challenge_type=challenge_type, target_value=target_value)
+        db.add(challenge)
+        db.commit()
+        challenge_id = challenge.id
+    response = client.post("/api/challenges/join", json={"challenge_id": challenge_id}, headers=headers)
+    assert response.status_code == 200
+    return challenge_id
+
+def progress(user_id):
+    with SessionLocal() as db:
+        return {
+            row.challenge_type: (row.current_progress, row.completed, row.status)
+            for row in db.execute(
+                select(Challenge.challenge_type, UserChallenge.current_progress, UserChallenge.completed, UserChallenge.status)
+                .join(Challenge).where(UserChallenge.user_id == user_id)
+            )
+        }
+
+class TestChallengeProgress:
+    """챌린지 진행도 자동 평가 테스트"""
+
+    def test_meals_advance_logging_and_weekly_goal(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+        join(auth_headers, ChallengeType.MEAL_LOGGING, 3)
+        join(auth_headers, ChallengeType.WEEKLY_GOAL, 7)
+        join(auth_headers, ChallengeType.SWAP_ACCEPTANCE, 2)
+
+        log_meal(auth_headers)
+        log_meal(auth_headers, "불고기")
+
+        assert progress(user_id) == {
+            ChallengeType.MEAL_LOGGING: (2, False, ChallengeStatus.IN_PROGRESS),
+            ChallengeType.WEEKLY_GOAL: (1, False, ChallengeStatus.IN_PROGRESS),
+            ChallengeType.SWAP_ACCEPTANCE: (0, False, ChallengeStatus.NOT_STARTED),
+        }
+
+    def test_meal_event_updates_challenges_in_one_statement(self, auth_headers):
+        """챌린지 수와 관계없이 식사 한 건에 user_challenges UPDATE 한 문장인지 테스트"""
+
+        for target in (5, 10, 20):
+            join(auth_headers, ChallengeType.MEAL_LOGGING, target)
+
+        with count_queries() as statements:
+            log_meal(auth_headers)
+
+        challenge_statements = [s for s in statements if "user_challenges" in s]
+        assert len(challenge_statements) == 1
+        assert challenge_statements[0].lstrip().upper().startswith("UPDATE")
+
+    def test_completion_caps_progress_and_counts(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+        join(auth_headers, ChallengeType.MEAL_LOGGING, 2)
+
+        for _ in range(3):
+            log_meal(auth_headers)
+
+        assert progress(user_id)[ChallengeType.MEAL_LOGGING] == (2, True, ChallengeStatus.COMPLETED)
+        with SessionLocal() as db:
+            assert db.get(UserActivityCounter, user_id).challenges_completed == 1
+
+    def test_swaps_advance_swap_and_carbon_challenges(self, auth_headers):
+        """스왑 수락은 스왑/탄소 챌린지를 올리고 수락 취소는 되돌리는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        join(auth_headers, ChallengeType.SWAP_ACCEPTANCE, 3)
+        join(auth_headers, ChallengeType.CARBON_REDUCTION, 5)
+        first, second = add_swaps(log_meal(auth_headers, "불고기"), [1.6, 2.5])
+
+        accept(auth_headers, first)
+        accept(auth_headers, second)
+        accepted = progress(user_id)
+        accept(auth_headers, second, accepted=False)
+
+        assert accepted[ChallengeType.SWAP_ACCEPTANCE][0] == 2
+        assert accepted[ChallengeType.CARBON_REDUCTION][0] == 4  # 4.1kg
+        assert progress(user_id)[ChallengeType.SWAP_ACCEPTANCE][0] == 1
+        assert progress(user_id)[ChallengeType.CARBON_REDUCTION][0] == 1  # 1.6kg
+
+    def test_fifth_completion_awards_challenge_master(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+        for _ in range(5):
+            join(auth_headers, ChallengeType.MEAL_LOGGING, 1)
+
+        log_meal(auth_headers)
+
+        assert "challenge_master" in earned_badges(user_id)
+        with SessionLocal() as db:
+            assert db.get(UserActivityCounter, user_id).challenges_completed == 5
+
+def patch_progress(headers, challenge_id, value):
+    return client.patch("/api/challenges/update-progress", json={"challenge_id": challenge_id, "progress_value": value}, headers=headers)
+
+async def atomic_increment(user_id, challenge_id, amount):
+    async with AsyncSessionLocal() as db:
+        await add_progress(db, user_id, challenge_id, amount)
+        await db.commit()
+
+def run_parallel(user_id, challenge_id, count):
+    async def run_all():
+        await asyncio.gather(*[atomic_increment(user_id, challenge_id, 1) for _ in range(count)])
+    asyncio.run(run_all())
+
+class TestAtomicProgress:
+    """수동 진행도 업데이트의 원자적 증가 테스트"""
+
+    def test_patch_completes_in_single_statement(self, auth_headers):
+        """진행도 갱신이 UPDATE 한 문장이고 challenges 를 따로 읽지 않는지 테스트"""
+
+        challenge_id = join(auth_headers, ChallengeType.CARBON_REDUCTION, 5)
+
+        with count_queries() as statements:
+            partial = patch_progress(auth_headers, challenge_id, 4)
+        completed = patch_progress(auth_headers, challenge_id, 4).json()
+        after = patch_progress(auth_headers, challenge_id, 1)
+
+        assert partial.json()["message"] == "진행률: 80.0% (4/5)"
+        assert (completed["completed"], completed["current_progress"], completed["target_value"]) == (True, 5, 5)
+        assert completed["message"] == "축하합니다! 'carbon_reduction 도전' 챌린지를 완료했습니다! 🎉"
+        assert after.status_code == 404
+        challenge_statements = [s for s in statements if "user_challenges" in s or "FROM challenges" in s]
+        assert len(challenge_statements) == 1
+        assert challenge_statements[0].lstrip().upper().startswith("UPDATE")
+
+    def test_parallel_increments_are_not_lost(self, auth_headers):
+        """동시에 20번 더해도 증가분을 잃지 않는지 테스트 (예전 방식과의 비교는 benchmarks/challenge_progress_bench.py)"""
+
+        user_id = current_user_id(auth_headers)
+        challenge_id = join(auth_headers, ChallengeType.MEAL_LOGGING, 1000)
+
+        run_parallel(user_id, challenge_id, 20)
+
+        assert progress(user_id)[ChallengeType.MEAL_LOGGING][0] == 20
@@ -0,0 +1,200 @@
+from app.core.cache import UserResponseCache
+from app.core.database import SessionLocal
+from app.models.challenge import Challenge, ChallengeType, UserChallenge
+from app.models.meal_log import MealLog
+from app.models.recommended_swap import RecommendedSwap
+from app.services.data_version import bump_statement
+from app.tests.utils import client, count_queries, current_user_id
+
+def log_meals(headers, meals):
+    for food_name, portion_size in meals:
+        response = client.post("/api/meals/", json={
+            "food_name": food_name,
+            "portion_size": portion_size,
+            "meal_type": "dinner"
+        }, headers=headers)
+        assert response.status_code == 200
+
+def seed_activity(user_id):
+    """수락/미수락 스왑과 진행 중/완료 챌린지 추가"""
+    with SessionLocal() as db:
+        meal = db.query(MealLog).filter(MealLog.user_id == user_id).first()
+        db.add_all([
+            RecommendedSwap(meal_log_id=meal.id, original_food="불고기", recommended_food="두부조림", carbon_reduction=6.5, recommendation_message="-", accepted=True),
+            RecommendedSwap(meal_log_id=meal.id, original_food="불고기", recommended_food="비빔밥", carbon_reduction=5.0, recommendation_message="-", accepted=True),
+            RecommendedSwap(meal_log_id=meal.id, original_food="불고기", recommended_food="나물", carbon_reduction=7.0, recommendation_message="-", accepted=False),
+        ])
+        challenge = Challenge(name="채식 주간", description="-", challenge_type=ChallengeType.MEAL_LOGGING, target_value=7)
+        db.add(challenge)
+        db.flush()
+        db.add_all([
+            UserChallenge(user_id=user_id, challenge_id=challenge.id, completed=False),
+            UserChallenge(user_id=user_id, challenge_id=challenge.id, completed=False),
+            UserChallenge(user_id=user_id, challenge_id=challenge.id, completed=True),
+        ])
+        db.commit()
+
+class TestDashboard:
+    """대시보드 테스트"""
+    
+    def test_dashboard_stats_and_contributors(self, auth_headers):
+        """통계와 상위 기여 음식이 기대값과 일치하는지 테스트"""
+        
+        log_meals(auth_headers, [("불고기", 1.0), ("불고기", 1.0), ("김치찌개", 1.0), ("라면", 1.0)])
+        user_id = current_user_id(auth_headers)
+        seed_activity(user_id)
+        
+        data = client.get("/api/dashboard/", headers=auth_headers).json()
+        stats = data["stats"]
+        
+        assert stats["total_carbon_this_week"] == round(8.5 * 2 + 1.2 + 1.1, 2)
+        assert stats["meals_logged_this_week"] == 4
+        assert stats["carbon_reduction_achieved"] == 11.5
+        assert stats["swaps_accepted"] == 2
+        assert stats["active_challenges"] == 2
+        assert stats["completed_challenges"] == 1
+        assert data["top_contributors"] == [
+            {"food_name": "불고기", "total_carbon": 17.0, "frequency": 2},
+            {"food_name": "김치찌개", "total_carbon": 1.2, "frequency": 1},
+            {"food_name": "라면", "total_carbon": 1.1, "frequency": 1},
+        ]
+    
+    def test_contributors_group_by_food(self, auth_headers):
+        """같은 음식으로 해석되는 이름은 합쳐지고, 해석되지 않는 음식은 입력 이름으로 묶이는지 테스트"""
+        
+        log_meals(auth_headers, [("김치찌개", 1.0), ("엄마표 김치찌개", 1.0), ("우주 음식", 100.0), ("우주 음식", 100.0)])
+        
+        data = client.get("/api/dashboard/", headers=auth_headers).json()
+        
+        assert data["top_contributors"] == [
+            {"food_name": "김치찌개", "total_carbon": 2.4, "frequency": 2},
+            {"food_name": "우주 음식", "total_carbon": 1.0, "frequency": 2},
+        ]
+    
+    def test_dashboard_empty_user(self, auth_headers):
+        """기록이 없는 사용자도 0 값으로 응답하는지 테스트"""
+        
+        data = client.get("/api/dashboard/", headers=auth_headers).json()
+        
+        assert data["stats"]["total_carbon_this_week"] == 0
+        assert data["stats"]["swaps_accepted"] == 0
+        assert data["stats"]["active_challenges"] == 0
+        assert data["carbon_trends"] == []
+        assert data["top_contributors"] == []
+    
+    def test_dashboard_query_budget(self, auth_headers):
+        """대시보드가 인증/ETag 버전 조회 외에 2문장 안에 끝나는지 테스트"""
+        
+        log_meals(auth_headers, [("불고기", 1.0), ("비빔밥", 1.0)])
+        
+        with count_queries() as statements:
+            response = client.get("/api/dashboard/", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert len(statements) <= 4
+
+class TestDashboardCache:
+    """대시보드 캐시 테스트"""
+    
+    def test_second_request_served_from_cache(self, auth_headers):
+        """두 번째 요청이 쿼리 없이 캐시에서 응답되는지 테스트"""
+        
+        log_meals(auth_headers, [("불고기", 1.0)])
+        
+        first = client.get("/api/dashboard/", headers=auth_headers)
+        with count_queries() as statements:
+            second = client.get("/api/dashboard/", headers=auth_headers)
+        
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        # 인증은 캐시에서, ETag 버전 조회만 남음
+        assert len(statements) <= 1
+    
+    def test_meal_insert_invalidates_cache(self, auth_headers):
+        """식사 기록 후 대시보드가 다시 계산되는지 테스트"""
+        
+        log_meals(auth_headers, [("불고기", 1.0)])
+        client.get("/api/dashboard/", headers=auth_headers)
+        
+        log_meals(auth_headers, [("김치찌개", 1.0)])
+        response = client.get("/api/dashboard/", headers=auth_headers)
+        
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.json()["stats"]["meals_logged_this_week"] == 2
+    
+    def test_version_bump_outside_request_skips_cached_body(self, auth_headers):
+        """다른 워커나 배치 작업이 데이터 버전을 올리면 이 워커의 캐시 본문을 새 ETag 로 주지 않는지 테스트"""
+        
+        log_meals(auth_headers, [("불고기", 1.0)])
+        user_id = current_user_id(auth_headers)
+        client.get("/api/dashboard/", headers=auth_headers)
+        cached = client.get("/api/dashboard/", headers=auth_headers)
+        
+        # invalidate() 를 부를 수 없는 경로 (배치 작업 등) 의 변경
+        with SessionLocal() as db:
+            meal = db.query(MealLog).filter(MealLog.user_id == user_id).first()
+            db.add(RecommendedSwap(meal_log_id=meal.id, original_food="불고기", recommended_food="두부조림", carbon_reduction=6.5, recommendation_message="-", accepted=True))
+            db.execute(bump_statement(db.bind.dialect.name, user_id))
+            db.commit()
+        response = client.get("/api/dashboard/", headers={**auth_headers, "If-None-Match": cached.headers["ETag"]})
+        
+        assert cached.headers["X-Cache"] == "HIT"
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "MISS"
+        assert response.headers["ETag"] != cached.headers["ETag"]
+        assert response.json()["stats"]["carbon_reduction_achieved"] == 6.5
+    
+    def test_bypass_header(self, auth_headers):
+        """X-Cache-Bypass 헤더가 캐시를 우회하는지 테스트"""
+        
+        client.get("/api/dashboard/", headers=auth_headers)
+        response = client.get("/api/dashboard/", headers={**auth_headers, "X-Cache-Bypass": "1"})
+        
+        assert response.status_code == 200
+        assert response.headers["X-Cache"] == "BYPASS"
+    
+    def test_cache_stats(self, auth_headers, monkeypatch):
+        """적중/미스 카운터 조회 테스트 (관리자 토큰 필요)"""
+        
+        monkeypatch.setenv("ADMIN_TOKEN", "secret-token")
+        admin_headers = {"X-Admin-Token": "secret-token"}
+        
+        denied = client.get("/api/dashboard/cache-stats", headers=auth_headers)
+        before = client.get("/api/dashboard/cache-stats", headers=admin_headers).json()
+        client.get("/api/dashboard/", headers=auth_headers)
+        client.get("/api/dashboard/", headers=auth_headers)
+        after = client.get("/api/dashboard/cache-stats", headers=admin_headers).json()
+        
+        assert denied.status_code == 403
+        assert after["misses"] == before["misses"] + 1
+        assert after["hits"] == before["hits"] + 1
+    
+    def test_stale_result_not_stored_after_invalidation(self):
+        """계산 중 무효화되면 결과를 저장하지 않는지 테스트"""
+        
+        cache = UserResponseCache("test", ttl_seconds=60)
+        generation = cache.generation(1)
+        cache.invalidate(1)
+        cache.set(1, b"stale", generation)
+        
+        assert cache.get(1) is None
+        
+        cache.set(1, b"fresh", cache.generation(1))
+        assert cache.get(1) == b"fresh"
+        assert cache.get(1, "other-day") is None
+    
+    def test_generations_stay_bounded(self):
+        """무효화된 사용자가 많아도 세대 번호가 max_entries 만큼만 남고, 밀려난 뒤에도 오래된 결과를 저장하지 않는지 테스트"""
+        
+        cache = UserResponseCache("test", ttl_seconds=60, max_entries=10)
+        generation = cache.generation(1)
+        for user_id in range(1, 1001):
+            cache.invalidate(user_id)
+        cache.set(1, b"stale", generation)
+        
+        assert len(cache._generations) == 10
+        assert cache.get(1) is None
+        
+        cache.set(1, b"fresh", cache.generation(1))
+        assert cache.get(1) == b"fresh"
@@ -0,0 +1,75 @@
+import uuid
+
+from app.core.etag import etag_matches, make_etag
+from app.tests.utils import client, count_queries, log_meal
+
+class TestConditionalGet:
+    """ETag / If-None-Match 테스트"""
+    
+    def test_unchanged_data_returns_304(self, auth_headers):
+        """데이터가 그대로면 304 를 집계 쿼리 없이 반환하는지 테스트"""
+        
+        log_meal(auth_headers)
+        
+        for path in ("/api/dashboard/", "/api/footprint/daily-summary", "/api/meals/"):
+            first = client.get(path, headers=auth_headers)
+            etag = first.headers["ETag"]
+            
+            with count_queries() as statements:
+                second = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+            
+            assert second.status_code == 304, path
+            assert second.headers["ETag"] == etag
+            assert second.content == b""
+            # 인증 사용자 조회 + 버전 조회
+            assert len(statements) <= 2
+    
+    def test_meal_insert_changes_etag(self, auth_headers):
+        """식사 기록 후에는 이전 ETag 로 200 과 새 데이터를 받는지 테스트"""
+        
+        log_meal(auth_headers)
+        etag = client.get("/api/meals/", headers=auth_headers).headers["ETag"]
+        
+        log_meal(auth_headers, "불고기")
+        response = client.get("/api/meals/", headers={**auth_headers, "If-None-Match": etag})
+        
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert len(response.json()["items"]) == 2
+    
+    def test_etag_depends_on_query_parameters(self, auth_headers):
+        """같은 데이터라도 파라미터가 다르면 ETag 가 다른지 테스트"""
+        
+        week = client.get("/api/footprint/daily-summary?days=7", headers=auth_headers)
+        month = client.get(
+            "/api/footprint/daily-summary?days=30",
+            headers={**auth_headers, "If-None-Match": week.headers["ETag"]}
+        )
+        
+        assert month.status_code == 200
+        assert month.headers["ETag"] != week.headers["ETag"]
+    
+    def test_etag_is_per_user(self, auth_headers):
+        """다른 사용자의 ETag 로는 304 를 받지 않는지 테스트"""
+        
+        other = client.post("/api/auth/register", json={
+            "email": f"other-{uuid.uuid4().hex[:12]}@example.com",
+            "password": "testpassword123",
+            "name": "Other User"
+        })
+        other_headers = {"Authorization": f"Bearer {other.json()['access_token']}"}
+        etag = client.get("/api/meals/", headers=auth_headers).headers["ETag"]
+        response = client.get("/api/meals/", headers={**other_headers, "If-None-Match": etag})
+        
+        assert response.status_code == 200
+    
+    def test_if_none_match_parsing(self):
+        """If-None-Match 목록 / 약한 비교 / * 처리 테스트"""
+        
+        etag = make_etag(1, 2, "meals")
+        
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", {etag.removeprefix("W/")}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches('"other"', etag)
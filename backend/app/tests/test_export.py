@@ -0,0 +1,93 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from app.core.database import SessionLocal
+from app.models.activity_log import ActivityLog, ActivityType
+from app.models.badge import Badge, UserBadge
+from app.models.challenge import Challenge, ChallengeType, UserChallenge
+from app.models.meal_log import MealLog, MealType
+from app.models.recommended_swap import RecommendedSwap
+from app.services import data_export
+from app.tests.utils import client, current_user_id
+
+def seed_account(user_id, meals):
+    """식사, 추천 대체, 활동, 챌린지, 배지 기록 추가"""
+    with SessionLocal() as db:
+        meal_logs = [
+            MealLog(user_id=user_id, food_name=f"음식{n}", portion_size=100.0, meal_type=MealType.LUNCH, carbon_footprint=1.5, logged_at=datetime(2024, 1, 1) + timedelta(hours=n))
+            for n in range(meals)
+        ]
+        db.add_all(meal_logs)
+        db.flush()
+        db.add_all([
+            RecommendedSwap(meal_log_id=meal.id, original_food=meal.food_name, recommended_food="두부", carbon_reduction=0.5, recommendation_message="-", accepted=True)
+            for meal in meal_logs[:3]
+        ])
+        db.add(ActivityLog(user_id=user_id, activity_type=ActivityType.ENERGY, energy_usage=12.0, carbon_footprint=5.4))
+        challenge = Challenge(name="기록 챌린지", description="-", challenge_type=ChallengeType.MEAL_LOGGING, target_value=7)
+        badge = Badge(name="첫 기록", description="-", icon_url="-", achievement_criteria="-")
+        db.add_all([challenge, badge])
+        db.flush()
+        db.add(UserChallenge(user_id=user_id, challenge_id=challenge.id, current_progress=2))
+        db.add(UserBadge(user_id=user_id, badge_id=badge.id))
+        db.commit()
+
+def read_export(headers):
+    response = client.get("/api/export", headers=headers)
+    assert response.status_code == 200
+    return response, [json.loads(line) for line in response.text.splitlines()]
+
+class TestAccountExport:
+    """계정 데이터 내보내기 테스트"""
+    
+    def test_export_contains_every_table(self, auth_headers, monkeypatch):
+        """모든 테이블의 행이 빠짐없이, 여러 배치에 걸쳐 한 번씩 나오는지 테스트"""
+        
+        monkeypatch.setattr(data_export, "BATCH_ROWS", 4)
+        user_id = current_user_id(auth_headers)
+        seed_account(user_id, 10)
+        
+        response, lines = read_export(auth_headers)
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert "attachment" in response.headers["content-disposition"]
+        
+        assert lines[0]["table"] == "export"
+        assert lines[0]["row"]["user_id"] == user_id
+        assert lines[-1]["table"] == "summary"
+        
+        counts = lines[-1]["row"]["counts"]
+        assert counts == {"meal_logs": 10, "recommended_swaps": 3, "activity_logs": 1, "user_challenges": 1, "user_badges": 1}
+        
+        meal_ids = [line["row"]["id"] for line in lines if line["table"] == "meal_logs"]
+        assert len(set(meal_ids)) == 10
+        assert meal_ids == sorted(meal_ids)
+        
+        meal = next(line["row"] for line in lines if line["table"] == "meal_logs")
+        assert meal["meal_type"] == "lunch"
+        assert meal["logged_at"] == "2024-01-01T00:00:00"
+    
+    def test_export_is_scoped_to_user(self, auth_headers):
+        """다른 사용자의 기록과 비밀번호 해시가 나오지 않는지 테스트"""
+        
+        other = client.post("/api/auth/register", json={
+            "email": f"other-{uuid.uuid4().hex[:12]}@example.com",
+            "password": "testpassword123",
+            "name": "Other User"
+        })
+        other_headers = {"Authorization": f"Bearer {other.json()['access_token']}"}
+        seed_account(current_user_id(other_headers), 5)
+        
+        _, lines = read_export(auth_headers)
+        profile = next(line["row"] for line in lines if line["table"] == "users")
+        
+        assert "password_hash" not in profile
+        assert profile["id"] == current_user_id(auth_headers)
+        assert lines[-1]["row"]["counts"]["meal_logs"] == 0
+        assert lines[-1]["row"]["counts"]["recommended_swaps"] == 0
+    
+    def test_export_requires_auth(self):
+        """인증 없이 요청하면 거부되는지 테스트"""
+        
+        response = client.get("/api/export")
+        assert response.status_code in (401, 403)
@@ -0,0 +1,132 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import SessionLocal, engine
+from app.data.factor_dataset import DEFAULT_PATH, FactorDataset, activate_dataset, current_dataset
+from app.data.korean_emission_factors import get_electricity_co2
+from app.models.activity_log import ActivityLog
+from app.models.food import Food
+from app.models.meal_log import MealLog
+from app.services.factor_reload import reload_factors
+from app.services.foods import sync_foods
+from app.tests.utils import client, current_user_id
+
+def load_raw():
+    with open(DEFAULT_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.fixture
+def next_dataset(tmp_path):
+    """계수를 바꾼 다음 버전 파일 (테스트가 끝나면 원래 데이터셋으로 되돌림)"""
+    original = current_dataset()
+    raw = load_raw()
+    raw["version"] = "2025.1-test"
+    raw["electricity_kg_per_kwh"] = 0.5
+    raw["foods_kg_per_serving"]["김치찌개"] = 2.0
+    raw["foods_kg_per_serving"]["테스트비빔국수"] = 0.7
+    path = tmp_path / "emission_factors.json"
+    path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+    yield path
+    with engine.begin() as connection:
+        sync_foods(connection, original)
+    activate_dataset(original)
+
+class TestFactorDataset:
+    """버전 있는 배출계수 데이터셋 테스트"""
+
+    def test_dataset_is_read_only(self):
+        """컴파일된 데이터셋은 속성도 매핑도 바꿀 수 없는지 테스트"""
+
+        dataset = current_dataset()
+
+        with pytest.raises(AttributeError):
+            dataset.version = "other"
+        with pytest.raises(TypeError):
+            dataset.foods["김치찌개"] = 0.0
+        assert dataset.version == load_raw()["version"]
+
+    def test_invalid_dataset_is_rejected(self, tmp_path):
+        """잘못된 파일은 ValueError 이고 활성 데이터셋이 그대로인지 테스트"""
+
+        active = current_dataset()
+        raw = load_raw()
+        raw["transport_kg_per_km"]["subway"] = -1
+        path = tmp_path / "broken.json"
+        path.write_text(json.dumps(raw), encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            reload_factors(path)
+        with pytest.raises(ValueError):
+            FactorDataset({**load_raw(), "version": ""})
+        assert current_dataset() is active
+
+    def test_reload_keeps_snapshots_and_records_new_version(self, auth_headers, next_dataset):
+        """재적재 전에 잡은 스냅샷은 이전 계수, 이후 요청은 새 계수와 버전으로 기록되는지 테스트"""
+
+        before = current_dataset()
+
+        result = reload_factors(next_dataset)
+
+        assert result["previous_version"] == before.version
+        assert result["version"] == "2025.1-test"
+        assert get_electricity_co2(100, before) == pytest.approx(45.41)
+        assert get_electricity_co2(100) == pytest.approx(50.0)
+
+        meal = client.post("/api/meals/", json={"food_name": "김치찌개", "portion_size": 1.0, "meal_type": "lunch"}, headers=auth_headers)
+        new_food = client.post("/api/meals/", json={"food_name": "테스트비빔국수", "portion_size": 1.0, "meal_type": "dinner"}, headers=auth_headers)
+
+        assert meal.json()["carbon_footprint"] == pytest.approx(2.0)
+        assert meal.json()["factor_version"] == "2025.1-test"
+        with SessionLocal() as db:
+            row = db.get(MealLog, new_food.json()["id"])
+            food = db.scalar(select(Food).where(Food.name == "테스트비빔국수"))
+            assert row.factor_version == "2025.1-test"
+            assert food is not None and row.food_id == food.id
+
+    def test_activity_logs_record_factor_version(self, auth_headers):
+        """에너지/교통 기록에 계산한 데이터셋 버전이 남는지 테스트"""
+
+        version = current_dataset().version
+        energy = client.post("/api/energy/calculate", json={"electricity_kwh": 100}, headers=auth_headers)
+        transport = client.post("/api/transport/calculate", json={"transport_type": "subway", "distance_km": 10}, headers=auth_headers)
+
+        assert energy.json()["factor_version"] == transport.json()["factor_version"] == version
+        user_id = current_user_id(auth_headers)
+        with SessionLocal() as db:
+            versions = db.scalars(select(ActivityLog.factor_version).where(ActivityLog.user_id == user_id)).all()
+        assert versions == [version, version]
+
+class TestAdminReload:
+    """관리자 재적재 엔드포인트 테스트"""
+
+    def test_disabled_without_admin_token(self, monkeypatch):
+        monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+
+        assert client.post("/api/admin/factors/reload").status_code == 404
+
+    def test_reload_requires_token(self, monkeypatch, next_dataset):
+        monkeypatch.setenv("ADMIN_TOKEN", "secret-token")
+        monkeypatch.setenv("EMISSION_FACTORS_PATH", str(next_dataset))
+
+        denied = client.post("/api/admin/factors/reload", headers={"X-Admin-Token": "wrong"})
+        reloaded = client.post("/api/admin/factors/reload", headers={"X-Admin-Token": "secret-token"})
+        active = client.get("/api/admin/factors", headers={"X-Admin-Token": "secret-token"})
+
+        assert denied.status_code == 403
+        assert reloaded.status_code == 200
+        assert reloaded.json()["version"] == "2025.1-test"
+        assert active.json()["version"] == "2025.1-test"
+
+    def test_broken_file_returns_422(self, monkeypatch, tmp_path):
+        path = tmp_path / "broken.json"
+        path.write_text("{", encoding="utf-8")
+        monkeypatch.setenv("ADMIN_TOKEN", "secret-token")
+        monkeypatch.setenv("EMISSION_FACTORS_PATH", str(path))
+        active = current_dataset()
+
+        response = client.post("/api/admin/factors/reload", headers={"X-Admin-Token": "secret-token"})
+
+        assert response.status_code == 422
+        assert current_dataset() is active
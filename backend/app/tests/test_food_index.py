@@ -0,0 +1,51 @@
+import random
+
+from app.data.food_index import FoodResolver, KeywordMatcher
+from app.data.korean_food_carbon import KOREAN_FOOD_CARBON_DB
+
+class TestKeywordMatcher:
+    """Aho-Corasick 매처 테스트"""
+    
+    def test_first_follows_declaration_order(self):
+        matcher = KeywordMatcher(["소", "돼지", "고기", "갈비"])
+        
+        assert matcher.first("돼지갈비") == "돼지"
+        assert matcher.first("소갈비") == "소"
+        assert matcher.first("두부") is None
+        assert matcher.find_all("돼지고기 갈비") == ["돼지", "고기", "갈비"]
+    
+    def test_overlapping_patterns(self):
+        matcher = KeywordMatcher(["he", "she", "his", "hers"])
+        
+        assert matcher.find_all("ushers") == ["he", "she", "hers"]
+
+class TestFoodResolver:
+    """음식명 인덱스가 기존 선형 탐색과 같은 결과를 내는지 검증"""
+    
+    resolver = FoodResolver(KOREAN_FOOD_CARBON_DB)
+    
+    def test_exact_lookup(self):
+        assert self.resolver.lookup("김치찌개") == 1.2
+        assert self.resolver.lookup("없는음식") is None
+    
+    def test_matches_linear_scan(self):
+        rng = random.Random(0)
+        alphabet = "갈비탕국밥찌개김치닭고기소불된장라면LA"
+        
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 8)))
+            
+            expected_partial = next(
+                (key for key in KOREAN_FOOD_CARBON_DB if text in key or key in text), None
+            )
+            expected_similar = sorted(
+                (key for key in KOREAN_FOOD_CARBON_DB if text.lower() in key.lower()),
+                key=lambda key: KOREAN_FOOD_CARBON_DB[key]
+            )
+            
+            assert self.resolver.find_partial(text) == expected_partial
+            assert self.resolver.search_similar(text) == expected_similar
+    
+    def test_case_insensitive_similar_search(self):
+        assert self.resolver.search_similar("la갈비") == ["LA갈비"]
+        assert self.resolver.find_partial("la갈비") == "갈비"
@@ -1,51 +1,10 @@
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from datetime import datetime, timedelta
 
-from app.main import app
-from app.core.database import get_db, Base
-from app.models.user import User, DietaryPreference
-from app.core.security import get_password_hash
-
-# Test database setup
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base.metadata.create_all(bind=engine)
-
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-app.dependency_overrides[get_db] = override_get_db
-
-client = TestClient(app)
-
-@pytest.fixture
-def test_user_token():
-    """테스트 사용자 생성 및 토큰 반환"""
-    # Register test user
-    register_data = {
-        "email": "test@example.com",
-        "password": "testpassword123",
-        "name": "Test User",
-        "dietary_preference": "omnivore"
-    }
-    
-    response = client.post("/api/auth/register", json=register_data)
-    assert response.status_code == 200
-    
-    return response.json()["access_token"]
+from app.core.database import SessionLocal
+from app.jobs.rebuild_daily_carbon import rebuild_daily_carbon
+from app.models.meal_log import MealLog, MealType
+from app.tests.utils import client, count_queries, current_user_id
 
 class TestCarbonFootprintCalculation:
     """탄소 발자국 계산 API 테스트"""
@@ -110,9 +69,9 @@ class TestCarbonFootprintCalculation:
         assert response.status_code == 200
         data = response.json()
         
-        assert data["carbon_footprint"] == 0.08  # 100g * 0.08 kg/100g = 0.08
+        assert data["carbon_footprint"] == 0.5  # 계수 없음 -> 기본값: 100g * 0.5 kg/100g = 0.5
         assert data["category"] == "채소"
-        assert data["sustainability_rating"] == "HIGH"  # 0.08 < 0.5이므로 HIGH
+        assert data["sustainability_rating"] == "MEDIUM"  # 0.5 < 1.5이므로 MEDIUM
     
     def test_calculate_carbon_footprint_unknown_food(self, test_user_token):
         """알 수 없는 음식 탄소 발자국 계산 테스트"""
@@ -185,6 +144,48 @@ class TestCarbonFootprintCalculation:
         response = client.post("/api/footprint/calculate", json=payload, headers=headers)
         assert response.status_code == 401  # Unauthorized
 
+class TestBatchCarbonCalculation:
+    """탄소 발자국 일괄 계산 API 테스트"""
+    
+    def test_batch_matches_single_endpoint(self, test_user_token):
+        """일괄 계산 결과가 단건 계산과 같고 입력 순서를 유지하는지 테스트"""
+        
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        items = [
+            {"food_name": "김치찌개", "portion_size": 250.0},
+            {"food_name": "찌개", "portion_size": 200.0},
+            {"food_name": "소고기", "portion_size": 150.0},
+            {"food_name": "알 수 없는 음식", "portion_size": 100.0},
+            {"food_name": "김치찌개", "portion_size": 50.0},
+        ]
+        
+        response = client.post("/api/footprint/calculate-batch", json={"items": items}, headers=headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert [item["food_name"] for item in data["items"]] == [item["food_name"] for item in items]
+        assert [item["resolution"] for item in data["items"]] == ["exact", "similar", "keyword", "default", "exact"]
+        
+        for item, result in zip(items, data["items"]):
+            single = client.post("/api/footprint/calculate", json=item, headers=headers).json()
+            assert result["carbon_footprint"] == single["carbon_footprint"]
+            assert result["category"] == single["category"]
+            assert result["sustainability_rating"] == single["sustainability_rating"]
+        
+        assert data["total_carbon_footprint"] == round(sum(r["carbon_footprint"] for r in data["items"]), 3)
+    
+    def test_batch_rejects_empty_and_oversized(self, test_user_token):
+        """빈 요청과 최대 개수 초과 요청 거부 테스트"""
+        
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        
+        response = client.post("/api/footprint/calculate-batch", json={"items": []}, headers=headers)
+        assert response.status_code == 422
+        
+        items = [{"food_name": "밥", "portion_size": 100.0}] * 1001
+        response = client.post("/api/footprint/calculate-batch", json={"items": items}, headers=headers)
+        assert response.status_code == 422
+
 class TestDailyCarbonSummary:
     """일일 탄소 발자국 요약 API 테스트"""
     
@@ -246,6 +247,48 @@ class TestDailyCarbonSummary:
         assert isinstance(data, list)
         # 실제 데이터 개수는 실제 식사 기록에 따라 달라짐
 
+    def test_get_daily_summary_single_query_for_long_history(self, test_user_token):
+        """1년치 기록이 있어도 요약이 한 번의 조회로 끝나는지 테스트"""
+        
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        user_id = current_user_id(headers)
+        
+        # 365일치 과거 기록을 직접 넣고 롤업 재구축
+        now = datetime.utcnow()
+        with SessionLocal() as db:
+            db.add_all([
+                MealLog(
+                    user_id=user_id,
+                    food_name=food_name,
+                    portion_size=200.0,
+                    meal_type=MealType.LUNCH,
+                    carbon_footprint=carbon,
+                    logged_at=now - timedelta(days=day)
+                )
+                for day in range(365)
+                for food_name, carbon in (("김치찌개", 1.2), ("불고기", 8.5))
+            ])
+            db.commit()
+            rebuild_daily_carbon(db, user_id=user_id)
+        
+        with count_queries() as statements:
+            response = client.get("/api/footprint/daily-summary?days=366", headers=headers)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) >= 365
+        assert all(day["top_contributor"] == "불고기" for day in data)
+        # 인증 사용자 조회 1회 + ETag 버전 조회 1회 + 요약 조회 1회
+        assert len(statements) <= 3
+    
+    def test_get_daily_summary_days_bounds(self, test_user_token):
+        """days 파라미터 범위 검증 테스트"""
+        
+        headers = {"Authorization": f"Bearer {test_user_token}"}
+        
+        assert client.get("/api/footprint/daily-summary?days=0", headers=headers).status_code == 422
+        assert client.get("/api/footprint/daily-summary?days=367", headers=headers).status_code == 422
+
 class TestSustainabilityRating:
     """지속가능성 등급 테스트"""
     
@@ -255,10 +298,10 @@ class TestSustainabilityRating:
         headers = {"Authorization": f"Bearer {test_user_token}"}
         
         high_sustainability_foods = [
-            ("사과", 100.0, "HIGH"),
-            ("상추", 100.0, "HIGH"),
-            ("브로콜리", 100.0, "HIGH"),
-            ("당근", 100.0, "HIGH")
+            ("김치", 100.0, "HIGH"),  # 100g / 200g * 0.1 = 0.05
+            ("콩나물무침", 100.0, "HIGH"),  # 100g / 200g * 0.06 = 0.03
+            ("두부", 100.0, "HIGH"),  # 유사 음식 두부조림: 100g / 200g * 0.4 = 0.2
+            ("과일샐러드", 100.0, "HIGH")  # 키워드 과일: 100g * 0.1 kg/100g = 0.1
         ]
         
         for food_name, portion, expected_rating in high_sustainability_foods:
@@ -0,0 +1,139 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.database import AsyncSessionLocal, SessionLocal
+from app.jobs.purge_idempotency_keys import purge_expired
+from app.models.activity_log import ActivityLog, ActivityType
+from app.models.idempotency_key import IdempotencyKey
+from app.models.meal_log import MealLog
+from app.services.idempotency import IdempotentRequest, idempotency_cache, request_hash
+from app.api.energy import EnergyCalculationRequest, EnergyCalculationResponse
+from app.tests.utils import client, current_user_id
+
+MEAL = {"food_name": "김치찌개", "portion_size": 1.0, "meal_type": "lunch"}
+
+def count_rows(model, user_id):
+    with SessionLocal() as db:
+        return db.scalar(select(func.count()).select_from(model).where(model.user_id == user_id))
+
+def new_key():
+    return uuid.uuid4().hex
+
+class TestIdempotentWrites:
+    """Idempotency-Key 재시도 처리 테스트"""
+    
+    def test_meal_retry_returns_original_response(self, auth_headers):
+        """같은 키로 다시 보내면 기록이 하나만 생기고 처음 응답이 돌아오는지 테스트"""
+        
+        headers = {**auth_headers, "Idempotency-Key": new_key()}
+        first = client.post("/api/meals/", json=MEAL, headers=headers)
+        retry = client.post("/api/meals/", json=MEAL, headers=headers)
+        
+        assert first.status_code == retry.status_code == 200
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert "Idempotent-Replayed" not in first.headers
+        assert count_rows(MealLog, current_user_id(auth_headers)) == 1
+    
+    def test_replay_from_database_after_cache_loss(self, auth_headers):
+        """LRU 가 비어도 (재시작, 다른 워커) DB 에 저장된 응답으로 재생하는지 테스트"""
+        
+        headers = {**auth_headers, "Idempotency-Key": new_key()}
+        first = client.post("/api/meals/", json=MEAL, headers=headers)
+        idempotency_cache.clear()
+        retry = client.post("/api/meals/", json=MEAL, headers=headers)
+        
+        assert retry.json() == first.json()
+        assert count_rows(MealLog, current_user_id(auth_headers)) == 1
+    
+    def test_key_reused_with_different_body(self, auth_headers):
+        """같은 키를 다른 본문에 쓰면 422 인지 테스트"""
+        
+        headers = {**auth_headers, "Idempotency-Key": new_key()}
+        client.post("/api/meals/", json=MEAL, headers=headers)
+        response = client.post("/api/meals/", json={**MEAL, "portion_size": 2.0}, headers=headers)
+        
+        assert response.status_code == 422
+        assert count_rows(MealLog, current_user_id(auth_headers)) == 1
+    
+    def test_without_key_every_request_writes(self, auth_headers):
+        """키가 없으면 기존처럼 요청마다 기록되는지 테스트"""
+        
+        client.post("/api/meals/", json=MEAL, headers=auth_headers)
+        client.post("/api/meals/", json=MEAL, headers=auth_headers)
+        
+        assert count_rows(MealLog, current_user_id(auth_headers)) == 2
+    
+    def test_energy_and_transport_retries(self, auth_headers):
+        """에너지/교통 계산 재시도가 활동 기록을 한 번만 남기는지 테스트"""
+        
+        energy_headers = {**auth_headers, "Idempotency-Key": new_key()}
+        transport_headers = {**auth_headers, "Idempotency-Key": new_key()}
+        for _ in range(3):
+            energy = client.post("/api/energy/calculate", json={"electricity_kwh": 200}, headers=energy_headers)
+            transport = client.post("/api/transport/calculate", json={"transport_type": "bus_city", "distance_km": 12}, headers=transport_headers)
+            assert energy.status_code == transport.status_code == 200
+        
+        assert count_rows(ActivityLog, current_user_id(auth_headers)) == 2
+    
+    def test_concurrent_duplicate_loses_to_first_commit(self, auth_headers):
+        """확인과 커밋 사이에 같은 키가 먼저 커밋되면 쓰기를 롤백하고 그 응답을 돌려주는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        key = new_key()
+        payload = EnergyCalculationRequest(electricity_kwh=100)
+        winner = EnergyCalculationResponse(
+            electricity_footprint=45.9, gas_footprint=0.0, total_energy_footprint=45.9,
+            electricity_kwh_used=100, gas_m3_used=None, factor_version="2024.1"
+        )
+        
+        async def race():
+            idempotent = IdempotentRequest(user_id, key, "energy.calculate", payload)
+            async with AsyncSessionLocal() as db:
+                assert await idempotent.find_replay(db) is None
+                await db.rollback()
+                
+                # 다른 요청이 먼저 같은 키를 커밋
+                with SessionLocal() as other:
+                    other.add(IdempotencyKey(
+                        user_id=user_id, key=key, endpoint="energy.calculate",
+                        request_hash=request_hash("energy.calculate", payload),
+                        response_body=winner.model_dump_json(),
+                        expires_at=datetime.utcnow() + timedelta(hours=1)
+                    ))
+                    other.commit()
+                
+                db.add(ActivityLog(user_id=user_id, activity_type=ActivityType.ENERGY, energy_usage=100, carbon_footprint=99.0))
+                return await idempotent.commit(db, winner.model_copy(update={"total_energy_footprint": 99.0}))
+        
+        replay = asyncio.run(race())
+        
+        assert replay is not None
+        assert replay.headers["Idempotent-Replayed"] == "true"
+        assert b"45.9" in replay.body
+        assert count_rows(ActivityLog, user_id) == 0
+    
+    def test_expired_keys(self, auth_headers):
+        """만료된 키는 새 요청으로 처리되고 정리 작업이 지우는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        key = new_key()
+        headers = {**auth_headers, "Idempotency-Key": key}
+        client.post("/api/meals/", json=MEAL, headers=headers)
+        
+        idempotency_cache.clear()
+        with SessionLocal() as db:
+            row = db.scalar(select(IdempotencyKey).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key))
+            row.expires_at = datetime.utcnow() - timedelta(seconds=1)
+            db.commit()
+        
+        retry = client.post("/api/meals/", json=MEAL, headers=headers)
+        assert "Idempotent-Replayed" not in retry.headers
+        assert count_rows(MealLog, user_id) == 2
+        
+        with SessionLocal() as db:
+            assert purge_expired(db, now=datetime.utcnow() + timedelta(days=2)) >= 1
+            assert db.scalar(select(func.count()).select_from(IdempotencyKey).where(IdempotencyKey.user_id == user_id)) == 0
@@ -0,0 +1,168 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app.core.database import SessionLocal
+from app.core.ranking import RankedSet
+from app.jobs.rebuild_leaderboards import rebuild_leaderboards
+from app.models.leaderboard_score import LeaderboardScore
+from app.services import leaderboards as leaderboards_module
+from app.services.carbon_rollup import kst_today
+from app.services.leaderboards import CARBON_WEEKLY, POINTS, leaderboards, period_for
+from app.tests.utils import client, current_user_id, log_meal
+from app.tests.test_achievements import accept, add_swaps
+
+def my_rank(headers, board):
+    response = client.get(f"/api/gamification/leaderboards/{board}/me", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+def snapshot_rank(board, user_id):
+    """스냅샷 테이블에서 직접 센 순위 (점수 내림차순, 동점은 user_id 오름차순)"""
+    period = period_for(board)
+    with SessionLocal() as db:
+        score = db.get(LeaderboardScore, (board, period, user_id)).score
+        ahead = db.scalar(
+            select(func.count()).select_from(LeaderboardScore).where(
+                LeaderboardScore.board == board,
+                LeaderboardScore.period == period,
+                LeaderboardScore.score > 0,
+                (LeaderboardScore.score > score) | ((LeaderboardScore.score == score) & (LeaderboardScore.user_id < user_id)),
+            )
+        )
+    return ahead + 1
+
+class TestRankedSet:
+    """색인 스킵 리스트 테스트"""
+
+    def test_matches_sorted_reference(self):
+        ranking, reference = RankedSet(seed=7), {}
+        rng = random.Random(3)
+        for step in range(5000):
+            member = rng.randrange(200)
+            if rng.random() < 0.75:
+                reference[member] = rng.choice([rng.randrange(20), rng.random() * 5])
+                ranking.set(member, reference[member])
+            else:
+                ranking.discard(member)
+                reference.pop(member, None)
+
+            if step % 250 == 0:
+                order = sorted(reference, key=lambda m: (-reference[m], m))
+                assert list(ranking) == order
+                assert [ranking.rank(m) for m in order] == list(range(1, len(order) + 1))
+                start = rng.randrange(1, len(order) + 2)
+                assert [m for _rank, m, _score in ranking.range(start, 5)] == order[start - 1:start + 4]
+
+        assert ranking.rank(-1) is None
+        assert ranking.top(0) == []
+
+class TestLeaderboards:
+    """리더보드 테스트"""
+
+    def test_points_board_follows_badge_awards(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+        before = my_rank(auth_headers, POINTS)
+
+        log_meal(auth_headers)
+        mine = my_rank(auth_headers, POINTS)
+
+        assert before["rank"] is None
+        assert mine["score"] == 100
+        assert mine["rank"] == snapshot_rank(POINTS, user_id)
+        top = client.get("/api/gamification/leaderboards/points?limit=100", headers=auth_headers).json()
+        assert [entry["rank"] for entry in top["entries"]] == list(range(1, len(top["entries"]) + 1))
+        if mine["rank"] <= 100:
+            assert top["entries"][mine["rank"] - 1]["user_id"] == user_id
+
+    def test_weekly_carbon_updates_in_place(self, auth_headers):
+        """스왑 수락/취소가 보드를 다시 읽지 않고 메모리 보드에 반영되는지 테스트"""
+
+        swap_id, = add_swaps(log_meal(auth_headers, "불고기"), [12.0])
+        my_rank(auth_headers, CARBON_WEEKLY)
+        loads = leaderboards.loads
+
+        accept(auth_headers, swap_id)
+        accepted = my_rank(auth_headers, CARBON_WEEKLY)
+        accept(auth_headers, swap_id, accepted=False)
+        unaccepted = my_rank(auth_headers, CARBON_WEEKLY)
+
+        assert accepted["score"] == 12.0 and accepted["rank"] >= 1
+        assert unaccepted["rank"] is None
+        assert leaderboards.loads == loads
+
+    def test_weekly_board_rolls_over(self, auth_headers, monkeypatch):
+        """주가 바뀌면 새 기간의 빈 보드에서 시작하는지 테스트"""
+
+        swap_id, = add_swaps(log_meal(auth_headers, "불고기"), [3.0])
+        accept(auth_headers, swap_id)
+        this_week = my_rank(auth_headers, CARBON_WEEKLY)
+
+        next_week = kst_today() + timedelta(days=7)
+        monkeypatch.setattr(leaderboards_module, "kst_today", lambda: next_week)
+        rolled = my_rank(auth_headers, CARBON_WEEKLY)
+
+        assert this_week["rank"] is not None
+        assert rolled["period"] == period_for(CARBON_WEEKLY, next_week) != this_week["period"]
+        assert (rolled["total"], rolled["rank"]) == (0, None)
+
+    def test_refresh_picks_up_other_workers(self, auth_headers, monkeypatch):
+        """다른 워커가 스냅샷에 쓴 점수를 새로고침 주기에 따라잡는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        my_rank(auth_headers, POINTS)
+        with SessionLocal() as db:
+            db.add(LeaderboardScore(board=POINTS, period=period_for(POINTS), user_id=user_id, score=10 ** 9, updated_at=datetime.utcnow()))
+            db.commit()
+
+        monkeypatch.setattr(leaderboards, "refresh_seconds", 0)
+        mine = my_rank(auth_headers, POINTS)
+
+        assert (mine["rank"], mine["score"]) == (1, 10 ** 9)
+        with SessionLocal() as db:
+            db.query(LeaderboardScore).filter(LeaderboardScore.user_id == user_id).delete()
+            db.commit()
+        leaderboards.clear()
+
+    def test_refresh_picks_up_late_commit_with_older_timestamp(self, auth_headers, monkeypatch):
+        """새로고침 뒤에 커밋됐지만 그 전 시각의 updated_at 을 가진 점수도 따라잡는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        period = period_for(POINTS)
+        started = datetime.utcnow()  # 오래 걸린 트랜잭션이 점수를 쓴 시각
+        my_rank(auth_headers, POINTS)
+        with SessionLocal() as db:
+            db.add(LeaderboardScore(board=POINTS, period=period, user_id=user_id, score=10 ** 9, updated_at=started + timedelta(seconds=60)))
+            db.commit()
+        monkeypatch.setattr(leaderboards, "refresh_seconds", 0)
+        assert my_rank(auth_headers, POINTS)["score"] == 10 ** 9
+
+        # 위 새로고침이 지나간 뒤에야 커밋되는 늦은 쓰기
+        with SessionLocal() as db:
+            row = db.get(LeaderboardScore, (POINTS, period, user_id))
+            row.score, row.updated_at = 10 ** 9 + 1, started
+            db.commit()
+        mine = my_rank(auth_headers, POINTS)
+
+        assert (mine["rank"], mine["score"]) == (1, 10 ** 9 + 1)
+        with SessionLocal() as db:
+            db.query(LeaderboardScore).filter(LeaderboardScore.user_id == user_id).delete()
+            db.commit()
+        leaderboards.clear()
+
+    def test_rebuild_job_restores_snapshot(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+        log_meal(auth_headers)
+        with SessionLocal() as db:
+            db.query(LeaderboardScore).filter(LeaderboardScore.user_id == user_id).delete()
+            db.commit()
+            rebuild_leaderboards(db)
+        leaderboards.clear()
+
+        assert my_rank(auth_headers, POINTS)["score"] == 100
+        assert my_rank(auth_headers, "streak")["score"] == 1
+
+    def test_unknown_board(self, auth_headers):
+        response = client.get("/api/gamification/leaderboards/unknown", headers=auth_headers)
+        assert response.status_code == 404
@@ -0,0 +1,248 @@
+import asyncio
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from sqlalchemy import text
+
+from app.core.database import SessionLocal, engine
+from app.models.food import Food
+from app.models.meal_log import MealLog, MealType
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.models.user_streak import UserStreak
+from app.services.carbon_rollup import kst_today
+from app.services.meal_writer import MealWriteQueue, meal_write_queue
+from app.tests.utils import client, current_user_id
+
+def seed_history(user_id, count, start=datetime(2024, 1, 1, 12, 0)):
+    """하루 한 끼씩 과거 기록 추가 (10번째마다 같은 시각 기록 하나 더)"""
+    meal_types = list(MealType)
+    with SessionLocal() as db:
+        for n in range(count):
+            logged_at = start + timedelta(days=n)
+            db.add(MealLog(user_id=user_id, food_name=f"음식{n}", portion_size=100.0, meal_type=meal_types[n % 4], carbon_footprint=1.0, logged_at=logged_at))
+            if n % 10 == 0:
+                db.add(MealLog(user_id=user_id, food_name=f"음식{n}-2", portion_size=100.0, meal_type=meal_types[n % 4], carbon_footprint=1.0, logged_at=logged_at))
+        db.commit()
+
+def fetch_all(headers, query=""):
+    items, cursor, pages = [], None, 0
+    while True:
+        url = f"/api/meals/?limit=7{query}" + (f"&cursor={cursor}" if cursor else "")
+        page = client.get(url, headers=headers).json()
+        items.extend(page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+class TestMealHistoryPagination:
+    """식사 기록 키셋 페이지네이션 테스트"""
+    
+    def test_pages_cover_history_newest_first(self, auth_headers):
+        """모든 페이지를 이으면 중복/누락 없이 최신순인지 테스트"""
+        
+        seed_history(current_user_id(auth_headers), 40)
+        
+        items, pages = fetch_all(auth_headers)
+        keys = [(item["logged_at"], item["id"]) for item in items]
+        
+        assert len(items) == 44
+        assert len(set(keys)) == 44
+        assert keys == sorted(keys, reverse=True)
+        assert pages == 7
+    
+    def test_filters(self, auth_headers):
+        """from / to / meal_type 필터 테스트"""
+        
+        seed_history(current_user_id(auth_headers), 40)
+        
+        items, _ = fetch_all(auth_headers, "&from=2024-01-11T00:00:00&to=2024-01-21T00:00:00")
+        assert len(items) == 11  # 1/11 ~ 1/20, 1/11 은 두 끼
+        assert all("2024-01-11" <= item["logged_at"] < "2024-01-21" for item in items)
+        
+        items, _ = fetch_all(auth_headers, "&meal_type=dinner")
+        assert items and all(item["meal_type"] == "dinner" for item in items)
+    
+    def test_invalid_cursor(self, auth_headers):
+        """잘못된 커서는 400 인지 테스트"""
+        
+        response = client.get("/api/meals/?cursor=not-a-cursor", headers=auth_headers)
+        assert response.status_code == 400
+    
+    def test_limit_bounds(self, auth_headers):
+        """limit 범위 검증 테스트"""
+        
+        assert client.get("/api/meals/?limit=0", headers=auth_headers).status_code == 422
+        assert client.get("/api/meals/?limit=201", headers=auth_headers).status_code == 422
+    
+    def test_deep_page_uses_index_without_sort(self):
+        """커서 조회가 복합 인덱스를 역순으로 읽고 별도 정렬을 하지 않는지 테스트"""
+        
+        with engine.connect() as conn:
+            plan = " ".join(row[-1] for row in conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM meal_logs "
+                "WHERE user_id = 1 AND (logged_at, id) < ('2024-02-01 00:00:00', 500) "
+                "ORDER BY logged_at DESC, id DESC LIMIT 51"
+            )))
+        
+        assert "ix_meal_logs_user_logged_at_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+class TestMealImport:
+    """식사 기록 대량 가져오기 테스트"""
+    
+    def test_import_csv_with_row_errors(self, auth_headers):
+        """CSV 가져오기에서 잘못된 행만 건너뛰고 나머지는 넣는지 테스트"""
+        
+        body = "\n".join([
+            "food_name,portion_size,meal_type,logged_at",
+            "불고기,1,dinner,2024-03-01T19:00:00",
+            "김치찌개,2,lunch,2024-03-02T12:00:00+09:00",
+            ",1,lunch,",
+            "비빔밥,abc,lunch,",
+            "라면,1,brunch,",
+            "된장찌개,1",
+            "비빔밥,1,BREAKFAST,",
+        ])
+        response = client.post(
+            "/api/meals/import",
+            content=body.encode(),
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+        
+        assert response.status_code == 200
+        report = response.json()
+        assert report["imported"] == 3
+        assert report["failed"] == 4
+        assert [error["line"] for error in report["errors"]] == [4, 5, 6, 7]
+        
+        items = client.get("/api/meals/?limit=10", headers=auth_headers).json()["items"]
+        imported = {item["food_name"]: item for item in items}
+        with SessionLocal() as db:
+            food_ids = {meal.food_name: meal.food_id for meal in db.query(MealLog).filter(MealLog.id.in_([item["id"] for item in items]))}
+            assert food_ids["불고기"] == db.query(Food.id).filter(Food.name == "불고기").scalar()
+        assert imported["불고기"]["carbon_footprint"] == 8.5
+        assert imported["김치찌개"]["carbon_footprint"] == 2.4
+        assert imported["김치찌개"]["logged_at"] == "2024-03-02T03:00:00"
+        assert imported["비빔밥"]["meal_type"] == "breakfast"
+    
+    def test_import_ndjson_updates_rollup(self, auth_headers):
+        """NDJSON 가져오기가 여러 청크에 걸쳐 롤업까지 갱신하는지 테스트"""
+        
+        lines = [
+            '{"food_name": "김치찌개", "portion_size": 1, "meal_type": "lunch", "logged_at": "2024-04-01T03:00:00"}'
+            for _ in range(2500)
+        ] + ["not json", "[1, 2]"]
+        response = client.post(
+            "/api/meals/import?format=ndjson",
+            content="\n".join(lines).encode(),
+            headers=auth_headers
+        )
+        
+        report = response.json()
+        assert report["imported"] == 2500
+        assert report["failed"] == 2
+        
+        # 과거 날짜는 요약 API 범위 밖일 수 있으므로 롤업 테이블을 직접 확인
+        with SessionLocal() as db:
+            row = db.get(UserDailyCarbon, (current_user_id(auth_headers), date(2024, 4, 1)))
+        assert row.meal_count == 2500
+        assert round(row.total_carbon, 6) == round(2500 * 1.2, 6)
+    
+    def test_import_csv_missing_columns(self, auth_headers):
+        """필수 컬럼이 없는 CSV 는 400 인지 테스트"""
+        
+        response = client.post(
+            "/api/meals/import?format=csv",
+            content="name,amount\n불고기,1\n".encode(),
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 400
+
+class TestGroupCommit:
+    """식사 기록 그룹 커밋 테스트"""
+    
+    def test_api_returns_committed_meal(self, auth_headers, monkeypatch):
+        """큐 경로로 추가한 식사가 id 와 함께 반환되고 롤업/연속 기록에 반영되는지 테스트"""
+        
+        monkeypatch.setattr(meal_write_queue, "enabled", True)
+        response = client.post("/api/meals/", json={
+            "food_name": "김치찌개", "portion_size": 1.0, "meal_type": "lunch"
+        }, headers=auth_headers)
+        
+        assert response.status_code == 200
+        meal = response.json()
+        assert meal["id"] > 0
+        assert meal["carbon_footprint"] == 1.2
+        
+        user_id = current_user_id(auth_headers)
+        assert client.get(f"/api/meals/{meal['id']}", headers=auth_headers).status_code == 200
+        with SessionLocal() as db:
+            assert db.get(UserDailyCarbon, (user_id, kst_today())).meal_count == 1
+            assert db.get(UserStreak, user_id).current_streak == 1
+    
+    def test_concurrent_submits_share_batches(self, auth_headers):
+        """동시에 들어온 요청들이 max_batch 단위로 묶여 커밋되는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        queue = MealWriteQueue(enabled=True, max_delay=0.05, max_batch=10)
+        
+        async def submit_all():
+            meals = await asyncio.gather(*[
+                queue.submit(user_id, f"음식{n}", 100.0, MealType.SNACK, 1.0) for n in range(25)
+            ])
+            await queue.close()
+            return meals
+        
+        meals = asyncio.run(submit_all())
+        
+        assert len({meal["id"] for meal in meals}) == 25
+        assert [meal["food_name"] for meal in meals] == [f"음식{n}" for n in range(25)]
+        assert queue.batches == 3
+        with SessionLocal() as db:
+            assert db.get(UserDailyCarbon, (user_id, kst_today())).meal_count == 25
+            stored = {meal.id: meal.food_name for meal in db.query(MealLog).filter(MealLog.user_id == user_id)}
+        assert all(stored[meal["id"]] == meal["food_name"] for meal in meals)
+    
+    def test_failed_row_does_not_fail_batch(self, auth_headers):
+        """배치 안의 잘못된 행은 그 요청만 실패하고 나머지는 저장되는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        queue = MealWriteQueue(enabled=True, max_delay=0.05, max_batch=10)
+        
+        async def submit_all():
+            results = await asyncio.gather(
+                queue.submit(user_id, "불고기", 100.0, MealType.DINNER, 4.25),
+                queue.submit(user_id, None, 100.0, MealType.DINNER, 1.0),
+                queue.submit(user_id, "비빔밥", 100.0, MealType.DINNER, 0.6),
+                return_exceptions=True
+            )
+            await queue.close()
+            return results
+        
+        first, failed, last = asyncio.run(submit_all())
+        
+        assert isinstance(failed, Exception)
+        assert first["id"] and last["id"]
+        with SessionLocal() as db:
+            assert db.get(UserDailyCarbon, (user_id, kst_today())).meal_count == 2
+
+class TestFoodDimension:
+    """식사 기록 food_id 테스트"""
+    
+    def test_meal_records_resolved_food_id(self, auth_headers):
+        """정확 일치/부분 일치는 foods 의 id, 해석되지 않는 음식은 NULL 로 저장되는지 테스트"""
+        
+        ids = {}
+        for food_name in ["불고기", "엄마표 불고기", "우주 음식"]:
+            response = client.post("/api/meals/", json={"food_name": food_name, "portion_size": 1.0, "meal_type": "dinner"}, headers=auth_headers)
+            ids[food_name] = response.json()["id"]
+        
+        with SessionLocal() as db:
+            bulgogi = db.query(Food).filter(Food.name == "불고기").one()
+            food_ids = {name: db.get(MealLog, meal_id).food_id for name, meal_id in ids.items()}
+        
+        assert bulgogi.category == "구이요리"
+        assert food_ids == {"불고기": bulgogi.id, "엄마표 불고기": bulgogi.id, "우주 음식": None}
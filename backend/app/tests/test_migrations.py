@@ -0,0 +1,142 @@
+import os
+import tempfile
+import uuid
+
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.migrations import apply_migrations, applied_versions, discover_migrations, pending_migrations
+from app.models import Base, Food
+
+LEGACY_MEAL_LOGS = """
+CREATE TABLE meal_logs (
+    id INTEGER NOT NULL PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users (id),
+    food_name VARCHAR NOT NULL,
+    portion_size FLOAT NOT NULL,
+    meal_type VARCHAR(9) NOT NULL,
+    carbon_footprint FLOAT NOT NULL,
+    image_url VARCHAR,
+    logged_at DATETIME,
+    created_at DATETIME
+)
+"""
+
+HOT_PATH_INDEXES = {
+    "meal_logs": "ix_meal_logs_user_logged_at_id",
+    "activity_logs": "ix_activity_logs_user_type_logged_at",
+    "recommended_swaps": "ix_recommended_swaps_meal_accepted_created",
+    "user_challenges": "ix_user_challenges_user_completed",
+}
+
+def legacy_engine():
+    """모델 인덱스와 meal_logs.food_id 가 없는 기존 운영 스키마를 흉내낸 임시 DB"""
+    path = os.path.join(tempfile.gettempdir(), f"greenflow_migrate_{uuid.uuid4().hex[:8]}.db")
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine, tables=[
+        table for table in Base.metadata.sorted_tables if table.name != "meal_logs"
+    ])
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_MEAL_LOGS))
+        for table, name in HOT_PATH_INDEXES.items():
+            if table != "meal_logs":
+                conn.execute(text(f"DROP INDEX {name}"))
+    return engine, path
+
+def index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+class TestMigrations:
+    """스키마 마이그레이션 테스트"""
+    
+    def test_versions_are_unique_and_ordered(self):
+        """마이그레이션 번호가 중복 없이 정렬되는지 테스트"""
+        
+        versions = [version for version, _, _ in discover_migrations()]
+        
+        assert versions
+        assert versions == sorted(set(versions))
+    
+    def test_apply_adds_indexes_to_existing_database(self):
+        """기존 DB 에 인덱스를 추가하고 버전을 기록하는지 테스트"""
+        
+        engine, path = legacy_engine()
+        try:
+            assert "ix_meal_logs_user_logged_at_id" not in index_names(engine, "meal_logs")
+            
+            applied = apply_migrations(engine, log=lambda message: None)
+            
+            assert applied == [name for _, name, _ in discover_migrations()]
+            for table, index in HOT_PATH_INDEXES.items():
+                assert index in index_names(engine, table)
+            assert "factor_version" in {column["name"] for column in inspect(engine).get_columns("meal_logs")}
+            assert pending_migrations(engine) == []
+        finally:
+            engine.dispose()
+            os.remove(path)
+    
+    def test_apply_is_idempotent_on_fresh_database(self):
+        """모델 인덱스가 이미 있는 새 DB 에서도 오류 없이 기록만 하는지 테스트"""
+        
+        path = os.path.join(tempfile.gettempdir(), f"greenflow_migrate_{uuid.uuid4().hex[:8]}.db")
+        engine = create_engine(f"sqlite:///{path}")
+        try:
+            Base.metadata.create_all(bind=engine)
+            
+            apply_migrations(engine, log=lambda message: None)
+            
+            assert apply_migrations(engine, log=lambda message: None) == []
+            assert applied_versions(engine) == {version for version, _, _ in discover_migrations()}
+        finally:
+            engine.dispose()
+            os.remove(path)
+    
+    def test_food_dimension_backfills_existing_meals(self):
+        """기존 식사 기록에 food_id 컬럼을 추가하고 해석 가능한 이름만 채우는지 테스트"""
+        
+        engine, path = legacy_engine()
+        try:
+            with engine.begin() as conn:
+                conn.execute(text("INSERT INTO users (id, email, password_hash, name) VALUES (1, 'a@example.com', 'x', 'A')"))
+                conn.execute(text(
+                    "INSERT INTO meal_logs (user_id, food_name, portion_size, meal_type, carbon_footprint) VALUES "
+                    "(1, '불고기', 1, 'DINNER', 8.5), (1, '엄마표 불고기', 1, 'DINNER', 8.5), (1, '우주 음식', 100, 'DINNER', 0.5)"
+                ))
+            
+            apply_migrations(engine, log=lambda message: None)
+            
+            assert "ix_meal_logs_food_id" in index_names(engine, "meal_logs")
+            with engine.connect() as conn:
+                bulgogi = conn.execute(text("SELECT id FROM foods WHERE name = '불고기'")).scalar()
+                food_ids = dict(conn.execute(text("SELECT food_name, food_id FROM meal_logs")).all())
+                food_count = conn.execute(text("SELECT count(*) FROM foods")).scalar()
+            
+            assert food_ids == {"불고기": bulgogi, "엄마표 불고기": bulgogi, "우주 음식": None}
+            assert food_count > 100
+        finally:
+            engine.dispose()
+            os.remove(path)
+    
+    def test_unreachable_badge_removed_unless_earned(self):
+        """지급 조건이 없던 eco_warrior 배지 행을 받은 사람이 없을 때만 지우는지 테스트"""
+        
+        for earned in (False, True):
+            engine, path = legacy_engine()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO users (id, email, password_hash, name) VALUES (1, 'a@example.com', 'x', 'A')"))
+                    conn.execute(text(
+                        "INSERT INTO badges (id, name, description, icon_url, achievement_criteria, badge_type, points) "
+                        "VALUES (1, '환경 전사', '-', '🌍', '-', 'eco_warrior', 1500)"
+                    ))
+                    if earned:
+                        conn.execute(text("INSERT INTO user_badges (user_id, badge_id) VALUES (1, 1)"))
+                
+                apply_migrations(engine, log=lambda message: None)
+                
+                with engine.connect() as conn:
+                    badge_types = set(conn.execute(text("SELECT badge_type FROM badges")).scalars())
+                assert ("eco_warrior" in badge_types) == earned
+                assert "first_meal" in badge_types
+            finally:
+                engine.dispose()
+                os.remove(path)
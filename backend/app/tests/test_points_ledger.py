@@ -0,0 +1,110 @@
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.jobs.audit_points_ledger import audit_points_ledger
+from app.jobs.rebuild_activity_counters import rebuild_activity_counters
+from app.models.challenge import Challenge, ChallengeType
+from app.models.points_ledger import PointsLedgerEntry
+from app.models.recommended_swap import RecommendedSwap
+from app.models.user_activity_counter import UserActivityCounter
+from app.tests.utils import client, count_queries, current_user_id, log_meal
+from app.tests.test_achievements import accept, add_swaps
+
+def ledger(user_id):
+    with SessionLocal() as db:
+        return db.execute(
+            select(PointsLedgerEntry.kind, PointsLedgerEntry.points, PointsLedgerEntry.carbon_saved)
+            .where(PointsLedgerEntry.user_id == user_id)
+            .order_by(PointsLedgerEntry.id)
+        ).all()
+
+class TestPointsLedger:
+    """포인트 원장과 누적 합계 테스트"""
+
+    def test_badge_and_swap_events_append_entries(self, auth_headers):
+        """배지 지급과 스왑 수락/취소가 원장에 쌓이고 합계가 같이 바뀌는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        swap_id, = add_swaps(log_meal(auth_headers, "불고기"), [12.0])
+
+        accept(auth_headers, swap_id)
+        accept(auth_headers, swap_id, accepted=False)
+
+        assert ledger(user_id) == [
+            ("badge_awarded", 100, 0.0),
+            ("swap_accepted", 0, 12.0),
+            ("badge_awarded", 500, 0.0),
+            ("swap_unaccepted", 0, -12.0),
+        ]
+        stats = client.get("/api/gamification/stats", headers=auth_headers).json()
+        assert stats["total_points"] == 600
+        assert (stats["level"], stats["level_title"], stats["points_to_next_level"]) == (2, "친환경 실천가", 900)
+        assert stats["achievement_count"] == 2
+        assert stats["total_carbon_saved"] == 0.0
+        assert stats["current_streak"] == 1
+
+    def test_stats_reads_single_row(self, auth_headers):
+        """ETag 확인 뒤에는 합계 행 조회 한 번으로 통계를 만드는지 테스트"""
+
+        log_meal(auth_headers)
+        client.get("/api/gamification/stats", headers=auth_headers)
+
+        with count_queries() as statements:
+            response = client.get("/api/gamification/stats", headers={**auth_headers, "If-None-Match": "stale"})
+
+        assert response.status_code == 200
+        stats_queries = [s for s in statements if "user_activity_counters" in s or "user_badges" in s or "recommended_swaps" in s]
+        assert len(stats_queries) == 1
+
+    def test_challenge_completion_rate_uses_joined_count(self, auth_headers):
+        with SessionLocal() as db:
+            challenge = Challenge(name="채식 주간", description="-", challenge_type=ChallengeType.MEAL_LOGGING, target_value=7)
+            db.add(challenge)
+            db.commit()
+            challenge_id = challenge.id
+        response = client.post("/api/challenges/join", json={"challenge_id": challenge_id}, headers=auth_headers)
+        assert response.status_code == 200
+
+        stats = client.get("/api/gamification/stats", headers=auth_headers).json()
+
+        assert stats["challenge_completion_rate"] == 0.0
+        with SessionLocal() as db:
+            assert db.get(UserActivityCounter, current_user_id(auth_headers)).challenges_joined == 1
+
+    def test_audit_detects_and_fixes_drift(self, auth_headers):
+        user_id = current_user_id(auth_headers)
+        log_meal(auth_headers)
+        with SessionLocal() as db:
+            counters = db.get(UserActivityCounter, user_id)
+            counters.total_points, counters.badge_count = 9999, 7
+            db.commit()
+
+        with SessionLocal() as db:
+            found = audit_points_ledger(db, user_id=user_id, fix=True)
+        with SessionLocal() as db:
+            remaining = audit_points_ledger(db, user_id=user_id)
+            counters = db.get(UserActivityCounter, user_id)
+
+        assert [(m["user_id"], m["stored"]["total_points"], m["ledger"]["total_points"]) for m in found] == [(user_id, 9999, 100)]
+        assert remaining == []
+        assert (counters.total_points, counters.badge_count, counters.level) == (100, 1, 1)
+
+    def test_rebuild_backfills_entries_for_history_without_ledger(self, auth_headers):
+        """원장 이전에 수락한 스왑과 받은 배지의 원장 행을 한 번만 채우는지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        meal_id = log_meal(auth_headers, "불고기")
+        with SessionLocal() as db:
+            for swap_id in add_swaps(meal_id, [3.0]):
+                db.get(RecommendedSwap, swap_id).accepted = True
+            db.query(PointsLedgerEntry).filter(PointsLedgerEntry.user_id == user_id).delete()
+            db.commit()
+
+        with SessionLocal() as db:
+            rebuild_activity_counters(db, user_id=user_id)
+        with SessionLocal() as db:
+            rebuild_activity_counters(db, user_id=user_id)
+            counters = db.get(UserActivityCounter, user_id)
+
+        assert sorted(ledger(user_id)) == [("badge_awarded", 100, 0.0), ("swap_accepted", 0, 3.0)]
+        assert (counters.total_points, counters.carbon_saved, counters.badge_count) == (100, 3.0, 1)
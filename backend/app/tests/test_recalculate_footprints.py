@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.data.factor_dataset import DEFAULT_PATH
+from app.jobs.recalculate_footprints import recalculate_footprints
+from app.models.activity_log import ActivityLog, ActivityType
+from app.models.meal_log import MealLog
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.services.carbon_rollup import kst_today
+from app.tests.utils import client, current_user_id
+
+@pytest.fixture
+def corrected_dataset(tmp_path):
+    """김치찌개, 전력, 가스 계수를 고친 새 버전 파일"""
+    with open(DEFAULT_PATH, encoding="utf-8") as f:
+        raw = json.load(f)
+    raw["version"] = "2024.2-test"
+    raw["foods_kg_per_serving"]["김치찌개"] = 2.0
+    raw["electricity_kg_per_kwh"] = 0.5
+    raw["city_gas_kg_per_m3"] = 2.0
+    path = tmp_path / "corrected.json"
+    path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+    return path
+
+class TestRecalculateFootprints:
+    """과거 기록 재계산 작업 테스트"""
+
+    def test_recalculates_history_and_rollups(self, auth_headers, corrected_dataset, tmp_path):
+        """식사/에너지 기록과 롤업이 새 계수로 바뀌고, 교통 기록은 그대로인지 테스트"""
+
+        user_id = current_user_id(auth_headers)
+        for food_name in ("김치찌개", "김치찌개", "불고기"):
+            client.post("/api/meals/", json={"food_name": food_name, "portion_size": 1.0, "meal_type": "lunch"}, headers=auth_headers)
+        client.post("/api/energy/calculate", json={"electricity_kwh": 100, "gas_m3": 10}, headers=auth_headers)
+        client.post("/api/transport/calculate", json={"transport_type": "subway", "distance_km": 10}, headers=auth_headers)
+        checkpoint = tmp_path / "checkpoint.json"
+
+        phases = recalculate_footprints(
+            target_path=corrected_dataset,
+            previous_paths=[DEFAULT_PATH],
+            chunk_size=7,
+            checkpoint_path=checkpoint,
+        )
+
+        assert phases["meal_logs"]["done"] and phases["activity_logs"]["done"] and phases["rollups"]["done"]
+        assert json.loads(checkpoint.read_text())["target_version"] == "2024.2-test"
+        with SessionLocal() as db:
+            meals = db.execute(
+                select(MealLog.food_name, MealLog.carbon_footprint, MealLog.factor_version).where(MealLog.user_id == user_id)
+            ).all()
+            activities = {
+                row.activity_type: row
+                for row in db.scalars(select(ActivityLog).where(ActivityLog.user_id == user_id))
+            }
+            rollup = db.get(UserDailyCarbon, (user_id, kst_today()))
+
+        assert sorted((name, round(carbon, 3), version) for name, carbon, version in meals) == [
+            ("김치찌개", 2.0, "2024.2-test"), ("김치찌개", 2.0, "2024.2-test"), ("불고기", 8.5, "2024.2-test")
+        ]
+        assert activities[ActivityType.ENERGY].carbon_footprint == pytest.approx(100 * 0.5 + 10 * 2.0)
+        assert activities[ActivityType.ENERGY].factor_version == "2024.2-test"
+        assert activities[ActivityType.TRANSPORT].factor_version == "2024.1"
+        assert rollup.total_carbon == pytest.approx(12.5)
+
+    def test_rerun_skips_recalculated_rows(self, auth_headers, corrected_dataset, tmp_path):
+        """완료된 체크포인트는 건너뛰고, 새 실행도 이미 대상 버전인 행은 읽지 않는지 테스트"""
+
+        client.post("/api/meals/", json={"food_name": "김치찌개", "portion_size": 1.0, "meal_type": "lunch"}, headers=auth_headers)
+        checkpoint = tmp_path / "checkpoint.json"
+        first = recalculate_footprints(target_path=corrected_dataset, checkpoint_path=checkpoint)
+        scanned = first["meal_logs"]["scanned"]
+
+        resumed = recalculate_footprints(target_path=corrected_dataset, checkpoint_path=checkpoint)
+        fresh = recalculate_footprints(target_path=corrected_dataset, checkpoint_path=tmp_path / "fresh.json")
+
+        assert scanned >= 1
+        assert resumed["meal_logs"]["scanned"] == scanned
+        assert fresh["meal_logs"]["scanned"] == 0
+        assert "rollups" not in fresh
+
+    def test_checkpoint_for_other_version_is_rejected(self, corrected_dataset, tmp_path):
+        checkpoint = tmp_path / "checkpoint.json"
+        checkpoint.write_text(json.dumps({"target_version": "1999.1", "phases": {}}))
+
+        with pytest.raises(SystemExit):
+            recalculate_footprints(target_path=corrected_dataset, checkpoint_path=checkpoint)
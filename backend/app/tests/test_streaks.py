@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+from app.core.database import SessionLocal
+from app.jobs.rebuild_streaks import rebuild_streaks
+from app.models.user_daily_carbon import UserDailyCarbon
+from app.models.user_streak import UserStreak
+from app.services.carbon_rollup import kst_today
+from app.services.streaks import current_streak_of
+from app.tests.utils import client, count_queries, current_user_id, log_meal
+
+def seed_days(user_id, days_ago):
+    """과거 기록 날짜를 롤업에 직접 추가"""
+    today = kst_today()
+    with SessionLocal() as db:
+        db.add_all([
+            UserDailyCarbon(user_id=user_id, day=today - timedelta(days=n), total_carbon=1.0, meal_count=1, top_food="김치찌개", max_carbon=1.0)
+            for n in days_ago
+        ])
+        db.commit()
+
+def backfill(user_id):
+    with SessionLocal() as db:
+        return rebuild_streaks(db, user_id=user_id)
+
+def load_streak(user_id):
+    with SessionLocal() as db:
+        return db.get(UserStreak, user_id)
+
+class TestStreakTracking:
+    """연속 기록 상태 테스트"""
+    
+    def test_first_meal_starts_streak(self, auth_headers):
+        """첫 식사 기록 시 연속 기록이 1로 시작하는지 테스트"""
+        
+        log_meal(auth_headers)
+        log_meal(auth_headers, "불고기")
+        state = load_streak(current_user_id(auth_headers))
+        
+        assert state.current_streak == 1
+        assert state.best_streak == 1
+        assert state.last_day == kst_today()
+    
+    def test_meal_today_extends_yesterday_streak(self, auth_headers):
+        """어제까지의 연속 기록에 오늘 기록이 이어지는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        seed_days(user_id, [1, 2, 3])
+        backfill(user_id)
+        
+        log_meal(auth_headers)
+        state = load_streak(user_id)
+        
+        assert state.current_streak == 4
+        assert state.best_streak == 4
+        assert current_streak_of(state) == 4
+    
+    def test_gap_restarts_streak_and_keeps_best(self, auth_headers):
+        """하루 이상 비면 1부터 다시 시작하고 최고 기록은 유지되는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        seed_days(user_id, [3, 4, 5])
+        backfill(user_id)
+        
+        log_meal(auth_headers)
+        state = load_streak(user_id)
+        
+        assert state.current_streak == 1
+        assert state.best_streak == 3
+    
+    def test_backfill_gaps_and_islands(self, auth_headers):
+        """백필 작업이 섬 단위로 현재/최고 연속을 계산하는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        seed_days(user_id, [0, 1, 2, 6, 7, 8, 9, 12])
+        
+        result = backfill(user_id)
+        state = load_streak(user_id)
+        
+        assert result["rows"] == 1
+        assert state.current_streak == 3
+        assert state.best_streak == 4
+        assert state.last_day == kst_today()
+    
+    def test_stale_streak_reads_as_zero(self, auth_headers):
+        """오늘 기록이 없으면 현재 연속이 0으로 조회되는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        seed_days(user_id, [1, 2])
+        backfill(user_id)
+        state = load_streak(user_id)
+        
+        assert current_streak_of(state) == 0
+        assert state.best_streak == 2
+    
+    def test_personalized_challenges_use_stored_streak(self, auth_headers):
+        """개인화 챌린지가 저장된 연속 기록을 사용하는지 테스트"""
+        
+        user_id = current_user_id(auth_headers)
+        seed_days(user_id, [1])
+        backfill(user_id)
+        log_meal(auth_headers)
+        
+        with count_queries() as statements:
+            response = client.get("/api/gamification/challenges/personalized", headers=auth_headers)
+        
+        assert response.status_code == 200
+        streak_challenge = next(c for c in response.json() if "연속 기록" in c["title"])
+        assert streak_challenge["current_progress"] == 2
+        # 사용자, 최근 식사 20건, 연속 기록(기본키), 스왑 수 - 전체 식사 조회 없음
+        assert len(statements) <= 4
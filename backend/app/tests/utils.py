@@ -0,0 +1,38 @@
+"""
+테스트 공용 도구 (테스트 클라이언트, SQL 문장 수집)
+
+DATABASE_URL 은 conftest 가 이 모듈보다 먼저 테스트 DB 로 맞춰 둔다.
+"""
+
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.main import app
+from app.core.database import async_engine
+
+client = TestClient(app)
+
+def log_meal(headers, food_name="김치찌개"):
+    """API 로 식사 한 건을 기록하고 id 를 반환"""
+    response = client.post("/api/meals/", json={"food_name": food_name, "portion_size": 1.0, "meal_type": "lunch"}, headers=headers)
+    assert response.status_code == 200
+    return response.json()["id"]
+
+def current_user_id(headers):
+    return client.get("/api/auth/me", headers=headers).json()["id"]
+
+@contextmanager
+def count_queries():
+    """블록 안에서 API 가 실행한 SQL 문장 목록을 수집"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,104 @@
+"""
+인증 빠른 경로 벤치마크
+
+1. get_current_user 의존성만 직접 호출: 캐시를 매번 비운 경우(JWT 검증 + users 조회)와
+   캐시가 데워진 경우의 호출당 시간(µs) 과 쿼리 수
+2. GET /api/auth/me 전체 요청: 같은 두 경우의 지연(ms) 과 요청당 쿼리 수
+
+    python -m benchmarks.auth_bench --calls 5000 --requests 1000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from fastapi.security import HTTPAuthorizationCredentials
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.api.auth import get_current_user
+from app.core.auth_cache import auth_cache
+from app.core.database import AsyncSessionLocal, async_engine
+from app.main import app
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self)
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def dependency(token: str, calls: int, cold: bool, counter: QueryCounter) -> tuple:
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    samples = []
+    queries = counter.count
+    async with AsyncSessionLocal() as db:
+        for _ in range(calls):
+            if cold:
+                auth_cache.clear()
+            started = time.perf_counter()
+            await get_current_user(credentials, db)
+            samples.append((time.perf_counter() - started) * 1_000_000)
+    return samples, (counter.count - queries) / calls
+
+
+def requests(client: TestClient, headers: dict, count: int, cold: bool, counter: QueryCounter) -> tuple:
+    samples = []
+    queries = counter.count
+    for _ in range(count):
+        if cold:
+            auth_cache.clear()
+        started = time.perf_counter()
+        client.get("/api/auth/me", headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples, (counter.count - queries) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="인증 빠른 경로 벤치마크")
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    response = client.post("/api/auth/register", json={
+        "email": f"bench-{uuid.uuid4().hex[:12]}@example.com", "password": "benchmark123", "name": "Bench",
+    })
+    token = response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    counter = QueryCounter()
+
+    print("get_current_user")
+    for label, cold in (("uncached", True), ("cached", False)):
+        samples, queries = asyncio.run(dependency(token, args.calls, cold, counter))
+        print(
+            f"  {label:>8}: p50 {percentile(samples, 0.5):8.1f} µs  p99 {percentile(samples, 0.99):8.1f} µs  "
+            f"mean {statistics.mean(samples):8.1f} µs  queries/call {queries:.2f}"
+        )
+
+    print("GET /api/auth/me")
+    for label, cold in (("uncached", True), ("cached", False)):
+        samples, queries = requests(client, headers, args.requests, cold, counter)
+        print(
+            f"  {label:>8}: p50 {percentile(samples, 0.5):6.2f} ms  p99 {percentile(samples, 0.99):6.2f} ms  "
+            f"queries/request {queries:.2f}"
+        )
+    print(f"cache: {auth_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
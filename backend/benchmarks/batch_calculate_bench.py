@@ -0,0 +1,61 @@
+"""
+탄소 발자국 일괄 계산 벤치마크
+
+같은 식단을 /api/footprint/calculate 로 한 건씩 보낼 때와
+/api/footprint/calculate-batch 로 한 번에 보낼 때의 항목당 비용(µs)을 비교한다.
+
+    python -m benchmarks.batch_calculate_bench
+"""
+
+import os
+import random
+import tempfile
+import time
+import uuid
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.data.korean_food_carbon import KOREAN_FOOD_CARBON_DB
+
+EXTRA_NAMES = ["찌개", "엄마표 김치찌개", "소고기 샐러드", "브로콜리", "알 수 없는 음식"]
+
+
+def make_items(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    names = list(KOREAN_FOOD_CARBON_DB) + EXTRA_NAMES
+    return [
+        {"food_name": rng.choice(names), "portion_size": float(rng.randint(50, 400))}
+        for _ in range(count)
+    ]
+
+
+def main():
+    client = TestClient(app)
+    response = client.post("/api/auth/register", json={
+        "email": f"bench-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "benchmark123",
+        "name": "Bench",
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    print(f"{'items':>6} {'loop µs/item':>13} {'batch µs/item':>14} {'speedup':>8}")
+    for count in (50, 200, 500, 1000):
+        items = make_items(count)
+
+        started = time.perf_counter()
+        for item in items:
+            client.post("/api/footprint/calculate", json=item, headers=headers)
+        loop_us = (time.perf_counter() - started) / count * 1e6
+
+        started = time.perf_counter()
+        client.post("/api/footprint/calculate-batch", json={"items": items}, headers=headers)
+        batch_us = (time.perf_counter() - started) / count * 1e6
+
+        print(f"{count:>6} {loop_us:>13.1f} {batch_us:>14.1f} {loop_us / batch_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+챌린지 수동 진행도 동시 증가 벤치마크 (읽고 더해서 쓰기 vs UPDATE 한 문장)
+
+같은 user_challenges 행에 +1 을 --increments 번 동시에 보내고, 최종 진행도와 잃어버린 증가분,
+실패한 요청 수, 걸린 시간을 비교한다. 잃어버리는 정도는 스케줄링에 따라 매번 다르다.
+SQLite 는 쓰기 잠금을 기다리다 "database is locked" 로 실패하는 요청이 실패 건수에 잡힌다.
+
+    python -m benchmarks.challenge_progress_bench --increments 20 100 --rounds 5
+
+--database-url 로 Postgres 를 줄 수 있다 (스크래치 DB 에서만 실행).
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+parser = argparse.ArgumentParser(description="챌린지 진행도 동시 증가 벤치마크")
+parser.add_argument("--increments", type=int, nargs="+", default=[20, 100])
+parser.add_argument("--rounds", type=int, default=5, help="크기마다 반복 횟수")
+parser.add_argument("--database-url", default=None, help="스크래치 DB (기본: 임시 SQLite)")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.database_url or (
+    f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+)
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal, Base, SessionLocal, engine
+from app.models.challenge import Challenge, ChallengeType, UserChallenge
+from app.models.user import User
+from app.services.challenge_progress import add_progress
+
+
+async def read_modify_write(user_id: int, challenge_id: int):
+    """예전 방식 - 읽고 파이썬에서 더해서 쓰기"""
+    async with AsyncSessionLocal() as db:
+        user_challenge = await db.scalar(select(UserChallenge).where(
+            UserChallenge.user_id == user_id, UserChallenge.challenge_id == challenge_id
+        ))
+        await asyncio.sleep(0)
+        user_challenge.current_progress += 1
+        await db.commit()
+
+
+async def atomic_increment(user_id: int, challenge_id: int):
+    async with AsyncSessionLocal() as db:
+        await add_progress(db, user_id, challenge_id, 1)
+        await db.commit()
+
+
+def new_user_challenge(target_value: int) -> tuple:
+    with SessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="-", name="Bench")
+        challenge = Challenge(name="bench", description="-", challenge_type=ChallengeType.MEAL_LOGGING, target_value=target_value)
+        db.add_all([user, challenge])
+        db.flush()
+        db.add(UserChallenge(user_id=user.id, challenge_id=challenge.id, current_progress=0))
+        db.commit()
+        return user.id, challenge.id
+
+
+def current_progress(user_id: int, challenge_id: int) -> int:
+    with SessionLocal() as db:
+        return db.scalar(select(UserChallenge.current_progress).where(
+            UserChallenge.user_id == user_id, UserChallenge.challenge_id == challenge_id
+        ))
+
+
+async def run(increment, count: int) -> tuple:
+    user_id, challenge_id = new_user_challenge(target_value=count * 10)
+    started = time.perf_counter()
+    results = await asyncio.gather(*[increment(user_id, challenge_id) for _ in range(count)], return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    failures = sum(1 for result in results if isinstance(result, Exception))
+    lost = count - failures - current_progress(user_id, challenge_id)
+    return lost, failures, elapsed
+
+
+async def main():
+    Base.metadata.create_all(bind=engine)
+    print(f"{'method':<18} {'increments':>10} {'lost':>6} {'failed':>7} {'ms':>8}")
+    for count in args.increments:
+        for name, increment in (("read_modify_write", read_modify_write), ("atomic_update", atomic_increment)):
+            lost = failures = elapsed = 0
+            for _ in range(args.rounds):
+                round_lost, round_failures, round_elapsed = await run(increment, count)
+                lost, failures, elapsed = lost + round_lost, failures + round_failures, elapsed + round_elapsed
+            print(
+                f"{name:<18} {count:>10} {lost / args.rounds:>6.1f} {failures / args.rounds:>7.1f} "
+                f"{elapsed / args.rounds * 1000:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
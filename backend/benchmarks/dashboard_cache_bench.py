@@ -0,0 +1,63 @@
+"""
+대시보드 캐시 벤치마크
+
+같은 사용자의 대시보드를 캐시 우회(X-Cache-Bypass) 와 캐시 적중으로 반복 조회해서
+요청당 지연(ms) 분포를 비교한다. 인증 사용자 조회는 양쪽에 모두 포함된다.
+
+    python -m benchmarks.dashboard_cache_bench
+"""
+
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+FOODS = ["김치찌개", "불고기", "비빔밥", "라면", "삼겹살", "된장찌개", "갈비탕", "치킨"]
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def measure(client: TestClient, headers: dict, requests: int) -> list:
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        client.get("/api/dashboard/", headers=headers)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(meals: int = 300, requests: int = 500):
+    client = TestClient(app)
+    response = client.post("/api/auth/register", json={
+        "email": f"bench-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "benchmark123",
+        "name": "Bench",
+    })
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    for i in range(meals):
+        client.post("/api/meals/", json={
+            "food_name": FOODS[i % len(FOODS)], "portion_size": 200.0, "meal_type": "lunch"
+        }, headers=headers)
+
+    bypass = measure(client, {**headers, "X-Cache-Bypass": "1"}, requests)
+    client.get("/api/dashboard/", headers=headers)
+    cached = measure(client, headers, requests)
+
+    print(f"{'mode':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for mode, samples in (("bypass", bypass), ("cached", cached)):
+        print(f"{mode:>8} {statistics.median(samples):>8.2f} {percentile(samples, 0.99):>8.2f}")
+    print(client.get("/api/dashboard/cache-stats", headers=headers).json())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+핫 쿼리 실행 계획 리포트 (마이그레이션 전/후)
+
+임시 SQLite DB 를 인덱스 없는 기존 스키마로 만들고 데이터를 채운 뒤,
+엔드포인트가 실제로 실행하는 쿼리들의 실행 계획과 평균 실행 시간을 출력하고,
+app/migrations 를 적용한 뒤 같은 쿼리를 다시 측정한다.
+
+    python -m benchmarks.explain_hot_queries --users 200 --meals-per-user 150
+
+--database-url 로 Postgres 를 줄 수 있지만, 인덱스를 지우고 데이터를 넣으므로
+반드시 비어 있는 스크래치 DB 에서만 실행해야 한다.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description="핫 쿼리 실행 계획 리포트")
+parser.add_argument("--users", type=int, default=200)
+parser.add_argument("--meals-per-user", type=int, default=150)
+parser.add_argument("--runs", type=int, default=200, help="쿼리당 반복 횟수")
+parser.add_argument("--database-url", default=None, help="스크래치 DB (기본: 임시 SQLite)")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.database_url or (
+    f"sqlite:///{tempfile.gettempdir()}/greenflow_explain_{uuid.uuid4().hex[:8]}.db"
+)
+
+from sqlalchemy import insert, text
+
+from app.core.database import engine
+from app.core.migrations import apply_migrations, discover_migrations, schema_migrations
+from app.models import ActivityLog, Base, Challenge, MealLog, RecommendedSwap, User, UserChallenge
+from app.models.activity_log import ActivityType
+from app.models.challenge import ChallengeType
+from app.models.meal_log import MealType
+
+MIGRATION_INDEXES = [
+    "ix_meal_logs_user_logged_at_id",
+    "ix_activity_logs_user_type_logged_at",
+    "ix_recommended_swaps_meal_accepted_created",
+    "ix_user_challenges_user_completed",
+]
+
+NOW = datetime(2025, 6, 30, 12, 0)
+
+# 엔드포인트 쿼리와 같은 모양의 SQL
+HOT_QUERIES = {
+    "meals page (GET /meals/)": (
+        "SELECT * FROM meal_logs WHERE user_id = :user_id "
+        "ORDER BY logged_at DESC, id DESC LIMIT 51"
+    ),
+    "top contributors (dashboard)": (
+        "SELECT food_name, sum(carbon_footprint) AS total_carbon, count(id) FROM meal_logs "
+        "WHERE user_id = :user_id AND logged_at >= :since "
+        "GROUP BY food_name ORDER BY total_carbon DESC LIMIT 5"
+    ),
+    "accepted swaps (dashboard, stats)": (
+        "SELECT coalesce(sum(s.carbon_reduction), 0), count(s.id) FROM recommended_swaps s "
+        "JOIN meal_logs m ON m.id = s.meal_log_id "
+        "WHERE m.user_id = :user_id AND s.accepted = :accepted AND s.created_at >= :since"
+    ),
+    "challenge counts (dashboard, stats)": (
+        "SELECT sum(CASE WHEN completed = :completed THEN 1 ELSE 0 END), count(id) "
+        "FROM user_challenges WHERE user_id = :user_id"
+    ),
+    "energy monthly (GET /energy/monthly-average)": (
+        "SELECT sum(carbon_footprint), sum(energy_usage) FROM activity_logs "
+        "WHERE user_id = :user_id AND activity_type = :activity_type AND logged_at >= :since"
+    ),
+}
+
+
+def seed():
+    rng = random.Random(11)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "password_hash": "x", "name": f"user{i}"}
+            for i in range(1, args.users + 1)
+        ])
+        conn.execute(insert(Challenge), [{
+            "id": 1, "name": "기록 챌린지", "description": "-",
+            "challenge_type": ChallengeType.MEAL_LOGGING, "target_value": 7
+        }])
+
+        meals, activities, challenges = [], [], []
+        meal_id = 0
+        for user_id in range(1, args.users + 1):
+            for n in range(args.meals_per_user):
+                meal_id += 1
+                meals.append({
+                    "id": meal_id, "user_id": user_id, "food_name": f"음식{rng.randint(1, 40)}",
+                    "portion_size": 200.0, "meal_type": rng.choice(list(MealType)),
+                    "carbon_footprint": rng.uniform(0.2, 9.0),
+                    "logged_at": NOW - timedelta(hours=8 * n + rng.randint(0, 7)),
+                })
+            for n in range(args.meals_per_user // 3):
+                activities.append({
+                    "user_id": user_id, "activity_type": rng.choice(list(ActivityType)),
+                    "energy_usage": rng.uniform(1, 20), "carbon_footprint": rng.uniform(0.5, 5),
+                    "logged_at": NOW - timedelta(days=n),
+                })
+            challenges.extend(
+                {"user_id": user_id, "challenge_id": 1, "completed": bool(n % 2)} for n in range(5)
+            )
+        conn.execute(insert(MealLog), meals)
+        conn.execute(insert(ActivityLog), activities)
+        conn.execute(insert(UserChallenge), challenges)
+        conn.execute(insert(RecommendedSwap), [
+            {
+                "meal_log_id": meal["id"], "original_food": meal["food_name"], "recommended_food": "두부",
+                "carbon_reduction": rng.uniform(0.1, 3.0), "recommendation_message": "-",
+                "accepted": rng.random() < 0.4, "created_at": meal["logged_at"],
+            }
+            for meal in meals if meal["id"] % 2 == 0
+        ])
+
+
+def explain(conn, sql: str, params: dict) -> str:
+    if engine.dialect.name == "postgresql":
+        rows = conn.execute(text("EXPLAIN " + sql), params)
+        return "\n".join(f"    {row[0]}" for row in rows)
+    rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params)
+    return "\n".join(f"    {row[-1]}" for row in rows)
+
+
+def report(label: str) -> dict:
+    params = {
+        "user_id": args.users // 2,
+        "since": NOW - timedelta(days=30),
+        "accepted": True,
+        "completed": True,
+        "activity_type": ActivityType.ENERGY.name,
+    }
+    timings = {}
+    print(f"\n===== {label} =====")
+    with engine.connect() as conn:
+        conn.execute(text("ANALYZE"))
+        for name, sql in HOT_QUERIES.items():
+            started = time.perf_counter()
+            for _ in range(args.runs):
+                conn.execute(text(sql), params).all()
+            timings[name] = (time.perf_counter() - started) / args.runs * 1000
+            print(f"\n  {name}  ({timings[name]:.3f} ms)")
+            print(explain(conn, sql, params))
+    return timings
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    # 모델에 선언된 인덱스를 지워서 마이그레이션 이전 운영 스키마를 재현
+    with engine.begin() as conn:
+        for name in MIGRATION_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+    schema_migrations.drop(bind=engine, checkfirst=True)
+
+    seed()
+    before = report("before migrations")
+
+    apply_migrations(engine)
+    after = report(f"after {', '.join(name for _, name, _ in discover_migrations())}")
+
+    print(f"\n{'query':<40} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in HOT_QUERIES:
+        print(f"{name:<40} {before[name]:>10.3f} {after[name]:>10.3f} {before[name] / after[name]:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+계정 데이터 내보내기 벤치마크
+
+사용자 한 명에게 N 개의 식사 기록(절반은 추천 대체 포함)을 넣고 export_user_data 스트림을
+끝까지 읽으면서 소요 시간, 초당 행 수, 출력 크기, 프로세스 최대 RSS 를 출력한다.
+작은 계정부터 실행하므로, 행 수를 늘려도 최대 RSS 가 거의 늘지 않아야 한다.
+
+    python -m benchmarks.export_bench --rows 10000 100000 300000
+"""
+
+import argparse
+import asyncio
+import os
+import resource
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from sqlalchemy import insert, select
+
+from app.core.database import SessionLocal, engine
+from app.models import Base, MealLog, RecommendedSwap, User
+from app.models.meal_log import MealType
+from app.services.data_export import export_user_data
+
+SEED_CHUNK = 20000
+
+
+def seed(rows: int) -> int:
+    with SessionLocal() as db:
+        user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password_hash="x", name="Bench")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    start = datetime(2022, 1, 1)
+    meal_types = list(MealType)
+    with engine.begin() as conn:
+        for offset in range(0, rows, SEED_CHUNK):
+            conn.execute(insert(MealLog), [
+                {
+                    "user_id": user_id, "food_name": f"음식{n % 50}", "portion_size": 200.0,
+                    "meal_type": meal_types[n % 4], "carbon_footprint": 1.0 + n % 7,
+                    "logged_at": start + timedelta(minutes=37 * n),
+                }
+                for n in range(offset, min(offset + SEED_CHUNK, rows))
+            ])
+        meal_ids = conn.scalars(select(MealLog.id).where(MealLog.user_id == user_id, MealLog.id % 2 == 0)).all()
+        for offset in range(0, len(meal_ids), SEED_CHUNK):
+            conn.execute(insert(RecommendedSwap), [
+                {
+                    "meal_log_id": meal_id, "original_food": "불고기", "recommended_food": "두부",
+                    "carbon_reduction": 1.2, "recommendation_message": "-", "accepted": True,
+                }
+                for meal_id in meal_ids[offset:offset + SEED_CHUNK]
+            ])
+    return user_id
+
+
+async def drain(user_id: int) -> tuple:
+    lines = size = 0
+    async for chunk in export_user_data(user_id):
+        size += len(chunk)
+        lines += chunk.count(b"\n")
+    return lines, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="계정 데이터 내보내기 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 300000])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"{'meals':>8} {'lines':>8} {'seconds':>8} {'lines/s':>9} {'MiB out':>8} {'max RSS MiB':>12}")
+    for rows in args.rows:
+        user_id = seed(rows)
+
+        started = time.perf_counter()
+        lines, size = asyncio.run(drain(user_id))
+        elapsed = time.perf_counter() - started
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+
+        # export + users + 식사 + 추천 대체 + summary
+        assert lines == 3 + rows + rows // 2, lines
+        print(f"{rows:>8} {lines:>8} {elapsed:>8.2f} {lines / elapsed:>9.0f} {size / 2**20:>8.1f} {max_rss:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+배출계수 데이터셋 재적재 벤치마크
+
+1. 파일 읽기 + 컴파일(음식명 인덱스, 키워드 매처 포함) 시간
+2. POST /api/footprint/calculate-batch 를 동시에 보내는 동안 --interval 마다 두 버전을
+   번갈아 재적재했을 때, 재적재 없이 돌린 경우와 요청 지연(p50/p99)/실패 건수를 비교한다.
+   응답마다 factor_version 과 계산 값이 같은 버전에서 나왔는지(섞이지 않았는지) 확인한다.
+
+    python -m benchmarks.factor_reload_bench --requests 3000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+
+parser = argparse.ArgumentParser(description="배출계수 재적재 벤치마크")
+parser.add_argument("--requests", type=int, default=3000)
+parser.add_argument("--concurrency", type=int, default=50)
+parser.add_argument("--interval", type=float, default=0.5, help="재적재 간격(초)")
+parser.add_argument("--compile-runs", type=int, default=50)
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+import httpx
+
+from app.data.factor_dataset import DEFAULT_PATH, load_dataset
+from app.main import app
+from app.services.factor_reload import reload_factors_async
+
+ITEMS = [{"food_name": name, "portion_size": 200.0} for name in ["김치찌개", "불고기", "비빔밥", "라면", "삼겹살"]]
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def write_versions() -> dict:
+    """김치찌개 계수만 다른 두 버전 파일 -> {버전: (경로, 김치찌개 200g 값)}"""
+    with open(DEFAULT_PATH, encoding="utf-8") as f:
+        raw = json.load(f)
+    versions = {}
+    for version, kimchi in (("bench-a", 1.2), ("bench-b", 2.4)):
+        raw = {**raw, "version": version, "foods_kg_per_serving": {**raw["foods_kg_per_serving"], "김치찌개": kimchi}}
+        path = os.path.join(tempfile.gettempdir(), f"greenflow_factors_{version}_{uuid.uuid4().hex[:6]}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(raw, f, ensure_ascii=False)
+        versions[version] = (path, kimchi)
+    return versions
+
+
+async def run(client: httpx.AsyncClient, headers: dict, versions: dict, reload: bool) -> dict:
+    latencies = []
+    failures = 0
+    mixed = 0
+    seen = set()
+    reload_ms = []
+    counter = iter(range(args.requests))
+    done = asyncio.Event()
+
+    async def worker():
+        nonlocal failures, mixed
+        for _ in counter:
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/footprint/calculate-batch", json={"items": ITEMS}, headers=headers)
+                response.raise_for_status()
+            except Exception:
+                failures += 1
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            body = response.json()
+            seen.add(body["factor_version"])
+            if body["factor_version"] in versions and body["items"][0]["carbon_footprint"] != versions[body["factor_version"]][1]:
+                mixed += 1
+
+    async def reloader():
+        names = list(versions)
+        n = 0
+        while not done.is_set():
+            await asyncio.sleep(args.interval)
+            result = await reload_factors_async(versions[names[n % 2]][0])
+            reload_ms.append(result["total_ms"])
+            n += 1
+
+    reload_task = asyncio.create_task(reloader()) if reload else None
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - started
+    done.set()
+    if reload_task is not None:
+        await reload_task
+
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.5),
+        "p99": percentile(latencies, 0.99),
+        "failures": failures,
+        "mixed": mixed,
+        "versions": sorted(seen),
+        "reloads": len(reload_ms),
+        "reload_p50": percentile(reload_ms, 0.5) if reload_ms else 0.0,
+        "reload_max": max(reload_ms) if reload_ms else 0.0,
+    }
+
+
+async def main():
+    compile_ms = []
+    for _ in range(args.compile_runs):
+        started = time.perf_counter()
+        load_dataset()
+        compile_ms.append((time.perf_counter() - started) * 1000)
+    print(f"compile: p50 {percentile(compile_ms, 0.5):.2f} ms, max {max(compile_ms):.2f} ms")
+
+    versions = write_versions()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.post("/api/auth/register", json={
+            "email": f"bench-{uuid.uuid4().hex[:12]}@example.com", "password": "benchmark123", "name": "Bench",
+        })
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for label, reload in (("steady", False), ("reloading", True)):
+            r = await run(client, headers, versions, reload)
+            print(
+                f"{label:>9}: {r['rps']:7.0f} req/s  p50 {r['p50']:6.1f} ms  p99 {r['p99']:6.1f} ms  "
+                f"failures {r['failures']}  mixed {r['mixed']}  versions {r['versions']}"
+            )
+            if reload:
+                print(f"           {r['reloads']} reloads, total p50 {r['reload_p50']:.2f} ms, max {r['reload_max']:.2f} ms")
+
+    for path, _ in versions.values():
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+"""
+상위 기여 음식 집계 벤치마크 (음식명 문자열 vs food_id)
+
+한 사용자에게 --meals 개의 식사 기록을 넣고, 대시보드의 상위 기여 음식 집계를
+예전 방식(food_name GROUP BY)과 현재 방식(food_id GROUP BY + foods 조인)으로 반복 실행해서
+평균 실행 시간을 비교한다. 두 방식의 상위 5개 합계가 같은지도 확인한다.
+
+    python -m benchmarks.food_group_by_bench --meals 200000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from sqlalchemy import case, desc, func, insert, select
+
+from app.core.database import engine
+from app.data.korean_food_carbon import KOREAN_FOOD_CARBON_DB
+from app.models import Base, Food, MealLog, User
+from app.models.meal_log import MealType
+from app.services.foods import load_food_ids, resolve_food_name, sync_foods
+
+SEED_CHUNK = 20000
+NOW = datetime(2025, 6, 30, 12, 0)
+
+
+def seed(meals: int):
+    rng = random.Random(5)
+    # 사람이 입력한 변형 이름 (부분 일치로 해석됨)
+    names = list(KOREAN_FOOD_CARBON_DB) + [f"엄마표 {name}" for name in list(KOREAN_FOOD_CARBON_DB)[:30]]
+    with engine.begin() as conn:
+        sync_foods(conn)
+        food_ids = load_food_ids(conn)
+        conn.execute(insert(User), [{"id": 1, "email": "bench@example.com", "password_hash": "x", "name": "Bench"}])
+        for offset in range(0, meals, SEED_CHUNK):
+            rows = []
+            for n in range(offset, min(offset + SEED_CHUNK, meals)):
+                name = rng.choice(names)
+                rows.append({
+                    "user_id": 1, "food_name": name, "food_id": food_ids.get(resolve_food_name(name)),
+                    "portion_size": 1.0, "meal_type": MealType.LUNCH, "carbon_footprint": rng.uniform(0.2, 9.0),
+                    "logged_at": NOW - timedelta(seconds=20 * n),
+                })
+            conn.execute(insert(MealLog), rows)
+
+
+def by_name(since):
+    return select(
+        MealLog.food_name,
+        func.sum(MealLog.carbon_footprint).label("total_carbon"),
+        func.count(MealLog.id).label("frequency")
+    ).where(MealLog.user_id == 1, MealLog.logged_at >= since).group_by(
+        MealLog.food_name
+    ).order_by(desc("total_carbon")).limit(5)
+
+
+def by_food_id(since):
+    unresolved_name = case((MealLog.food_id.is_(None), MealLog.food_name))
+    per_food = select(
+        MealLog.food_id,
+        unresolved_name.label("unresolved_name"),
+        func.sum(MealLog.carbon_footprint).label("total_carbon"),
+        func.count(MealLog.id).label("frequency")
+    ).where(MealLog.user_id == 1, MealLog.logged_at >= since).group_by(
+        MealLog.food_id, unresolved_name
+    ).order_by(desc("total_carbon")).limit(5).subquery()
+    return select(
+        func.coalesce(Food.name, per_food.c.unresolved_name).label("food_name"),
+        per_food.c.total_carbon,
+        per_food.c.frequency
+    ).select_from(per_food).outerjoin(Food, Food.id == per_food.c.food_id).order_by(desc(per_food.c.total_carbon))
+
+
+def measure(conn, stmt, runs: int) -> float:
+    started = time.perf_counter()
+    for _ in range(runs):
+        conn.execute(stmt).all()
+    return (time.perf_counter() - started) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="상위 기여 음식 집계 벤치마크")
+    parser.add_argument("--meals", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    seed(args.meals)
+
+    print(f"{'window':>8} {'rows':>8} {'food_name ms':>13} {'food_id ms':>11} {'speedup':>8}")
+    with engine.connect() as conn:
+        for days in (30, 365, 10000):
+            since = NOW - timedelta(days=days)
+            rows = conn.scalar(select(func.count()).select_from(MealLog).where(MealLog.logged_at >= since))
+            name_ms = measure(conn, by_name(since), args.runs)
+            id_ms = measure(conn, by_food_id(since), args.runs)
+            print(f"{days:>7}d {rows:>8} {name_ms:>13.2f} {id_ms:>11.2f} {name_ms / id_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
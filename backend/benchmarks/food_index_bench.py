@@ -0,0 +1,85 @@
+"""
+음식명 인덱스 마이크로 벤치마크
+
+음식 테이블을 1x / 10x / 100x 로 키우면서, 기존 선형 탐색과
+FoodResolver 의 조회 1회당 비용(µs)을 비교한다.
+
+    python -m benchmarks.food_index_bench
+"""
+
+import random
+import time
+
+from app.data.food_index import FoodResolver
+from app.data.korean_food_carbon import KOREAN_FOOD_CARBON_DB
+
+HANGUL_START, HANGUL_END = 0xAC00, 0xD7A3
+
+QUERIES = [
+    "김치찌개",            # 정확 일치
+    "엄마표 김치찌개 정식",  # 입력 안에 음식명 포함
+    "찌개",                # 음식명 안에 입력 포함
+    "불고기",
+    "양념 닭갈비 덮밥",
+    "비건 버거",            # 매칭 없음
+]
+
+
+def grow_table(multiplier: int, seed: int = 42) -> dict:
+    """실제 음식명에 임의의 한글 접두/접미를 붙여 테이블을 키운다"""
+    rng = random.Random(seed)
+    table = dict(KOREAN_FOOD_CARBON_DB)
+    base = list(KOREAN_FOOD_CARBON_DB.items())
+    while len(table) < len(base) * multiplier:
+        name, carbon = rng.choice(base)
+        prefix = "".join(chr(rng.randint(HANGUL_START, HANGUL_END)) for _ in range(rng.randint(1, 3)))
+        suffix = "".join(chr(rng.randint(HANGUL_START, HANGUL_END)) for _ in range(rng.randint(0, 2)))
+        table[prefix + name + suffix] = round(carbon * rng.uniform(0.8, 1.2), 2)
+    return table
+
+
+def linear_partial(table: dict, food_name: str):
+    """기존 meals.calculate_carbon_footprint 의 부분 일치 루프"""
+    if food_name in table:
+        return food_name
+    for food_key in table.keys():
+        if food_name in food_key or food_key in food_name:
+            return food_key
+    return None
+
+
+def linear_similar(table: dict, query: str):
+    """기존 search_similar_foods 의 선형 탐색 + 정렬"""
+    query = query.lower()
+    matches = [name for name in table if query in name.lower()]
+    return sorted(matches, key=lambda n: table[n])
+
+
+def time_per_call(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for i in range(iterations):
+        fn(QUERIES[i % len(QUERIES)])
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    print(f"{'size':>7} {'build ms':>9} {'linear partial':>15} {'index partial':>14} "
+          f"{'linear similar':>15} {'index similar':>14}   (µs/lookup)")
+    for multiplier in (1, 10, 100):
+        table = grow_table(multiplier)
+
+        started = time.perf_counter()
+        resolver = FoodResolver(table)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        iterations = max(600, 60000 // multiplier)
+        lp = time_per_call(lambda q: linear_partial(table, q), iterations)
+        ip = time_per_call(lambda q: resolver.lookup(q) is not None or resolver.find_partial(q), 60000)
+        ls = time_per_call(lambda q: linear_similar(table, q), iterations)
+        is_ = time_per_call(resolver.search_similar, 60000)
+
+        print(f"{len(table):>7} {build_ms:>9.1f} {lp:>15.2f} {ip:>14.2f} {ls:>15.2f} {is_:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
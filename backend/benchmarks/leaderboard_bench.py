@@ -0,0 +1,99 @@
+"""
+리더보드 순위 조회 벤치마크
+
+사용자 수를 늘려 가며 (기본 1만, 10만, 100만)
+
+1. RankedSet: 스냅샷에서 한 번에 만드는 시간(s), 점수 갱신, 내 순위 조회, 상위 10명 조회의 호출당 시간(µs)
+2. 비교용 SQL: leaderboard_scores 에서 COUNT(*) 로 내 순위를 세는 시간(ms)
+
+을 잰다. 순위 조회가 사용자 수에 대해 로그로 늘어나는지 보는 것이 목적이다.
+
+    python -m benchmarks.leaderboard_bench --sizes 10000 100000 1000000 --lookups 20000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from datetime import datetime
+
+from sqlalchemy import func, insert, select, text
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.ranking import RankedSet
+from app.models.leaderboard_score import LeaderboardScore
+from app.models.user import User
+
+
+def per_call_us(fn, args_list) -> float:
+    started = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - started) / len(args_list) * 1_000_000
+
+
+def bench_ranked_set(size: int, lookups: int, rng: random.Random) -> dict:
+    scores = [(user_id, rng.randrange(100_000)) for user_id in range(1, size + 1)]
+    started = time.perf_counter()
+    ranking = RankedSet.from_scores(scores, seed=1)
+    build_s = time.perf_counter() - started
+
+    members = [(rng.randrange(1, size + 1),) for _ in range(lookups)]
+    updates = [(rng.randrange(1, size + 1), rng.randrange(100_000)) for _ in range(lookups)]
+    return {
+        "build_s": build_s,
+        "set_us": per_call_us(ranking.set, updates),
+        "rank_us": per_call_us(ranking.rank, members),
+        "top10_us": per_call_us(lambda: ranking.top(10), [()] * lookups),
+    }
+
+
+def bench_sql_rank(size: int, lookups: int, rng: random.Random) -> float:
+    with SessionLocal() as db:
+        db.execute(text("DELETE FROM leaderboard_scores"))
+        now = datetime.utcnow()
+        for low in range(1, size + 1, 50_000):
+            db.execute(insert(LeaderboardScore), [
+                {"board": "points", "period": "all", "user_id": user_id, "score": rng.randrange(100_000), "updated_at": now}
+                for user_id in range(low, min(size, low + 49_999) + 1)
+            ])
+        db.commit()
+
+        started = time.perf_counter()
+        for _ in range(lookups):
+            user_id = rng.randrange(1, size + 1)
+            score = db.get(LeaderboardScore, ("points", "all", user_id)).score
+            db.scalar(select(func.count()).select_from(LeaderboardScore).where(
+                LeaderboardScore.board == "points", LeaderboardScore.period == "all", LeaderboardScore.score > score
+            ))
+        return (time.perf_counter() - started) / lookups * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="리더보드 순위 조회 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--lookups", type=int, default=20_000, help="크기마다 순위 조회 횟수")
+    parser.add_argument("--sql-lookups", type=int, default=20, help="크기마다 SQL COUNT 순위 조회 횟수")
+    args = parser.parse_args()
+
+    # leaderboard_scores.user_id 는 users 를 참조하므로 users 도 같이 만든다 (SQLite 는 FK 를 검사하지 않음)
+    Base.metadata.create_all(bind=engine, tables=[User.__table__, LeaderboardScore.__table__])
+    rng = random.Random(42)
+
+    print(f"{'users':>9} {'build s':>8} {'set µs':>8} {'rank µs':>8} {'top10 µs':>9} {'SQL rank ms':>12}")
+    for size in args.sizes:
+        result = bench_ranked_set(size, args.lookups, rng)
+        sql_ms = bench_sql_rank(size, args.sql_lookups, rng)
+        print(
+            f"{size:>9} {result['build_s']:>8.1f} {result['set_us']:>8.1f} {result['rank_us']:>8.1f} "
+            f"{result['top10_us']:>9.1f} {sql_ms:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+API 부하 테스트 스크립트
+
+실행 중인 서버(uvicorn, 동일한 worker 수)를 대상으로 동시 요청을 보내고
+엔드포인트별 requests/sec 와 p50/p99 지연 시간을 출력한다.
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --meals 3000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+import httpx
+
+DEFAULT_ENDPOINTS = [
+    "/api/gamification/challenges/personalized",
+    "/api/meals/?limit=50",
+    "/api/auth/me",
+]
+
+SEED_FOODS = ["김치찌개", "불고기", "비빔밥", "삼겹살", "된장찌개", "라면", "갈비탕", "김밥"]
+MEAL_TYPES = ["breakfast", "lunch", "dinner", "snack"]
+
+
+async def seed_user(client: httpx.AsyncClient, meal_count: int) -> dict:
+    """테스트 사용자 생성 후 식사 기록을 채워 넣는다"""
+    response = await client.post("/api/auth/register", json={
+        "email": f"load-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "loadtest123",
+        "name": "Load Test",
+    })
+    response.raise_for_status()
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    semaphore = asyncio.Semaphore(20)
+
+    async def add_meal(i: int):
+        async with semaphore:
+            await client.post("/api/meals/", headers=headers, json={
+                "food_name": SEED_FOODS[i % len(SEED_FOODS)],
+                "portion_size": 200.0,
+                "meal_type": MEAL_TYPES[i % len(MEAL_TYPES)],
+            })
+
+    await asyncio.gather(*(add_meal(i) for i in range(meal_count)))
+    return headers
+
+
+async def run_load(client: httpx.AsyncClient, headers: dict, endpoints: list,
+                   total_requests: int, concurrency: int) -> dict:
+    """엔드포인트를 섞어서 동시 요청을 보내고 지연 시간을 수집한다"""
+    latencies = {endpoint: [] for endpoint in endpoints}
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        endpoint = endpoints[i % len(endpoints)]
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get(endpoint, headers=headers)
+            latencies[endpoint].append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    return {"elapsed": elapsed, "latencies": latencies, "errors": errors}
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_report(result: dict, total_requests: int):
+    all_latencies = [v for values in result["latencies"].values() for v in values]
+    print(f"total: {total_requests} requests in {result['elapsed']:.2f}s "
+          f"-> {total_requests / result['elapsed']:.1f} req/s, errors={result['errors']}")
+    print(f"{'endpoint':<48} {'n':>5} {'p50 ms':>9} {'p99 ms':>9}")
+    for endpoint, values in result["latencies"].items():
+        if not values:
+            continue
+        print(f"{endpoint:<48} {len(values):>5} "
+              f"{statistics.median(values) * 1000:>9.1f} {percentile(values, 99) * 1000:>9.1f}")
+    print(f"{'(all)':<48} {len(all_latencies):>5} "
+          f"{statistics.median(all_latencies) * 1000:>9.1f} {percentile(all_latencies, 99) * 1000:>9.1f}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--meals", type=int, default=3000, help="시드할 식사 기록 수")
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--timeout", type=float, default=300.0, help="요청당 타임아웃(초)")
+    parser.add_argument("--endpoint", action="append", dest="endpoints",
+                        help="부하를 줄 GET 엔드포인트 (여러 번 지정 가능)")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        headers = await seed_user(client, args.meals)
+        # 워밍업
+        await run_load(client, headers, args.endpoints or DEFAULT_ENDPOINTS, 30, 4)
+        result = await run_load(client, headers, args.endpoints or DEFAULT_ENDPOINTS,
+                                args.requests, args.concurrency)
+    print_report(result, args.requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
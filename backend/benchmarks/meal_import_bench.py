@@ -0,0 +1,80 @@
+"""
+식사 기록 대량 가져오기 벤치마크
+
+N 행짜리 NDJSON 을 만들어 import_meals 로 넣으면서 소요 시간, 초당 행 수,
+프로세스 최대 RSS 를 출력한다. 작은 파일부터 실행하므로, 행 수를 늘려도
+최대 RSS 가 거의 늘지 않아야 한다.
+
+    python -m benchmarks.meal_import_bench --rows 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import resource
+import uuid
+from datetime import datetime, timedelta
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from app.core.database import AsyncSessionLocal, SessionLocal, engine
+from app.data.korean_food_carbon import KOREAN_FOOD_CARBON_DB
+from app.models import Base, User
+from app.services.meal_import import aiter_file_lines, import_meals
+
+EXTRA_NAMES = ["엄마표 김치찌개", "소고기 샐러드", "브로콜리", "알 수 없는 음식"]
+
+
+def write_ndjson(path: str, rows: int, seed: int = 3):
+    rng = random.Random(seed)
+    names = list(KOREAN_FOOD_CARBON_DB) + EXTRA_NAMES
+    start = datetime(2022, 1, 1)
+    with open(path, "w", encoding="utf-8") as out:
+        for n in range(rows):
+            out.write(json.dumps({
+                "food_name": rng.choice(names),
+                "portion_size": rng.randint(50, 400),
+                "meal_type": rng.choice(["breakfast", "lunch", "dinner", "snack"]),
+                "logged_at": (start + timedelta(minutes=37 * n)).isoformat(),
+            }, ensure_ascii=False) + "\n")
+
+
+async def run(path: str, user_id: int):
+    with open(path, encoding="utf-8") as source:
+        async with AsyncSessionLocal() as db:
+            return await import_meals(db, user_id, aiter_file_lines(source), "ndjson")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="식사 기록 대량 가져오기 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 300000])
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    print(f"{'rows':>8} {'seconds':>8} {'rows/s':>9} {'max RSS MiB':>12}")
+    for rows in args.rows:
+        with SessionLocal() as db:
+            user = User(email=f"bench-{uuid.uuid4().hex[:8]}@example.com", password_hash="x", name="Bench")
+            db.add(user)
+            db.commit()
+            user_id = user.id
+
+        path = os.path.join(tempfile.gettempdir(), f"greenflow_import_{rows}.ndjson")
+        write_ndjson(path, rows)
+
+        started = time.perf_counter()
+        report = asyncio.run(run(path, user_id))
+        elapsed = time.perf_counter() - started
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+        os.remove(path)
+
+        assert report.imported == rows, report.to_dict()
+        print(f"{rows:>8} {elapsed:>8.2f} {rows / elapsed:>9.0f} {max_rss:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
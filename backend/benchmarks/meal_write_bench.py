@@ -0,0 +1,99 @@
+"""
+식사 기록 쓰기 경로 벤치마크 (요청마다 커밋 vs 그룹 커밋)
+
+ASGI 앱에 POST /api/meals/ 를 동시에 --concurrency 개씩 보내면서 초당 처리(성공) 건수,
+요청 지연(p50/p99), 실패 건수를 비교한다. 인증 사용자 조회는 양쪽에 모두 포함된다.
+SQLite 는 쓰기 잠금을 기다리다 "database is locked" 로 실패하는 요청이 실패 건수에 잡힌다.
+
+    python -m benchmarks.meal_write_bench --requests 2000 --concurrency 50
+
+--database-url 로 Postgres 를 줄 수 있다 (스크래치 DB 에서만 실행).
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+import uuid
+
+parser = argparse.ArgumentParser(description="식사 기록 쓰기 경로 벤치마크")
+parser.add_argument("--requests", type=int, default=2000)
+parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50])
+parser.add_argument("--users", type=int, default=20)
+parser.add_argument("--database-url", default=None, help="스크래치 DB (기본: 임시 SQLite)")
+args = parser.parse_args()
+
+os.environ["DATABASE_URL"] = args.database_url or (
+    f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+)
+
+import httpx
+
+from app.main import app
+from app.services.meal_writer import meal_write_queue
+
+FOODS = ["김치찌개", "불고기", "비빔밥", "라면", "삼겹살", "된장찌개", "갈비탕", "치킨"]
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def register(client: httpx.AsyncClient) -> dict:
+    response = await client.post("/api/auth/register", json={
+        "email": f"bench-{uuid.uuid4().hex[:12]}@example.com",
+        "password": "benchmark123",
+        "name": "Bench",
+    })
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run(client: httpx.AsyncClient, users: list, concurrency: int) -> tuple:
+    latencies = []
+    failures = []
+    counter = iter(range(args.requests))
+
+    async def worker():
+        for n in counter:
+            started = time.perf_counter()
+            try:
+                response = await client.post("/api/meals/", json={
+                    "food_name": FOODS[n % len(FOODS)], "portion_size": 200.0, "meal_type": "lunch"
+                }, headers=users[n % len(users)])
+                response.raise_for_status()
+            except Exception as exc:
+                failures.append(exc)
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return time.perf_counter() - started, latencies, len(failures)
+
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        users = [await register(client) for _ in range(args.users)]
+
+        print(f"{'mode':>8} {'conc':>5} {'ok/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7} {'avg batch':>10}")
+        for concurrency in args.concurrency:
+            for batching in (False, True):
+                meal_write_queue.enabled = batching
+                meal_write_queue.batches = meal_write_queue.rows = 0
+                elapsed, latencies, failed = await run(client, users, concurrency)
+                mode = "group" if batching else "direct"
+                average_batch = meal_write_queue.stats()["average_batch"] if batching else 1.0
+                print(
+                    f"{mode:>8} {concurrency:>5} {len(latencies) / elapsed:>8.0f} "
+                    f"{statistics.median(latencies):>8.2f} {percentile(latencies, 0.99):>8.2f} "
+                    f"{failed:>7} {average_batch:>10.1f}"
+                )
+        await meal_write_queue.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+비밀번호 해시 격리 벤치마크
+
+--logins 개의 로그인을 한꺼번에 보내고 모두 끝날 때까지 다른 엔드포인트(GET /api/auth/me,
+캐시된 인증) 를 계속 조회해서 지연(p50/p99/max) 을 잰다. 풀 스레드도 CPU 를 쓰므로
+코어가 하나뿐인 환경에서는 pooled 의 지연도 늘어난다 (루프가 막히지는 않음).
+
+1. idle    : 로그인 없이
+2. inline  : 예전처럼 scrypt 를 이벤트 루프에서 바로 계산 (비교용으로 auth 모듈의 함수를 바꿔 끼움)
+3. pooled  : 해시 전용 스레드 풀 (현재 구현)
+
+    python -m benchmarks.password_hash_bench --logins 100 --probes 200
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+import httpx
+
+from app.api import auth
+from app.core import security
+from app.main import app
+
+PASSWORD = "benchmark123"
+
+
+def percentile(samples: list, pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def probe(client: httpx.AsyncClient, headers: dict, count: int, until: asyncio.Task = None) -> list:
+    """count 번, until 이 주어지면 그 작업이 끝날 때까지 계속 조회"""
+    samples = []
+    while len(samples) < count or (until is not None and not until.done()):
+        started = time.perf_counter()
+        response = await client.get("/api/auth/me", headers=headers)
+        response.raise_for_status()
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return samples
+
+
+async def burst(client: httpx.AsyncClient, email: str, logins: int) -> float:
+    started = time.perf_counter()
+    responses = await asyncio.gather(*[
+        client.post("/api/auth/login", json={"email": email, "password": PASSWORD}) for _ in range(logins)
+    ])
+    assert all(response.status_code == 200 for response in responses)
+    return time.perf_counter() - started
+
+
+async def run(client, headers, email, logins: int, probes: int) -> dict:
+    if logins == 0:
+        samples = await probe(client, headers, probes)
+        return {"p50": percentile(samples, 0.5), "p99": percentile(samples, 0.99), "max": max(samples), "logins_per_sec": 0.0}
+    burst_task = asyncio.create_task(burst(client, email, logins))
+    samples = await probe(client, headers, probes, until=burst_task)
+    elapsed = await burst_task
+    return {
+        "p50": percentile(samples, 0.5), "p99": percentile(samples, 0.99), "max": max(samples),
+        "logins_per_sec": logins / elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="비밀번호 해시 격리 벤치마크")
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--probes", type=int, default=200)
+    args = parser.parse_args()
+
+    pooled = (auth.verify_password_async, auth.get_password_hash_async)
+
+    async def inline_verify(plain, hashed):
+        return security.verify_password(plain, hashed)
+
+    async def inline_hash(password):
+        return security.get_password_hash(password)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        response = await client.post("/api/auth/register", json={"email": email, "password": PASSWORD, "name": "Bench"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        print(f"scrypt n={security.SCRYPT_N}, pool workers={security._hash_pool._max_workers}")
+        for label, logins, functions in (
+            ("idle", 0, pooled),
+            ("inline", args.logins, (inline_verify, inline_hash)),
+            ("pooled", args.logins, pooled),
+        ):
+            auth.verify_password_async, auth.get_password_hash_async = functions
+            r = await run(client, headers, email, logins, args.probes)
+            print(
+                f"{label:>7}: /api/auth/me p50 {r['p50']:7.1f} ms  p99 {r['p99']:7.1f} ms  max {r['max']:7.1f} ms  "
+                f"logins/s {r['logins_per_sec']:6.1f}"
+            )
+        auth.verify_password_async, auth.get_password_hash_async = pooled
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
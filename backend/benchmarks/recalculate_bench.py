@@ -0,0 +1,117 @@
+"""
+과거 탄소 발자국 재계산 벤치마크
+
+N 개의 식사 기록을 넣고 김치찌개/불고기 계수만 바꾼 데이터셋으로
+1. 행마다 ORM 객체를 읽고 고쳐서 커밋하는 단순한 방식 (--naive-rows 행만)
+2. recalculate_footprints (기본키 구간 + numpy + 구간당 UPDATE 한 번, 롤업 재구축 시간 포함)
+을 돌려 초당 행 수와 --project-rows 행을 처리하는 데 걸릴 시간을 출력한다.
+
+    python -m benchmarks.recalculate_bench --rows 500000 --chunk-size 10000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.gettempdir()}/greenflow_bench_{uuid.uuid4().hex[:8]}.db"
+
+from sqlalchemy import func, insert, select
+
+from app.core.database import SessionLocal, engine
+from app.data.factor_dataset import DEFAULT_PATH, current_dataset
+from app.jobs.recalculate_footprints import recalculate_footprints
+from app.models import Base, MealLog, User
+from app.models.meal_log import MealType
+
+EXTRA_NAMES = ["엄마표 김치찌개", "소고기 샐러드", "브로콜리", "알 수 없는 음식"]
+
+
+def seed(rows: int, users: int, seed: int = 5):
+    rng = random.Random(seed)
+    names = list(current_dataset().foods) + EXTRA_NAMES
+    start = datetime(2022, 1, 1)
+    with SessionLocal() as db:
+        db.execute(insert(User), [
+            {"email": f"bench-{n}@example.com", "password_hash": "x", "name": f"Bench {n}"} for n in range(users)
+        ])
+        user_ids = db.scalars(select(User.id)).all()
+        for offset in range(0, rows, 50000):
+            db.execute(insert(MealLog), [
+                {
+                    "user_id": rng.choice(user_ids),
+                    "food_name": rng.choice(names),
+                    "portion_size": float(rng.randint(50, 400)),
+                    "carbon_footprint": 1.0,
+                    "meal_type": MealType.LUNCH,
+                    "logged_at": start + timedelta(minutes=37 * n),
+                }
+                for n in range(offset, min(rows, offset + 50000))
+            ])
+        db.commit()
+
+
+def write_dataset() -> Path:
+    with open(DEFAULT_PATH, encoding="utf-8") as f:
+        raw = json.load(f)
+    raw["version"] = "bench-next"
+    raw["foods_kg_per_serving"] = {**raw["foods_kg_per_serving"], "김치찌개": 2.0, "불고기": 9.0}
+    path = Path(tempfile.gettempdir()) / f"greenflow_factors_bench_{uuid.uuid4().hex[:6]}.json"
+    path.write_text(json.dumps(raw, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def naive(rows: int) -> float:
+    """행마다 읽고 계산하고 커밋하는 기준 방식 (초당 행 수)"""
+    from app.api.meals import calculate_carbon_footprint
+
+    dataset = current_dataset()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        for meal in db.scalars(select(MealLog).order_by(MealLog.id.desc()).limit(rows)):
+            meal.carbon_footprint = calculate_carbon_footprint(meal.food_name, meal.portion_size, dataset)
+            db.commit()
+    return rows / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="과거 탄소 발자국 재계산 벤치마크")
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--naive-rows", type=int, default=2000)
+    parser.add_argument("--project-rows", type=int, default=50_000_000)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    seed(args.rows, args.users)
+    print(f"seeded {args.rows} meals for {args.users} users in {time.perf_counter() - started:.1f}s")
+
+    naive_rate = naive(args.naive_rows)
+    print(f"naive   : {naive_rate:9.0f} rows/s  ({args.project_rows / naive_rate / 3600:6.1f} h for {args.project_rows:,} rows)")
+
+    path = write_dataset()
+    started = time.perf_counter()
+    phases = recalculate_footprints(target_path=path, tables=("meal_logs",), chunk_size=args.chunk_size)
+    meals = phases["meal_logs"]
+    table_seconds = time.perf_counter() - started
+    rate = meals["scanned"] / table_seconds
+    print(
+        f"batched : {rate:9.0f} rows/s  ({args.project_rows / rate / 3600:6.1f} h for {args.project_rows:,} rows)  "
+        f"scanned {meals['scanned']}, updated {meals['updated']}, rollup rows {phases['rollups']['updated']}"
+    )
+
+    with SessionLocal() as db:
+        stale = db.scalar(select(func.count()).select_from(MealLog).where(MealLog.factor_version != "bench-next"))
+    print(f"rows left on another version: {stale}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useRef, useState } from 'react';
 import { motion } from 'framer-motion';
 import { useForm } from 'react-hook-form';
 import { Camera, Plus, Calculator } from 'lucide-react';
@@ -21,6 +21,8 @@ const MealLogForm: React.FC<MealLogFormProps> = ({ onMealLogged }) => {
   const [loading, setLoading] = useState(false);
   const [carbonData, setCarbonData] = useState<CarbonCalculationResponse | null>(null);
   const [calculating, setCalculating] = useState(false);
+  // Same key for resubmits of an unchanged form, so a retry after a lost response is not logged twice
+  const submission = useRef<{ body: string; key: string } | null>(null);
 
   const { register, handleSubmit, watch, setValue, reset, formState: { errors } } = useForm<FormData>();
 
@@ -51,7 +53,12 @@ const MealLogForm: React.FC<MealLogFormProps> = ({ onMealLogged }) => {
   const onSubmit = async (data: FormData) => {
     try {
       setLoading(true);
-      const mealLog = await apiService.createMealLog(data);
+      const body = JSON.stringify(data);
+      const previous = submission.current;
+      const key = previous && previous.body === body ? previous.key : crypto.randomUUID();
+      submission.current = { body, key };
+      const mealLog = await apiService.createMealLog(data, key);
+      submission.current = null;
       toast.success('식사가 성공적으로 기록되었습니다! 🍽️');
       reset();
       setCarbonData(null);
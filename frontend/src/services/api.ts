@@ -5,6 +5,8 @@ import {
   RegisterRequest,
   User,
   MealLog,
+  MealLogPage,
+  MealLogQuery,
   MealCreate,
   CarbonCalculationRequest,
   CarbonCalculationResponse,
@@ -99,13 +101,15 @@ class ApiService {
   }
 
   // Meals
-  async createMealLog(mealData: MealCreate): Promise<MealLog> {
-    const response = await this.api.post<MealLog>('/meals/', mealData);
+  // Retrying with the same idempotencyKey never creates a second meal log
+  async createMealLog(mealData: MealCreate, idempotencyKey?: string): Promise<MealLog> {
+    const headers = idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined;
+    const response = await this.api.post<MealLog>('/meals/', mealData, { headers });
     return response.data;
   }
 
-  async getMealLogs(skip: number = 0, limit: number = 50): Promise<MealLog[]> {
-    const response = await this.api.get<MealLog[]>(`/meals/?skip=${skip}&limit=${limit}`);
+  async getMealLogs(query: MealLogQuery = {}): Promise<MealLogPage> {
+    const response = await this.api.get<MealLogPage>('/meals/', { params: query });
     return response.data;
   }
 
@@ -37,6 +37,19 @@ export interface MealLog {
   logged_at: string;
 }
 
+export interface MealLogPage {
+  items: MealLog[];
+  next_cursor: string | null;
+}
+
+export interface MealLogQuery {
+  cursor?: string;
+  limit?: number;
+  from?: string;
+  to?: string;
+  meal_type?: MealType;
+}
+
 export interface MealCreate {
   food_name: string;
   portion_size: number;